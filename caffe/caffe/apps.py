@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+
+
+class CaffeConfig(AppConfig):
+    name = 'caffe'
+
+    def ready(self):
+        """Connect signals which count written reports."""
+
+        from cash.signals import cash_report_written
+        from reports.signals import report_written
+
+        from . import metrics
+
+        report_written.connect(metrics.report_written)
+        cash_report_written.connect(metrics.report_written)
@@ -0,0 +1,201 @@
+"""Module responsible for benchmarks of the most used views.
+
+Every benchmark generates a synthetic caffe of a given size (see
+`caffe.synthetic`), requests views as its manager and measures latency,
+number of queries and peak memory allocated while handling a request. All
+data is created in a transaction which is rolled back at the end, so
+benchmarks can be run against any database.
+
+Latency and queries are measured without tracing memory allocations, which
+slows requests down, so memory is measured by one more request.
+"""
+
+import platform
+import statistics
+import time
+import tracemalloc
+from collections import namedtuple
+
+import django
+from django.core.urlresolvers import reverse
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from cash.models import CashReport, Expense
+from employees.models import Employee
+from reports.models import Category, Product, Report
+from stencils.models import Stencil
+
+from .synthetic import Scale, generate
+
+SIZES = {
+    'small': Scale(caffes=1, products=20, days=14, employees=3, shifts=2),
+    'medium': Scale(caffes=1, products=100, days=90, employees=8, shifts=6),
+    'large': Scale(caffes=1, products=300, days=365, employees=20,
+                   shifts=12),
+}
+
+Case = namedtuple('Case', ['name', 'method', 'url', 'data'])
+
+
+def get_cases(caffe):
+    """Return requested views with their arguments for generated Caffe."""
+
+    report = Report.objects.filter(caffe=caffe).latest('created_on')
+    cash_report = CashReport.objects.filter(caffe=caffe).latest('created_on')
+    day = timezone.localtime(report.created_on).date()
+
+    stencil = Stencil.objects.create(name='Wszystko', caffe=caffe)
+    stencil.categories.add(*Category.objects.filter(caffe=caffe))
+
+    report_data = {
+        str(product_id): [str(product_id), '1']
+        for product_id in Product.objects.filter(
+            caffe=caffe
+        ).values_list('id', flat=True)
+    }
+    cash_report_data = {
+        'cash_before_shift': '300',
+        'cash_after_shift': '900',
+        'card_payments': '200',
+        'amount_due': '800',
+    }
+    for expense_id in Expense.objects.filter(
+        caffe=caffe
+    ).values_list('id', flat=True)[:3]:
+        cash_report_data[str(expense_id)] = [str(expense_id), '50']
+
+    return [
+        Case('reports_new_report', 'get', reverse('reports:new'), None),
+        Case('reports_new_report:post', 'post', reverse('reports:new'),
+             report_data),
+        Case('reports_edit_report', 'get',
+             reverse('reports:edit', args=(report.id,)), None),
+        Case('reports_show_report', 'get',
+             reverse('reports:show', args=(report.id,)), None),
+        Case('cash_new_cash_report', 'get', reverse('cash:new'), None),
+        Case('cash_new_cash_report:post', 'post', reverse('cash:new'),
+             cash_report_data),
+        Case('cash_edit_cash_report', 'get',
+             reverse('cash:edit', args=(cash_report.id,)), None),
+        Case('stencils_new_report', 'get',
+             reverse('stencils:new_report', args=(stencil.id,)), None),
+        Case('calendar_show_day', 'get',
+             reverse('calendar:show_day',
+                     args=(day.year, day.month, day.day)), None),
+        Case('caffe_navigate', 'get', reverse('home:navigate'), None),
+    ]
+
+
+def request(client, case):
+    """Request view of case and check if it has succeeded."""
+
+    response = getattr(client, case.method)(case.url, case.data or {})
+    if response.status_code >= 400:
+        raise RuntimeError('{} returned {}.'.format(
+            case.name, response.status_code
+        ))
+
+    return response
+
+
+def measure(client, case, repeat):
+    """Measure view of case.
+
+    View is requested once before measurements, so caches are filled.
+
+    Args:
+        client (Client): Client logged in as manager of the caffe.
+        case (Case): Requested view.
+        repeat (int): Number of measured requests.
+
+    Returns:
+        Dictionary with latencies in milliseconds, number of queries of the
+        last request and peak allocated memory in KiB.
+    """
+
+    request(client, case)
+
+    latencies = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            request(client, case)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        num_queries = len(queries)
+
+    tracemalloc.start()
+    try:
+        request(client, case)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'name': case.name,
+        'latency_ms': {
+            'min': round(min(latencies), 3),
+            'median': round(statistics.median(latencies), 3),
+            'max': round(max(latencies), 3),
+        },
+        'queries': num_queries,
+        'memory_kib': round(peak / 1024, 1),
+    }
+
+
+def run_size(size, repeat, seed):
+    """Generate caffe of given size and measure all views.
+
+    Generated data is rolled back at the end.
+    """
+
+    with transaction.atomic():
+        caffe, = generate(SIZES[size], 'Benchmark {}'.format(size), seed)
+
+        manager = Employee.objects.create(
+            username='benchmark',
+            is_superuser=True,
+            caffe=caffe
+        )
+        client = Client(SERVER_NAME='localhost')
+        client.force_login(manager)
+
+        results = [
+            measure(client, case, repeat) for case in get_cases(caffe)
+        ]
+
+        transaction.set_rollback(True)
+
+    return results
+
+
+def run_benchmarks(sizes, repeat=5, seed=0):
+    """Run benchmarks for datasets of given sizes.
+
+    Args:
+        sizes (List(str)): Keys of SIZES.
+        repeat (int): Number of measured requests of every view.
+        seed (int): Seed of generated data.
+
+    Returns:
+        Dictionary which can be written as JSON, with results of every size
+        and description of the environment.
+    """
+
+    return {
+        'created_on': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'repeat': repeat,
+        'seed': seed,
+        'sizes': {
+            size: {
+                'scale': SIZES[size]._asdict(),
+                'views': run_size(size, repeat, seed),
+            } for size in sizes
+        },
+    }
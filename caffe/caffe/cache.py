@@ -0,0 +1,108 @@
+"""Module with helpers for caching data of one Caffe.
+
+Every cached value belongs to a namespace (e.g. catalog of products) of one
+Caffe and its key contains current version of that namespace. Instead of
+looking for all keys which have to be removed when data changes, version of
+the namespace is bumped, so stale values are never read again and they just
+expire.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from .metrics import registry
+
+# number of seconds after which cached fragments of templates expire, values
+# which are not invalidated by namespace (e.g. names of employees) can be
+# stale for this time
+FRAGMENT_TIMEOUT = 60 * 60
+
+
+def version_key(namespace, caffe_id):
+    """Return key under which version of namespace is stored."""
+
+    return 'caffe:{}:{}:version'.format(caffe_id, namespace)
+
+
+def get_version(namespace, caffe_id):
+    """Return current version of namespace for given Caffe.
+
+    Args:
+        namespace (str): Name of namespace, e.g. 'reports.catalog'.
+        caffe_id (int): Id of Caffe to which data belongs.
+    """
+
+    key = version_key(namespace, caffe_id)
+    version = cache.get(key)
+
+    if version is None:
+        # version can be evicted, so the new one can not repeat any of
+        # the previous versions
+        cache.add(key, int(time.time() * 1000000), None)
+        version = cache.get(key)
+
+    return version
+
+
+def bump_version(namespace, caffe_id):
+    """Invalidate all values cached in namespace for given Caffe.
+
+    Args:
+        namespace (str): Name of namespace, e.g. 'reports.catalog'.
+        caffe_id (int): Id of Caffe to which data belongs.
+    """
+
+    key = version_key(namespace, caffe_id)
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        get_version(namespace, caffe_id)
+        cache.incr(key)
+
+
+def make_key(namespace, caffe_id, *parts):
+    """Return key for value of namespace for given Caffe.
+
+    Args:
+        namespace (str): Name of namespace, e.g. 'reports.catalog'.
+        caffe_id (int): Id of Caffe to which data belongs.
+        parts (List(str)): Additional parts of key, e.g. year and month.
+    """
+
+    return ':'.join(
+        ['caffe', str(caffe_id), namespace,
+         str(get_version(namespace, caffe_id))] +
+        [str(part) for part in parts]
+    )
+
+
+def get_or_set(namespace, caffe_id, parts, default, timeout=DEFAULT_TIMEOUT):
+    """Return cached value or compute it and store it in the cache.
+
+    Args:
+        namespace (str): Name of namespace, e.g. 'reports.catalog'.
+        caffe_id (int): Id of Caffe to which data belongs.
+        parts (List(str)): Additional parts of key, e.g. year and month.
+        default (callable): Function which computes value when it is not
+            cached.
+        timeout (Optional(int)): Number of seconds after which value expires,
+            default timeout of the cache is used when it is not given.
+    """
+
+    key = make_key(namespace, caffe_id, *parts)
+    value = cache.get(key)
+
+    registry.increment(
+        'cache_requests_total',
+        namespace=namespace,
+        result='miss' if value is None else 'hit'
+    )
+
+    if value is None:
+        value = default()
+        cache.set(key, value, timeout)
+
+    return value
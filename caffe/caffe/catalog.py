@@ -0,0 +1,260 @@
+"""Module responsible for importing catalog of a caffe in bulk.
+
+Catalog is everything which has to be set up before the first report:
+categories, units and products, companies and expenses. Every row of the
+imported file is one of them, given by its `kind`. Categories and units of
+products and companies of expenses which are neither stored nor listed in
+the file are created too.
+
+Uniqueness of names is checked with one query per model and all rows are
+inserted in bulk in one transaction. Names of categories, units and
+companies are then resolved to ids with one query per model, so the number
+of queries does not depend on the number of rows.
+"""
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.translation import ugettext_lazy as _
+
+from cash.catalog import invalidate_expenses
+from cash.models import Company, Expense
+from reports.catalog import invalidate_catalog
+from reports.models import Category, Product, Unit
+
+from .imports import row_error
+from .line_items import BATCH_SIZE, batches
+
+FIELDS = ('kind', 'name', 'category', 'unit', 'threshold', 'company')
+
+# kinds of rows in the order in which they are created
+KINDS = ('category', 'unit', 'company', 'product', 'expense')
+
+MODELS = {
+    'category': Category,
+    'unit': Unit,
+    'company': Company,
+    'product': Product,
+    'expense': Expense,
+}
+
+NAME_TAKEN = {
+    'category': _('Kategoria o takiej nazwie już istnieje.'),
+    'unit': _('Jednostka o takiej nazwie już istnieje.'),
+    'company': _('Firma o takiej nazwie już istnieje.'),
+    'product': _('Produkt o takiej nazwie już istnieje.'),
+    'expense': _('Wydatek powinien mieć unikalną nazwę.'),
+}
+
+REQUIRED = {
+    'product': ('name', 'category', 'unit'),
+}
+
+# fields of rows which refer to other kinds by name
+REFERENCES = {
+    'product': ('category', 'unit'),
+    'expense': ('company',),
+}
+
+
+def get_value(row, field):
+    """Return stripped value of field of row, empty when missing."""
+
+    value = row.get(field)
+    if value is None:
+        return ''
+
+    return str(value).strip()
+
+
+def build_item(row, caffe):
+    """Return kind and not saved model from row of catalog.
+
+    Related categories, units and companies are not set, as they may not
+    exist yet.
+
+    Raises:
+        ValidationError: Row is not valid.
+    """
+
+    kind = get_value(row, 'kind').lower()
+    if kind not in MODELS:
+        raise ValidationError(
+            _('Nieznany rodzaj: {}.').format(get_value(row, 'kind'))
+        )
+
+    required = REQUIRED.get(kind, ('name',))
+    missing = [field for field in required if not get_value(row, field)]
+    if missing:
+        raise ValidationError(
+            _('Brakuje pól: {}.').format(', '.join(missing))
+        )
+
+    item = MODELS[kind](name=get_value(row, 'name'), caffe=caffe)
+    if kind == 'product':
+        threshold = get_value(row, 'threshold')
+        try:
+            item.threshold = float(threshold) if threshold else None
+        except ValueError:
+            raise ValidationError(_('Próg zamówienia powinien być liczbą.'))
+
+    try:
+        item.clean_fields(exclude=['caffe', 'category', 'unit', 'company'])
+    except ValidationError as error:
+        raise ValidationError(error.messages)
+
+    return kind, item
+
+
+def get_stored_names(caffe, names):
+    """Return names of stored models of Caffe which are among given ones.
+
+    Takes one query per model.
+
+    Args:
+        caffe (Caffe): Caffe to which catalog belongs.
+        names (dict): Maps kinds to sets of names.
+
+    Returns:
+        Dictionary which maps kinds to sets of stored names.
+    """
+
+    return {
+        kind: set(MODELS[kind].objects.filter(
+            caffe=caffe,
+            name__in=names[kind]
+        ).values_list('name', flat=True)) if names[kind] else set()
+        for kind in KINDS
+    }
+
+
+def build_catalog(caffe, rows):
+    """Return not saved models from all rows of catalog.
+
+    Args:
+        caffe (Caffe): Caffe to which catalog belongs.
+        rows (List(dict)): Rows of catalog.
+
+    Returns:
+        Dictionary which maps kinds to lists of not saved models. Referenced
+        categories, units and companies which are missing are included.
+        Products and expenses have `references` with names of related ones.
+
+    Raises:
+        ValidationError: Some rows are not valid or their names are taken.
+            Every message says which row is wrong.
+    """
+
+    errors = []
+    items = {kind: [] for kind in KINDS}
+    numbers = {kind: {} for kind in KINDS}
+    referenced = {kind: set() for kind in KINDS}
+
+    for number, row in enumerate(rows, 1):
+        try:
+            kind, item = build_item(row, caffe)
+        except ValidationError as error:
+            for message in error.messages:
+                errors.append(row_error(number, message))
+            continue
+
+        if item.name in numbers[kind]:
+            errors.append(row_error(number, NAME_TAKEN[kind]))
+            continue
+
+        item.references = {}
+        for field in REFERENCES.get(kind, ()):
+            name = get_value(row, field)
+            item.references[field] = name
+            if name:
+                referenced[field].add(name)
+
+        numbers[kind][item.name] = number
+        items[kind].append(item)
+
+    names = {
+        kind: set(numbers[kind]) | referenced[kind] for kind in KINDS
+    }
+    stored = get_stored_names(caffe, names)
+
+    for kind in KINDS:
+        for name in sorted(stored[kind] & set(numbers[kind]),
+                           key=numbers[kind].get):
+            errors.append(row_error(numbers[kind][name], NAME_TAKEN[kind]))
+
+    if errors:
+        raise ValidationError(errors)
+
+    for kind in ('category', 'unit', 'company'):
+        missing = referenced[kind] - stored[kind] - set(numbers[kind])
+        items[kind].extend(
+            MODELS[kind](name=name, caffe=caffe) for name in sorted(missing)
+        )
+
+    return items
+
+
+def get_referenced_names(items, field):
+    """Return names to which models of all kinds refer by given field."""
+
+    return {
+        item.references[field]
+        for kind, fields in REFERENCES.items() if field in fields
+        for item in items[kind] if item.references[field]
+    }
+
+
+def get_ids(caffe, kind, names):
+    """Return dictionary which maps names of models of given kind to ids.
+
+    Takes one query.
+    """
+
+    if not names:
+        return {}
+
+    return dict(MODELS[kind].objects.filter(
+        caffe=caffe,
+        name__in=names
+    ).values_list('name', 'id'))
+
+
+def import_catalog(caffe, rows):
+    """Create categories, units, products, companies and expenses.
+
+    Post save signals are not sent by bulk inserts, so the cached catalog of
+    products and lists of expenses are invalidated here. New products have
+    no stock yet, so they raise no alerts.
+
+    Args:
+        caffe (Caffe): Caffe to which catalog belongs.
+        rows (List(dict)): Rows of catalog.
+
+    Returns:
+        Dictionary which maps kinds to numbers of created models.
+
+    Raises:
+        ValidationError: Some rows are not valid or their names are taken,
+            nothing is created then.
+    """
+
+    items = build_catalog(caffe, rows)
+
+    with transaction.atomic():
+        ids = {}
+        for kind in KINDS:
+            for item in items[kind]:
+                for field, name in getattr(item, 'references', {}).items():
+                    setattr(item, field + '_id', ids[field].get(name))
+
+            for batch in batches(items[kind], BATCH_SIZE):
+                MODELS[kind].objects.bulk_create(batch)
+
+            if kind in ('category', 'unit', 'company'):
+                ids[kind] = get_ids(
+                    caffe, kind, get_referenced_names(items, kind)
+                )
+
+    invalidate_catalog(caffe.id)
+    invalidate_expenses(caffe.id)
+
+    return {kind: len(items[kind]) for kind in KINDS}
@@ -0,0 +1,147 @@
+"""Module with helpers for filtering rows by local dates.
+
+Lookups like `created_on__day` are translated to EXTRACT expressions, which
+can not use indexes. Here local dates are turned into half-open ranges,
+`[start, end)`, which are compared with the column directly. For datetime
+columns the bounds are timezone aware midnights in the current timezone, so
+the rows belong to the same local days as with the lookups.
+
+Rows can also be grouped by local days, with datetimes truncated to days by
+the database.
+"""
+
+from datetime import date, datetime, time, timedelta
+
+from django.db import models
+from django.db.models import F
+from django.db.models.expressions import DateTime
+from django.utils import timezone
+
+
+def local_today():
+    """Return today's date in the current timezone."""
+
+    return timezone.localtime(timezone.now()).date()
+
+
+def local_midnight(day):
+    """Return timezone aware datetime when given local day starts.
+
+    Args:
+        day (date): Local date.
+
+    Returns:
+        Aware datetime of midnight in the current timezone.
+    """
+
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def month_bounds(year, month):
+    """Return first day of given month and first day of the next month.
+
+    Args:
+        year (int): Year of the month.
+        month (int): Number of the month, starting from 1.
+
+    Raises:
+        ValueError: Month does not exist.
+    """
+
+    start = date(year, month, 1)
+    if month == 12:
+        return start, date(year + 1, 1, 1)
+
+    return start, date(year, month + 1, 1)
+
+
+def get_field(model, path):
+    """Return field of model, following relations in the path.
+
+    Args:
+        model (Model): Model class.
+        path (str): Name of field, e.g. `date`, or path to field of related
+            model, e.g. `report__created_on`.
+    """
+
+    names = path.split('__')
+    for name in names[:-1]:
+        model = model._meta.get_field(name).related_model
+
+    return model._meta.get_field(names[-1])
+
+
+def is_datetime(model, path):
+    """Check if field in the path is a datetime field."""
+
+    return isinstance(get_field(model, path), models.DateTimeField)
+
+
+def annotate_day(queryset, field, name='day'):
+    """Annotate rows with local day of given date or datetime field.
+
+    Datetimes are truncated in the database, the same way as by
+    `QuerySet.datetimes`, so rows can be grouped by the annotation. Values of
+    the annotation should be passed through `to_date`.
+
+    Args:
+        queryset (QuerySet): Annotated rows.
+        field (str): Path to date or datetime field.
+        name (str): Name of the annotation.
+
+    Returns:
+        Annotated queryset.
+    """
+
+    if is_datetime(queryset.model, field):
+        day = DateTime(field, 'day', timezone.get_current_timezone())
+    else:
+        day = F(field)
+
+    return queryset.annotate(**{name: day})
+
+
+def to_date(value):
+    """Return date of value of annotation made by `annotate_day`."""
+
+    if isinstance(value, datetime):
+        return value.date()
+
+    return value
+
+
+def filter_dates(queryset, field, start, end):
+    """Filter rows which `field` is in given range of local dates.
+
+    Args:
+        queryset (QuerySet): Rows which are filtered.
+        field (str): Path to date or datetime field.
+        start (date): First day of the range.
+        end (date): First day after the range.
+
+    Returns:
+        Filtered queryset.
+    """
+
+    if is_datetime(queryset.model, field):
+        start, end = local_midnight(start), local_midnight(end)
+
+    return queryset.filter(**{
+        '{}__gte'.format(field): start,
+        '{}__lt'.format(field): end
+    })
+
+
+def filter_day(queryset, field, day):
+    """Filter rows which `field` is in given local day.
+
+    Args:
+        queryset (QuerySet): Rows which are filtered.
+        field (str): Path to date or datetime field.
+        day (date): Local date.
+
+    Returns:
+        Filtered queryset.
+    """
+
+    return filter_dates(queryset, field, day, day + timedelta(days=1))
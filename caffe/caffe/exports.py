@@ -0,0 +1,106 @@
+"""Module with helpers for streaming CSV exports.
+
+Rows are read in chunks with keyset pagination (`pk > last pk`), so only
+one chunk is kept in memory, regardless of the database driver, and every
+chunk is a cheap query over the primary key index. Written rows are
+streamed to the client as soon as they are ready, so a worker does not
+build the whole file before the response starts.
+"""
+
+import csv
+from datetime import timedelta
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .dates import filter_dates
+
+# number of rows read by one query
+CHUNK_SIZE = 500
+
+
+class Echo(object):
+    """File-like object which returns written value instead of storing it."""
+
+    def write(self, value):
+        """Return written value."""
+
+        return value
+
+
+def keyset_chunks(queryset, fields, size=CHUNK_SIZE):
+    """Yield rows of queryset in chunks ordered by primary key.
+
+    Args:
+        queryset (QuerySet): Rows which are read.
+        fields (Tuple(str)): Fields of rows, after primary key.
+        size (int): Maximal number of rows in one chunk.
+
+    Yields:
+        Lists of tuples with primary key and given fields.
+    """
+
+    rows = queryset.order_by('pk').values_list('pk', *fields)
+    last_pk = None
+    while True:
+        chunk = rows
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+
+        chunk = list(chunk[:size])
+        if not chunk:
+            return
+
+        yield chunk
+        last_pk = chunk[-1][0]
+
+
+def filter_range(queryset, field, start, end):
+    """Filter rows which `field` is between given local days, inclusive."""
+
+    return filter_dates(queryset, field, start, end + timedelta(days=1))
+
+
+def format_datetime(value):
+    """Return local datetime formatted for CSV."""
+
+    if value is None:
+        return ''
+
+    return timezone.localtime(value).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def write_csv(header, rows):
+    """Yield lines of CSV with header and rows.
+
+    Args:
+        header (Tuple(str)): Names of columns.
+        rows (Iterable(Tuple)): Values of columns, e.g. a generator.
+    """
+
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def csv_response(name, start, end, header, rows):
+    """Return response which streams CSV.
+
+    Args:
+        name (str): Name of exported data, used in name of the file.
+        start (date): First day of export.
+        end (date): Last day of export.
+        header (Tuple(str)): Names of columns.
+        rows (Iterable(Tuple)): Values of columns, read lazily.
+    """
+
+    filename = '{}-{:%Y%m%d}-{:%Y%m%d}.csv'.format(name, start, end)
+    response = StreamingHttpResponse(
+        write_csv(header, rows),
+        content_type='text/csv; charset=utf-8'
+    )
+    response['Content-Disposition'] = 'attachment; filename="{}"'.format(
+        filename
+    )
+    return response
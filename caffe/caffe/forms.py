@@ -58,3 +58,34 @@ class CaffeForm(forms.ModelForm):
                 'postal_code',
                 u'Kod pocztowy musi być w formacie liczbowym XX-XXX.'
             )
+
+
+class ExportForm(forms.Form):
+    """Responsible for checking range of days of export."""
+
+    start = forms.DateField(label=u'Od')
+    end = forms.DateField(label=u'Do')
+
+    def clean(self):
+        """Check if range is not empty."""
+
+        cleaned_data = super(ExportForm, self).clean()
+        start = cleaned_data.get('start')
+        end = cleaned_data.get('end')
+
+        if start and end and start > end:
+            self.add_error('end', u'Koniec jest wcześniej niż początek.')
+
+        return cleaned_data
+
+
+class CatalogForm(forms.Form):
+    """Responsible for uploading catalog of products and expenses."""
+
+    catalog = forms.FileField(label=u'Katalog (CSV lub JSON)')
+
+    def __init__(self, *args, **kwargs):
+        """Initialize catalog field."""
+
+        kwargs.setdefault('label_suffix', '')
+        super(CatalogForm, self).__init__(*args, **kwargs)
@@ -0,0 +1,69 @@
+"""Module with helpers for importing rows from uploaded files.
+
+Files are spreadsheet-like: CSV with a header or JSON with a list of
+objects. Every row is read as a dictionary, which is then validated and
+turned into models by the importing module, e.g. `hours.schedule`.
+"""
+
+import csv
+import io
+import json
+
+from django.core.exceptions import ValidationError
+from django.utils.translation import ugettext_lazy as _
+
+FORMATS = ('csv', 'json')
+
+
+def read_rows(stream, file_format, key):
+    """Read rows of imported file.
+
+    CSV should have a header with names of fields. JSON should be a list of
+    objects, or an object with such list under `key`.
+
+    Args:
+        stream (file): Binary stream with UTF-8 encoded file.
+        file_format (str): One of FORMATS.
+        key (str): Key of list of rows in JSON object.
+
+    Returns:
+        List of dictionaries.
+
+    Raises:
+        ValidationError: File can not be read.
+    """
+
+    try:
+        text = stream.read().decode('utf-8-sig')
+
+        if file_format == 'csv':
+            return list(csv.DictReader(io.StringIO(text)))
+
+        if file_format == 'json':
+            rows = json.loads(text)
+            if isinstance(rows, dict):
+                rows = rows.get(key)
+
+            if isinstance(rows, list) and \
+                    all(isinstance(row, dict) for row in rows):
+                return rows
+    except (ValueError, csv.Error):
+        pass
+
+    raise ValidationError(_('Nie można odczytać pliku.'))
+
+
+def get_format(name):
+    """Return format of imported file by its name."""
+
+    extension = name.rsplit('.', 1)[-1].lower()
+    if extension not in FORMATS:
+        raise ValidationError(_('Plik powinien być w formacie CSV lub JSON.'))
+
+    return extension
+
+
+def row_error(number, message):
+    """Return message of error in row with given number."""
+
+    return _('Wiersz {}: {}').format(number, message)
@@ -0,0 +1,264 @@
+"""Module with helpers for line items of reports.
+
+Line items are rows which belong to one document and are identified inside
+of it by one key, e.g. FullProducts of Report (key: product) or FullExpenses
+of CashReport (key: expense). When document is edited, submitted line items
+are compared with the stored ones and only needed INSERTs, UPDATEs and
+DELETEs are made, each of them in bulk. Before the document is edited, its
+stored line items are merged into the catalog shown in the form.
+
+Submitted line items are not validated with a form per line: the catalog is
+indexed by id and all submitted ids are resolved with one query.
+"""
+
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db.models import Case, Value, When
+
+# SQLite does not allow more than 999 variables in one query
+BATCH_SIZE = 100
+
+
+def batches(items, size=BATCH_SIZE):
+    """Split items into lists which have at most `size` elements.
+
+    Items are consumed lazily, so they can be produced by a generator.
+    """
+
+    items = iter(items)
+    batch = list(islice(items, size))
+    while batch:
+        yield batch
+        batch = list(islice(items, size))
+
+
+def bulk_update(model, objects, fields):
+    """Update given fields of all objects with one query per batch.
+
+    Args:
+        model (Model): Model class of objects.
+        objects (List(Model)): Saved objects with changed values.
+        fields (Tuple(str)): Names of fields which should be updated.
+    """
+
+    for batch in batches(objects):
+        values = {}
+        for field in fields:
+            values[field] = Case(
+                *[When(pk=obj.pk, then=Value(getattr(obj, field)))
+                  for obj in batch],
+                output_field=model._meta.get_field(field)
+            )
+
+        model.objects.filter(pk__in=[obj.pk for obj in batch]).update(
+            **values
+        )
+
+
+def diff_line_items(stored, submitted, key, fields):
+    """Compare stored line items with the submitted ones.
+
+    Args:
+        stored (Iterable(Model)): Line items which are already saved.
+        submitted (Iterable(Model)): Not saved line items.
+        key (str): Name of attribute which identifies line item.
+        fields (Tuple(str)): Names of fields which can be changed.
+
+    Returns:
+        Tuple of lists: line items which have to be created, stored line
+        items with changed values which have to be updated and stored line
+        items which have to be deleted.
+    """
+
+    stored = {getattr(item, key): item for item in stored}
+    to_create, to_update = [], []
+
+    for item in submitted:
+        stored_item = stored.pop(getattr(item, key), None)
+        if stored_item is None:
+            to_create.append(item)
+            continue
+
+        changed = False
+        for field in fields:
+            if getattr(stored_item, field) != getattr(item, field):
+                setattr(stored_item, field, getattr(item, field))
+                changed = True
+
+        if changed:
+            to_update.append(stored_item)
+
+    return to_create, to_update, list(stored.values())
+
+
+def sync_line_items(queryset, submitted, key, fields):
+    """Make stored line items equal to the submitted ones.
+
+    Args:
+        queryset (QuerySet): Line items which are already saved.
+        submitted (Iterable(Model)): Not saved line items.
+        key (str): Name of attribute which identifies line item.
+        fields (Tuple(str)): Names of fields which can be changed.
+
+    Returns:
+        Tuple of lists with created, updated and deleted line items.
+    """
+
+    model = queryset.model
+    to_create, to_update, to_delete = diff_line_items(
+        queryset, submitted, key, fields
+    )
+
+    for batch in batches(to_delete):
+        model.objects.filter(pk__in=[item.pk for item in batch]).delete()
+
+    bulk_update(model, to_update, fields)
+    model.objects.bulk_create(to_create)
+
+    return to_create, to_update, to_delete
+
+
+def prefill_line_items(entries, queryset, key):
+    """Mark entries of catalog which have stored line items as selected.
+
+    All stored line items are loaded with one query and indexed by key, so
+    each entry is looked up in constant time.
+
+    Args:
+        entries (List(dict)): Serialized catalog entries, e.g. products, with
+            `id`, `selected` and `amount` keys.
+        queryset (QuerySet): Stored line items with `amount` field.
+        key (str): Name of field which points to the catalog entry, e.g.
+            `product_id`.
+
+    Returns:
+        Given entries.
+    """
+
+    amounts = dict(queryset.values_list(key, 'amount'))
+
+    for entry in entries:
+        if entry['id'] in amounts:
+            entry['selected'] = True
+            entry['amount'] = amounts[entry['id']]
+
+    return entries
+
+
+def get_submitted_line_items(data):
+    """Return line items submitted in the form of the document.
+
+    Every line item is submitted under key equal to id of the catalog entry,
+    as a list with the id and the amount. Other keys, e.g. fields of the
+    document, are omitted.
+
+    Args:
+        data (QueryDict): Submitted data.
+
+    Returns:
+        List of pairs: id of the catalog entry and amount, both not parsed.
+    """
+
+    submitted = []
+    for key in data:
+        try:
+            int(key)
+        except ValueError:
+            continue
+
+        values = data.getlist(key)
+        if len(values) == 2:
+            submitted.append((values[0], values[1]))
+
+    return submitted
+
+
+def clean_amount(model, value):
+    """Validate submitted amount like the form of the line item would.
+
+    Args:
+        model (Model): Model class of line items with `amount` field.
+        value (str): Submitted amount.
+
+    Returns:
+        Parsed amount.
+
+    Raises:
+        ValidationError: Amount is not valid.
+    """
+
+    model_field = model._meta.get_field('amount')
+    amount = model_field.formfield().clean(value)
+    model_field.run_validators(amount)
+    return amount
+
+
+def parse_line_items(submitted, entries, queryset, model, field, caffe):
+    """Create not saved line items from the submitted ones.
+
+    Catalog entries are indexed by id and submitted ids are resolved with one
+    query, so parsing costs the same for any number of line items. Entries
+    which were submitted are marked as selected, with their amounts or
+    errors, so the form can be shown again.
+
+    Args:
+        submitted (List(tuple)): Pairs of id of the catalog entry and amount,
+            as returned by `get_submitted_line_items`.
+        entries (List(dict)): Serialized catalog entries, e.g. products, with
+            `id`, `selected`, `amount` and `errors` keys.
+        queryset (QuerySet): Objects which can be chosen, e.g. products of
+            the Caffe.
+        model (Model): Model class of line items.
+        field (str): Name of field of line item which points to the chosen
+            object, e.g. `product`.
+        caffe (Caffe): Caffe to which line items belong.
+
+    Returns:
+        Tuple: list of not saved line items and boolean telling if all
+        submitted line items are valid.
+    """
+
+    entries = {entry['id']: entry for entry in entries}
+    valid = True
+
+    ids = []
+    for object_id, _ in submitted:
+        try:
+            ids.append(int(object_id))
+        except (TypeError, ValueError):
+            valid = False
+
+    objects = queryset.in_bulk(ids) if ids else {}
+
+    line_items = []
+    for object_id, value in submitted:
+        try:
+            object_id = int(object_id)
+        except (TypeError, ValueError):
+            continue
+
+        errors = ''
+        try:
+            amount = clean_amount(model, value)
+        except ValidationError as error:
+            errors = error.messages
+
+        entry = entries.get(object_id)
+        if entry:
+            entry['selected'] = True
+            entry['amount'] = '' if errors else value
+            entry['errors'] = errors
+
+        obj = objects.get(object_id)
+        if obj is None or errors:
+            valid = False
+            continue
+
+        line_items.append(model(**{
+            field: obj,
+            'amount': amount,
+            'caffe': caffe
+        }))
+
+    return line_items, valid
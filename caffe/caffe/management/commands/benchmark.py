@@ -0,0 +1,45 @@
+"""Command which measures the most used views on generated data."""
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from caffe.benchmarks import SIZES, run_benchmarks
+
+from .generate_data import positive
+
+
+class Command(BaseCommand):
+    """Run benchmarks and write their results as JSON."""
+
+    help = ('Measure latency, queries and memory of the most used views on '
+            'generated caffes of several sizes.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            nargs='+',
+            choices=sorted(SIZES),
+            default=['small', 'medium'],
+            help='Sizes of generated caffes.'
+        )
+        parser.add_argument('--repeat', type=positive, default=5,
+                            help='Number of measured requests of a view.')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed of generated data.')
+        parser.add_argument(
+            '--output',
+            default=None,
+            help='Path of JSON file, standard output when not given.'
+        )
+
+    def handle(self, *args, **options):
+        results = run_benchmarks(
+            options['sizes'], options['repeat'], options['seed']
+        )
+
+        if options['output'] is None:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            with open(options['output'], 'w') as stream:
+                json.dump(results, stream, indent=2)
@@ -0,0 +1,79 @@
+"""Command which exports reports, cash reports or worked hours to CSV."""
+
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from caffe.exports import write_csv
+from caffe.models import Caffe
+from cash.export import HEADER as CASH_HEADER
+from cash.export import export_cash_reports
+from hours.export import HEADER as HOURS_HEADER
+from hours.export import export_worked_hours
+from reports.export import HEADER as REPORTS_HEADER
+from reports.export import export_reports
+
+EXPORTS = {
+    'reports': (REPORTS_HEADER, export_reports),
+    'cash': (CASH_HEADER, export_cash_reports),
+    'hours': (HOURS_HEADER, export_worked_hours),
+}
+
+
+def parse_day(value):
+    """Parse day given as YYYY-MM-DD."""
+
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+class Command(BaseCommand):
+    """Export data of a caffe to CSV."""
+
+    help = 'Write reports, cash reports or worked hours of a caffe as CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS))
+        parser.add_argument(
+            '--caffe',
+            type=int,
+            required=True,
+            help='Id of caffe which data is exported.'
+        )
+        parser.add_argument(
+            '--start',
+            type=parse_day,
+            required=True,
+            help='First day of export, as YYYY-MM-DD.'
+        )
+        parser.add_argument(
+            '--end',
+            type=parse_day,
+            required=True,
+            help='Last day of export, as YYYY-MM-DD.'
+        )
+        parser.add_argument(
+            '--output',
+            default=None,
+            help='Path of written file, standard output when not given.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            caffe = Caffe.objects.get(id=options['caffe'])
+        except Caffe.DoesNotExist:
+            raise CommandError('Caffe does not exist.')
+
+        if options['start'] > options['end']:
+            raise CommandError('End of export is before its start.')
+
+        header, export = EXPORTS[options['kind']]
+        lines = write_csv(
+            header, export(caffe, options['start'], options['end'])
+        )
+
+        if options['output'] is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+        else:
+            with open(options['output'], 'w', newline='') as stream:
+                stream.writelines(lines)
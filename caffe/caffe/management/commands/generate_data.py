@@ -0,0 +1,58 @@
+"""Command which generates synthetic caffes for load testing."""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from caffe.synthetic import Scale, check_invariants, generate
+
+
+def positive(value):
+    """Parse positive number."""
+
+    number = int(value)
+    if number < 1:
+        raise ValueError('Number should be positive.')
+
+    return number
+
+
+class Command(BaseCommand):
+    """Generate synthetic data of caffes."""
+
+    help = ('Generate caffes with products, reports, cash reports, '
+            'employees and shifts at a chosen scale.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--caffes', type=positive, default=1)
+        parser.add_argument('--products', type=positive, default=50,
+                            help='Number of products of every caffe.')
+        parser.add_argument('--days', type=positive, default=30,
+                            help='Number of days of history.')
+        parser.add_argument('--employees', type=positive, default=5,
+                            help='Number of employees of every caffe.')
+        parser.add_argument('--shifts', type=positive, default=3,
+                            help='Number of shifts of every day.')
+        parser.add_argument('--seed', type=int, default=None,
+                            help='Seed of random data.')
+        parser.add_argument('--prefix', default='Kawiarnia',
+                            help='Prefix of names of caffes.')
+
+    def handle(self, *args, **options):
+        scale = Scale(*(options[field] for field in Scale._fields))
+
+        started = time.time()
+        try:
+            caffes = generate(scale, options['prefix'], options['seed'])
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        broken = check_invariants([caffe.id for caffe in caffes])
+        if broken:
+            raise CommandError('\n'.join(broken))
+
+        self.stdout.write('Generated {} caffes in {:.1f}s: {}.'.format(
+            len(caffes),
+            time.time() - started,
+            ', '.join(str(caffe.id) for caffe in caffes)
+        ))
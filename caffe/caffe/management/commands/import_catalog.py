@@ -0,0 +1,49 @@
+"""Command which imports catalog of products and expenses from a file."""
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from caffe.catalog import KINDS, import_catalog
+from caffe.imports import FORMATS, get_format, read_rows
+from caffe.models import Caffe
+
+
+class Command(BaseCommand):
+    """Import catalog of a caffe."""
+
+    help = ('Create categories, units, products, companies and expenses '
+            'from CSV or JSON file.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to file with catalog.')
+        parser.add_argument(
+            '--caffe',
+            type=int,
+            required=True,
+            help='Id of caffe to which catalog belongs.'
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            default=None,
+            help='Format of file, taken from its extension when not given.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            caffe = Caffe.objects.get(id=options['caffe'])
+        except Caffe.DoesNotExist:
+            raise CommandError('Caffe does not exist.')
+
+        try:
+            file_format = options['format'] or get_format(options['path'])
+            with open(options['path'], 'rb') as stream:
+                rows = read_rows(stream, file_format, 'catalog')
+
+            created = import_catalog(caffe, rows)
+        except ValidationError as error:
+            raise CommandError('\n'.join(error.messages))
+
+        self.stdout.write('Imported {}.'.format(', '.join(
+            '{} {}'.format(created[kind], kind) for kind in KINDS
+        )))
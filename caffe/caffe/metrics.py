@@ -0,0 +1,396 @@
+"""Module with metrics of handled requests and of the project.
+
+Metrics of every request (see `caffe.middleware.RequestMetricsMiddleware`)
+are observed in histograms per view, which are kept in memory of the
+process. Histograms have fixed buckets and are cumulative like the ones of
+Prometheus. Events, e.g. written reports or hits of the cache, are counted
+by counters.
+
+Every process of the server keeps its own metrics. When METRICS_DIR is set,
+processes write snapshots of their metrics to that directory, and metrics
+of all of them are summed up when they are exported (see `export`).
+"""
+
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.template.base import Template
+
+# upper bounds of buckets of every metric
+SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BUCKETS = {
+    'duration_seconds': SECONDS,
+    'db_seconds': SECONDS,
+    'template_seconds': SECONDS,
+    'queries': (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+    'memory_bytes': tuple(2 ** power for power in range(16, 28, 2)),
+}
+
+HELP = {
+    'duration_seconds': 'Time of handling requests.',
+    'db_seconds': 'Time of SQL queries of requests.',
+    'template_seconds': 'Time of rendering templates of requests.',
+    'queries': 'Number of SQL queries of requests.',
+    'memory_bytes': 'Peak of memory allocated by requests.',
+    'requests_total': 'Number of handled requests.',
+    'cache_requests_total': 'Number of reads of cached values.',
+    'reports_written_total': 'Number of written reports.',
+    'cache_hit_ratio': 'Ratio of reads of cached values which were hits.',
+}
+
+# name of view of requests which were not resolved, e.g. not found ones
+UNRESOLVED = '<unresolved>'
+
+# minimal number of seconds between writes of snapshots of one process
+FLUSH_INTERVAL = 5
+
+
+class Histogram(object):
+    """Counts of observed values in buckets with fixed upper bounds."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        """Add value to the first bucket which bound is not lower."""
+
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Return list of pairs: upper bound and number of values not above.
+
+        The last bound is infinity, so its number is the number of all
+        values.
+        """
+
+        bounds = list(self.buckets) + [float('inf')]
+        total = 0
+        cumulative = []
+        for bound, count in zip(bounds, self.counts):
+            total += count
+            cumulative.append((bound, total))
+
+        return cumulative
+
+
+class Registry(object):
+    """Histograms of metrics of requests grouped by view, and counters."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.flushed = None
+
+    def observe(self, view, metrics):
+        """Observe metrics of one request.
+
+        Args:
+            view (str): Name of view, e.g. 'reports:edit'.
+            metrics (dict): Maps names of metrics from BUCKETS to values,
+                missing metrics are not observed.
+        """
+
+        with self.lock:
+            for name, value in metrics.items():
+                if name not in BUCKETS or value is None:
+                    continue
+
+                key = (name, view)
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram(BUCKETS[name])
+
+                self.histograms[key].observe(value)
+
+    def increment(self, name, amount=1, **labels):
+        """Increase counter with given name and labels."""
+
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def collect(self):
+        """Return sorted list of tuples: metric, view and copy of histogram."""
+
+        collected = []
+        with self.lock:
+            for (name, view), histogram in sorted(self.histograms.items()):
+                copy = Histogram(histogram.buckets)
+                copy.counts = list(histogram.counts)
+                copy.sum = histogram.sum
+                copy.count = histogram.count
+                collected.append((name, view, copy))
+
+        return collected
+
+    def dump(self):
+        """Return snapshot of all metrics, which can be written as JSON."""
+
+        with self.lock:
+            return {
+                'histograms': [
+                    [name, view, histogram.counts, histogram.sum,
+                     histogram.count]
+                    for (name, view), histogram in self.histograms.items()
+                ],
+                'counters': [
+                    [name, labels, value]
+                    for (name, labels), value in self.counters.items()
+                ],
+            }
+
+    def load(self, snapshot):
+        """Add metrics from snapshot of other registry to this one."""
+
+        with self.lock:
+            for name, view, counts, total, count in snapshot['histograms']:
+                key = (name, view)
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram(BUCKETS[name])
+
+                histogram = self.histograms[key]
+                histogram.counts = [
+                    mine + other
+                    for mine, other in zip(histogram.counts, counts)
+                ]
+                histogram.sum += total
+                histogram.count += count
+
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(tuple(label) for label in labels))
+                self.counters[key] = self.counters.get(key, 0) + value
+
+    def clear(self):
+        """Remove all metrics."""
+
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+
+registry = Registry()
+
+_timer = threading.local()
+
+
+def start_template_timer():
+    """Start measuring time of rendering templates in this thread."""
+
+    _timer.seconds = 0
+    _timer.depth = 0
+
+
+def stop_template_timer():
+    """Stop measuring time of rendering templates and return it."""
+
+    seconds = getattr(_timer, 'seconds', 0)
+    _timer.depth = None
+    return seconds
+
+
+def timed_render(render):
+    """Wrap rendering of template, so its time is measured.
+
+    Included and extended templates are rendered inside of the outermost
+    one, so only the outermost one is measured.
+    """
+
+    @wraps(render)
+    def wrapper(self, context):
+        if getattr(_timer, 'depth', None) is None:
+            return render(self, context)
+
+        _timer.depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            _timer.depth -= 1
+            if _timer.depth == 0:
+                _timer.seconds += time.perf_counter() - started
+
+    wrapper.timed = True
+    return wrapper
+
+
+def instrument_templates():
+    """Measure rendering of all templates, only once per process."""
+
+    if not getattr(Template._render, 'timed', False):
+        Template._render = timed_render(Template._render)
+
+
+def get_namespace(view):
+    """Return URL namespace of view, e.g. 'reports' of 'reports:edit'.
+
+    Views without namespace belong to the caffe app.
+    """
+
+    if view == UNRESOLVED:
+        return 'none'
+
+    if ':' not in view:
+        return 'caffe'
+
+    return view.split(':', 1)[0]
+
+
+def snapshot_path(directory, pid):
+    """Return path of snapshot of metrics of process with given pid."""
+
+    return os.path.join(directory, 'metrics-{}.json'.format(pid))
+
+
+def flush(force=False):
+    """Write snapshot of metrics of this process to METRICS_DIR.
+
+    Snapshot is replaced atomically, at most once per FLUSH_INTERVAL
+    seconds, unless it is forced. Nothing is written when METRICS_DIR is not
+    set.
+    """
+
+    directory = getattr(settings, 'METRICS_DIR', None)
+    if not directory:
+        return
+
+    now = time.monotonic()
+    if not force and registry.flushed is not None and \
+            now - registry.flushed < FLUSH_INTERVAL:
+        return
+
+    registry.flushed = now
+    handle, path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(handle, 'w') as stream:
+        json.dump(registry.dump(), stream)
+
+    os.replace(path, snapshot_path(directory, os.getpid()))
+
+
+def gather():
+    """Return registry with metrics of all processes.
+
+    Without METRICS_DIR only metrics of this process are returned.
+    """
+
+    directory = getattr(settings, 'METRICS_DIR', None)
+    if not directory:
+        return registry
+
+    flush(force=True)
+
+    gathered = Registry()
+    for name in sorted(os.listdir(directory)):
+        if not (name.startswith('metrics-') and name.endswith('.json')):
+            continue
+
+        try:
+            with open(os.path.join(directory, name)) as stream:
+                gathered.load(json.load(stream))
+        except (OSError, ValueError):
+            # snapshot has been removed or it is not valid
+            continue
+
+    return gathered
+
+
+def format_labels(labels):
+    """Return labels in format of Prometheus, e.g. {view="reports:edit"}."""
+
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace(
+            '"', '\\"'
+        ).replace('\n', '\\n')
+
+    return '{' + ','.join(
+        '{}="{}"'.format(name, escape(value)) for name, value in labels
+    ) + '}'
+
+
+def format_bound(bound):
+    """Return upper bound of bucket in format of Prometheus."""
+
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+def export(gathered):
+    """Return metrics of registry in text format of Prometheus.
+
+    Histograms of requests are labelled with URL namespace and view. Hit
+    ratio of every namespace of the cache is computed from counters.
+    """
+
+    lines = []
+
+    def header(metric, name, metric_type):
+        lines.append('# HELP {} {}'.format(metric, HELP.get(name, name)))
+        lines.append('# TYPE {} {}'.format(metric, metric_type))
+
+    last = None
+    for name, view, histogram in gathered.collect():
+        metric = 'caffe_request_{}'.format(name)
+        if name != last:
+            header(metric, name, 'histogram')
+            last = name
+
+        labels = [('namespace', get_namespace(view)), ('view', view)]
+        for bound, count in histogram.cumulative():
+            lines.append('{}_bucket{} {}'.format(
+                metric,
+                format_labels(labels + [('le', format_bound(bound))]),
+                count
+            ))
+
+        lines.append('{}_sum{} {}'.format(
+            metric, format_labels(labels), repr(float(histogram.sum))
+        ))
+        lines.append('{}_count{} {}'.format(
+            metric, format_labels(labels), histogram.count
+        ))
+
+    with gathered.lock:
+        counters = sorted(gathered.counters.items())
+
+    last = None
+    cache = {}
+    for (name, labels), value in counters:
+        metric = 'caffe_{}'.format(name)
+        if name != last:
+            header(metric, name, 'counter')
+            last = name
+
+        lines.append('{}{} {}'.format(metric, format_labels(labels), value))
+
+        if name == 'cache_requests_total':
+            labels = dict(labels)
+            hits, total = cache.get(labels['namespace'], (0, 0))
+            cache[labels['namespace']] = (
+                hits + (value if labels['result'] == 'hit' else 0),
+                total + value
+            )
+
+    if cache:
+        header('caffe_cache_hit_ratio', 'cache_hit_ratio', 'gauge')
+        for namespace, (hits, total) in sorted(cache.items()):
+            lines.append('caffe_cache_hit_ratio{} {}'.format(
+                format_labels([('namespace', namespace)]),
+                repr(hits / total)
+            ))
+
+    return '\n'.join(lines) + '\n'
+
+
+def report_written(sender, **kwargs):
+    """Count written Reports and CashReports."""
+
+    registry.increment('reports_written_total', kind=sender._meta.model_name)
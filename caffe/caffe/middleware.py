@@ -0,0 +1,106 @@
+"""Module with middleware of the project."""
+
+import json
+import logging
+import time
+import tracemalloc
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from .metrics import (UNRESOLVED, flush, get_namespace, instrument_templates,
+                      registry, start_template_timer, stop_template_timer)
+
+logger = logging.getLogger('caffe.metrics')
+
+
+class RequestMetricsMiddleware(object):
+    """Record metrics of every request.
+
+    For every request the name of its view, number and time of SQL queries,
+    time of rendering templates and the whole time of the request are
+    written as one JSON log line to `caffe.metrics` logger and observed in
+    histograms of `caffe.metrics.registry`, where requests are also counted
+    by their status. Peak of allocated memory is
+    recorded only when REQUEST_METRICS_MEMORY is set, as tracing memory
+    slows requests down.
+
+    Middleware is used only when REQUEST_METRICS is set. It should be the
+    first one, so queries of other middleware are counted too.
+    """
+
+    def __init__(self):
+        if not getattr(settings, 'REQUEST_METRICS', False):
+            raise MiddlewareNotUsed()
+
+        self.trace_memory = getattr(settings, 'REQUEST_METRICS_MEMORY', False)
+        instrument_templates()
+
+    def process_request(self, request):
+        """Start measuring the request."""
+
+        # queries are logged only by debug cursor, the log is cleared when
+        # the request starts
+        request._metrics = {
+            'started': time.perf_counter(),
+            'queries': len(connection.queries_log),
+            'force_debug_cursor': connection.force_debug_cursor,
+            'memory': self.trace_memory and not tracemalloc.is_tracing(),
+        }
+        connection.force_debug_cursor = True
+        start_template_timer()
+
+        if request._metrics['memory']:
+            tracemalloc.start()
+
+    def process_response(self, request, response):
+        """Log and observe metrics of the request."""
+
+        state = getattr(request, '_metrics', None)
+        if state is None:
+            return response
+
+        duration = time.perf_counter() - state['started']
+        template_seconds = stop_template_timer()
+
+        queries = list(islice(connection.queries_log, state['queries'], None))
+        connection.force_debug_cursor = state['force_debug_cursor']
+
+        memory = None
+        if state['memory']:
+            memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        view = resolver_match.view_name if resolver_match else UNRESOLVED
+
+        metrics = {
+            'duration_seconds': duration,
+            'queries': len(queries),
+            'db_seconds': sum(float(query['time']) for query in queries),
+            'template_seconds': template_seconds,
+            'memory_bytes': memory,
+        }
+        registry.observe(view, metrics)
+        registry.increment(
+            'requests_total',
+            namespace=get_namespace(view),
+            view=view,
+            status=response.status_code
+        )
+        flush()
+
+        logger.info(json.dumps({
+            'view': view,
+            'method': request.method,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 3),
+            'queries': metrics['queries'],
+            'db_ms': round(metrics['db_seconds'] * 1000, 3),
+            'template_ms': round(template_seconds * 1000, 3),
+            'memory_kib': memory and round(memory / 1024, 1),
+        }, sort_keys=True))
+
+        return response
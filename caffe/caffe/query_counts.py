@@ -0,0 +1,169 @@
+"""Module with helpers for tests which guard views against N+1 queries.
+
+Every view is requested for two synthetic caffes (see `caffe.synthetic`) of
+different sizes. View which makes a query per product, report or expense
+makes more queries for the bigger caffe, so numbers of queries of both
+caffes have to be equal. Generated history ends yesterday, so reports and
+shifts of today, shown on the main page, are added separately.
+"""
+
+from datetime import time
+
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from cash.models import CashReport
+from employees.models import Employee
+from hours.models import Position, WorkedHours
+from reports.models import Category, Report
+from stencils.models import Stencil
+
+from .dates import local_today
+from .synthetic import SHIFT_HOURS, SHIFT_STARTS, Scale, generate
+
+SIZES = (
+    Scale(caffes=1, products=3, days=2, employees=1, shifts=1),
+    Scale(caffes=1, products=9, days=5, employees=3, shifts=3),
+)
+
+
+def seed_today(caffe, scale):
+    """Create reports, cash reports and shifts of today.
+
+    Number of every kind of rows is the number of shifts of a day, so the
+    bigger caffe has more of them.
+    """
+
+    employees = list(Employee.objects.filter(caffe=caffe).order_by('id'))
+    position = Position.objects.filter(caffe=caffe).first()
+
+    for number in range(scale.shifts):
+        employee = employees[number % len(employees)]
+
+        Report.objects.create(creator=employee, caffe=caffe)
+        CashReport.objects.create(
+            creator=employee,
+            caffe=caffe,
+            cash_before_shift=300,
+            cash_after_shift=900,
+            card_payments=200,
+            amount_due=800
+        )
+
+        start = time(SHIFT_STARTS[number // len(employees)])
+        WorkedHours.objects.create(
+            start_time=start,
+            end_time=time((start.hour + SHIFT_HOURS) % 24),
+            date=local_today(),
+            position=position,
+            employee=employee,
+            caffe=caffe
+        )
+
+
+def seed(scale, number):
+    """Generate caffe of given scale with its manager and a stencil.
+
+    Rows of today are added too (see `seed_today`).
+
+    Returns:
+        Generated Caffe and its manager, which has all permissions.
+    """
+
+    caffe, = generate(scale, 'Zapytania {}'.format(number), seed=number)
+    seed_today(caffe, scale)
+
+    manager = Employee.objects.create(
+        username='zapytania{}'.format(number),
+        is_superuser=True,
+        caffe=caffe
+    )
+
+    stencil = Stencil.objects.create(name='Wszystko', caffe=caffe)
+    stencil.categories.add(*Category.objects.filter(caffe=caffe))
+
+    return caffe, manager
+
+
+def get_largest(queryset, related):
+    """Return object of queryset with the most related objects.
+
+    Args:
+        queryset (QuerySet): Objects of one Caffe, e.g. its Reports.
+        related (str): Name of related objects, e.g. 'full_products'.
+    """
+
+    return queryset.annotate(
+        num_related=Count(related)
+    ).order_by('-num_related', 'id').first()
+
+
+def capture_queries(client, url, invalidate=None):
+    """Return SQL of queries made by GET request of url.
+
+    View is requested once before, so cached values are already filled and
+    only queries of the view itself are captured. Function `invalidate` is
+    called between both requests, so views which cache their own content
+    can be checked without it.
+    """
+
+    client.get(url)
+    if invalidate is not None:
+        invalidate()
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+
+    if response.status_code != 200:
+        raise AssertionError('{} returned {}.'.format(
+            url, response.status_code
+        ))
+
+    return [query['sql'] for query in queries]
+
+
+class QueryCountsMixin(object):
+    """Mixin of TestCase which checks numbers of queries of views.
+
+    Caffes of all SIZES are generated once for the whole TestCase.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Generate caffes of all sizes."""
+
+        super(QueryCountsMixin, cls).setUpTestData()
+        cls.seeded = [
+            seed(scale, number) for number, scale in enumerate(SIZES, 1)
+        ]
+
+    def assertConstantQueries(self, get_url, invalidate=None):
+        """Check if view makes the same number of queries for all sizes.
+
+        Args:
+            get_url (callable): Function which returns URL of the view for
+                given Caffe.
+            invalidate (callable): Optional function which invalidates
+                values cached by the view for Caffe with given id, e.g.
+                `invalidate_catalog`.
+        """
+
+        captured = []
+        for caffe, manager in self.seeded:
+            client = Client()
+            client.force_login(manager)
+            captured.append(capture_queries(
+                client, get_url(caffe),
+                invalidate and (lambda: invalidate(caffe.id))
+            ))
+
+        small, big = captured
+        self.assertEqual(
+            len(small), len(big),
+            'Number of queries depends on data, queries of the small '
+            'caffe:\n{}\nqueries of the big caffe:\n{}'.format(
+                '\n'.join(small), '\n'.join(big)
+            )
+        )
@@ -0,0 +1,428 @@
+"""Module responsible for generating synthetic data of caffes.
+
+Generated caffes look like real ones at a chosen scale: products are counted
+in a report after every day, money is counted in a cash report and employees
+work shifts. Rows are inserted in bulk without validating them one by one,
+so invariants which `save()` would check are verified afterwards with one
+query each (see `check_invariants`). Data which is otherwise kept up to date
+by signals (stock, alerts, forecasts, timesheets, statistics and cached
+catalogs) is rebuilt at the end.
+"""
+
+import random
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db.models import F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from calendars.activity import invalidate_activity
+from cash.catalog import invalidate_expenses
+from cash.models import CashReport, Company, Expense, FullExpense
+from employees.models import Employee
+from hours.models import Position, WorkedHours, get_shift_bounds
+from hours.timesheets import refresh_timesheets
+from reports.alerts import evaluate_alerts
+from reports.catalog import invalidate_catalog
+from reports.forecast import refresh_forecasts
+from reports.models import Category, FullProduct, Product, Report, Unit
+from reports.stock import rebuild_stock
+from stats.rollups import rebuild
+
+from .line_items import BATCH_SIZE, batches
+from .models import Caffe
+
+Scale = namedtuple('Scale', ['caffes', 'products', 'days', 'employees',
+                             'shifts'])
+
+CITIES = ('Gliwice', 'Warszawa', 'Kraków', 'Wrocław', 'Poznań')
+FIRST_NAMES = ('Anna', 'Piotr', 'Kasia', 'Tomek', 'Ola', 'Marek')
+LAST_NAMES = ('Nowak', 'Kowalska', 'Wiśniewski', 'Lewandowska', 'Zieliński')
+CATEGORIES = ('Kawy', 'Herbaty', 'Ciasta', 'Kanapki', 'Napoje')
+UNITS = ('sztuka', 'kilogram', 'litr', 'opakowanie')
+COMPANIES = ('GoodCake', 'Hurtownia', 'Mleczarnia')
+EXPENSES = (
+    ('Ciasta', 'GoodCake'),
+    ('Mleko', 'Mleczarnia'),
+    ('Kawa ziarnista', 'Hurtownia'),
+    ('Gazety', None),
+    ('Środki czystości', None),
+)
+POSITIONS = ('Barista', 'Kelner', 'Sprzątanie')
+
+# password of all generated employees
+PASSWORD = 'kawiarnia'
+
+# local hour when reports of a day are written
+CLOSING_HOUR = 21
+
+# hours when consecutive shifts of one employee on one day start, the last
+# one lasts past midnight
+SHIFT_STARTS = (6, 11, 16, 21)
+SHIFT_HOURS = 4
+
+
+@contextmanager
+def keep_timestamps(*models):
+    """Insert given values of `auto_now` and `auto_now_add` fields.
+
+    Bulk inserts set these fields to the current time, so history could not
+    be generated otherwise.
+    """
+
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or
+        getattr(field, 'auto_now_add', False)
+    ]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+def bulk_insert(model, rows):
+    """Insert rows, e.g. given by a generator, in batches."""
+
+    for batch in batches(rows, BATCH_SIZE):
+        model.objects.bulk_create(batch)
+
+
+def get_ids(model, caffe, field='name'):
+    """Return dictionary which maps values of field to ids of Caffe rows."""
+
+    return dict(model.objects.filter(caffe=caffe).values_list(field, 'id'))
+
+
+def generate_catalog(caffe, scale, rng):
+    """Create products and expenses with all their elements.
+
+    Returns:
+        Tuple with list of (id, threshold) of products and list of ids of
+        expenses.
+    """
+
+    bulk_insert(Category, (
+        Category(name=name, caffe=caffe) for name in CATEGORIES
+    ))
+    bulk_insert(Unit, (Unit(name=name, caffe=caffe) for name in UNITS))
+    bulk_insert(Company, (
+        Company(name=name, caffe=caffe) for name in COMPANIES
+    ))
+
+    categories = get_ids(Category, caffe)
+    units = get_ids(Unit, caffe)
+    companies = get_ids(Company, caffe)
+
+    bulk_insert(Product, (
+        Product(
+            name='{} {}'.format(CATEGORIES[i % len(CATEGORIES)], i + 1),
+            category_id=categories[CATEGORIES[i % len(CATEGORIES)]],
+            unit_id=units[rng.choice(UNITS)],
+            threshold=rng.choice((None, rng.randint(1, 10))),
+            caffe=caffe
+        ) for i in range(scale.products)
+    ))
+    bulk_insert(Expense, (
+        Expense(
+            name=name,
+            company_id=companies.get(company),
+            caffe=caffe
+        ) for name, company in EXPENSES
+    ))
+
+    products = Product.objects.filter(caffe=caffe).order_by('id')
+    return (
+        list(products.values_list('id', 'threshold')),
+        sorted(get_ids(Expense, caffe).values())
+    )
+
+
+def generate_staff(caffe, scale, rng, password):
+    """Create employees and positions.
+
+    Returns:
+        Tuple with lists of ids of employees and of positions.
+    """
+
+    bulk_insert(Employee, (
+        Employee(
+            username='k{}p{}'.format(caffe.id, i + 1),
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            password=password,
+            caffe=caffe
+        ) for i in range(scale.employees)
+    ))
+    bulk_insert(Position, (
+        Position(name=name, caffe=caffe) for name in POSITIONS
+    ))
+
+    return (
+        sorted(get_ids(Employee, caffe, 'username').values()),
+        sorted(get_ids(Position, caffe).values())
+    )
+
+
+def generate_reports(caffe, days, employees, products, rng):
+    """Create one Report after every day with all products counted.
+
+    Stock of every product falls by random consumption and is restocked
+    when it falls to the threshold.
+    """
+
+    with keep_timestamps(Report):
+        bulk_insert(Report, (
+            Report(
+                creator_id=rng.choice(employees),
+                caffe=caffe,
+                created_on=closed_on,
+                updated_on=closed_on
+            ) for closed_on in days
+        ))
+
+    report_ids = list(Report.objects.filter(caffe=caffe).order_by(
+        'created_on'
+    ).values_list('id', flat=True))
+
+    capacities = {product_id: rng.randint(20, 50)
+                  for product_id, _ in products}
+    levels = dict(capacities)
+
+    def full_products():
+        for report_id in report_ids:
+            for product_id, threshold in products:
+                level = levels[product_id] - rng.uniform(0, 5)
+                if level <= (threshold or 0):
+                    level = capacities[product_id]
+
+                levels[product_id] = level
+                yield FullProduct(
+                    product_id=product_id,
+                    report_id=report_id,
+                    caffe=caffe,
+                    amount=round(level, 1)
+                )
+
+    bulk_insert(FullProduct, full_products())
+
+
+def generate_cash_reports(caffe, days, employees, expenses, rng):
+    """Create one CashReport after every day with a few expenses."""
+
+    day_expenses = []
+    cash_reports = []
+    for closed_on in days:
+        amounts = {
+            expense_id: rng.randint(10, 200)
+            for expense_id in rng.sample(expenses, rng.randint(0, 3))
+        }
+        day_expenses.append(amounts)
+
+        cash_report = CashReport(
+            creator_id=rng.choice(employees),
+            caffe=caffe,
+            created_on=closed_on,
+            updated_on=closed_on,
+            cash_before_shift=rng.randint(200, 500),
+            card_payments=rng.randint(0, 1000),
+            amount_due=rng.randint(500, 2000),
+            expenses_total=sum(amounts.values())
+        )
+        cash_report.cash_after_shift = rng.randint(0, 500) + \
+            cash_report.amount_due - cash_report.card_payments
+        cash_report.stored_balance = cash_report.get_balance(
+            cash_report.expenses_total
+        )
+        cash_reports.append(cash_report)
+
+    with keep_timestamps(CashReport):
+        bulk_insert(CashReport, cash_reports)
+
+    cash_report_ids = CashReport.objects.filter(caffe=caffe).order_by(
+        'created_on'
+    ).values_list('id', flat=True)
+
+    bulk_insert(FullExpense, (
+        FullExpense(
+            expense_id=expense_id,
+            amount=amount,
+            cash_report_id=cash_report_id,
+            caffe=caffe
+        )
+        for cash_report_id, amounts in zip(cash_report_ids, day_expenses)
+        for expense_id, amount in sorted(amounts.items())
+    ))
+
+
+def generate_shifts(caffe, dates, scale, employees, positions, rng):
+    """Create shifts of every day, which do not overlap.
+
+    Shifts of a day are given to employees in turns, so an employee works
+    more than one shift a day only when there are more shifts than
+    employees.
+    """
+
+    def shifts():
+        for day in dates:
+            for number in range(scale.shifts):
+                start = time(SHIFT_STARTS[number // len(employees)])
+                end = time((start.hour + SHIFT_HOURS) % 24)
+                started_on, ended_on = get_shift_bounds(day, start, end)
+
+                yield WorkedHours(
+                    start_time=start,
+                    end_time=end,
+                    date=day,
+                    started_on=started_on,
+                    ended_on=ended_on,
+                    position_id=rng.choice(positions),
+                    employee_id=employees[number % len(employees)],
+                    caffe=caffe
+                )
+
+    bulk_insert(WorkedHours, shifts())
+
+
+def refresh_derived(caffe_id):
+    """Rebuild all data which signals keep up to date for Caffe."""
+
+    rebuild_stock(caffe_id)
+    evaluate_alerts(Q(caffe_id=caffe_id))
+    refresh_forecasts(caffe_id)
+    refresh_timesheets(caffe_id)
+    rebuild(caffe_id)
+    invalidate_catalog(caffe_id)
+    invalidate_expenses(caffe_id)
+    invalidate_activity(caffe_id)
+
+
+def generate(scale, prefix, seed=None):
+    """Generate synthetic caffes with their whole history.
+
+    History ends yesterday and lasts `scale.days` days.
+
+    Args:
+        scale (Scale): Number of caffes, and of products, days, employees
+            and shifts of a day of every caffe.
+        prefix (str): Prefix of names of caffes.
+        seed (Optional(int)): Seed of random data, so the same data can be
+            generated again.
+
+    Returns:
+        List of generated Caffes.
+
+    Raises:
+        ValueError: Employees can not work all shifts of a day or some
+            caffe already exists.
+    """
+
+    if scale.shifts > scale.employees * len(SHIFT_STARTS):
+        raise ValueError('Too many shifts for the employees.')
+
+    names = ['{} {}'.format(prefix, number)
+             for number in range(1, scale.caffes + 1)]
+    if Caffe.objects.filter(name__in=names).exists():
+        raise ValueError('Caffes named {} already exist.'.format(prefix))
+
+    rng = random.Random(seed)
+    password = make_password(PASSWORD)
+
+    today = timezone.localtime(timezone.now()).date()
+    dates = [today - timedelta(days=scale.days - i)
+             for i in range(scale.days)]
+    days = [
+        timezone.make_aware(datetime.combine(day, time(CLOSING_HOUR)))
+        for day in dates
+    ]
+
+    caffes = []
+    for number, name in enumerate(names, 1):
+        caffe = Caffe.objects.create(
+            name=name,
+            city=rng.choice(CITIES),
+            street='Kawowa',
+            building_number=str(number),
+            postal_code='{:02}-{:03}'.format(rng.randint(0, 99),
+                                             rng.randint(0, 999))
+        )
+
+        employees, positions = generate_staff(caffe, scale, rng, password)
+        products, expenses = generate_catalog(caffe, scale, rng)
+        generate_reports(caffe, days, employees, products, rng)
+        generate_cash_reports(caffe, days, employees, expenses, rng)
+        generate_shifts(caffe, dates, scale, employees, positions, rng)
+
+        refresh_derived(caffe.id)
+        caffes.append(caffe)
+
+    return caffes
+
+
+def check_invariants(caffe_ids):
+    """Check invariants of data of Caffes, which `save()` checks one by one.
+
+    Every invariant is checked with one query. Overlapping shifts are not
+    checked here, on PostgreSQL they are forbidden by a constraint.
+
+    Args:
+        caffe_ids (List(int)): Ids of checked Caffes.
+
+    Returns:
+        List of descriptions of broken invariants with numbers of wrong rows.
+    """
+
+    def of_caffes(model):
+        return model.objects.filter(caffe_id__in=caffe_ids)
+
+    checks = (
+        ('products with category of other caffe',
+         of_caffes(Product).exclude(category__caffe=F('caffe'))),
+        ('products with unit of other caffe',
+         of_caffes(Product).exclude(unit__caffe=F('caffe'))),
+        ('expenses with company of other caffe',
+         of_caffes(Expense).filter(company__isnull=False).exclude(
+             company__caffe=F('caffe'))),
+        ('reports created by employee of other caffe',
+         of_caffes(Report).exclude(creator__caffe=F('caffe'))),
+        ('counted products of other caffe',
+         of_caffes(FullProduct).exclude(product__caffe=F('caffe'))),
+        ('counted products in report of other caffe',
+         of_caffes(FullProduct).exclude(report__caffe=F('caffe'))),
+        ('negative amounts of counted products',
+         of_caffes(FullProduct).filter(amount__lt=0)),
+        ('cash reports created by employee of other caffe',
+         of_caffes(CashReport).exclude(creator__caffe=F('caffe'))),
+        ('cash reports with wrong sum of expenses',
+         of_caffes(CashReport).annotate(
+             total=Coalesce(Sum('full_expenses__amount'), 0)
+         ).exclude(expenses_total=F('total'))),
+        ('expenses of other caffe in cash reports',
+         of_caffes(FullExpense).exclude(expense__caffe=F('caffe'))),
+        ('expenses in cash report of other caffe',
+         of_caffes(FullExpense).exclude(cash_report__caffe=F('caffe'))),
+        ('shifts of employees of other caffe',
+         of_caffes(WorkedHours).exclude(employee__caffe=F('caffe'))),
+        ('shifts on position of other caffe',
+         of_caffes(WorkedHours).exclude(position__caffe=F('caffe'))),
+        ('shifts which end before they start',
+         of_caffes(WorkedHours).filter(ended_on__lte=F('started_on'))),
+    )
+
+    broken = []
+    for description, rows in checks:
+        count = rows.count()
+        if count:
+            broken.append('{}: {}'.format(description, count))
+
+    return broken
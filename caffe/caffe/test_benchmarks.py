@@ -0,0 +1,59 @@
+# -*- encoding: utf-8 -*-
+
+import json
+import os
+import tempfile
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from .benchmarks import run_benchmarks
+from .models import Caffe
+
+VIEWS = [
+    'reports_new_report', 'reports_new_report:post', 'reports_edit_report',
+    'reports_show_report', 'cash_new_cash_report',
+    'cash_new_cash_report:post', 'cash_edit_cash_report',
+    'stencils_new_report', 'calendar_show_day', 'caffe_navigate',
+]
+
+
+class BenchmarksTests(TestCase):
+    """Test benchmarks of views."""
+
+    def test_run_benchmarks(self):
+        """Check if all views are measured and data is rolled back."""
+
+        results = run_benchmarks(['small'], repeat=1)
+
+        views = results['sizes']['small']['views']
+        self.assertEqual([view['name'] for view in views], VIEWS)
+        for view in views:
+            self.assertGreater(view['queries'], 0)
+            self.assertGreater(view['memory_kib'], 0)
+            self.assertLessEqual(view['latency_ms']['min'],
+                                 view['latency_ms']['max'])
+
+        self.assertFalse(Caffe.objects.exists())
+
+    def test_command(self):
+        """Check if results are written as JSON."""
+
+        handle, path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        try:
+            call_command('benchmark', '--sizes', 'small', '--repeat=1',
+                         '--output={}'.format(path))
+            with open(path) as stream:
+                results = json.load(stream)
+        finally:
+            os.remove(path)
+
+        self.assertEqual(list(results['sizes']), ['small'])
+        self.assertEqual(results['repeat'], 1)
+
+    def test_command_repeat(self):
+        """Check if at least one request has to be measured."""
+
+        with self.assertRaises(CommandError):
+            call_command('benchmark', '--sizes', 'small', '--repeat=0')
@@ -0,0 +1,64 @@
+"""Testing module for the Caffe cache helpers."""
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from .cache import (bump_version, get_or_set, get_version, make_key,
+                    version_key)
+
+
+class CaffeCacheTest(TestCase):
+    """Caffe cache helpers tests."""
+
+    def setUp(self):
+        """Prepare cache for tests."""
+
+        cache.clear()
+
+    def test_make_key(self):
+        """Check if key contains caffe, namespace, version and parts."""
+
+        version = get_version('tests', 1)
+        self.assertEqual(
+            make_key('tests', 1, 2016, 6),
+            'caffe:1:tests:{}:2016:6'.format(version)
+        )
+
+    def test_bump_version(self):
+        """Check if bumping version changes keys of namespace only."""
+
+        key = make_key('tests', 1)
+        other_namespace_key = make_key('others', 1)
+        other_caffe_key = make_key('tests', 2)
+
+        bump_version('tests', 1)
+
+        self.assertNotEqual(make_key('tests', 1), key)
+        self.assertEqual(make_key('others', 1), other_namespace_key)
+        self.assertEqual(make_key('tests', 2), other_caffe_key)
+
+    def test_bump_evicted_version(self):
+        """Check if evicted version is not repeated."""
+
+        version = get_version('tests', 1)
+        cache.delete(version_key('tests', 1))
+
+        bump_version('tests', 1)
+        self.assertGreater(get_version('tests', 1), version)
+
+    def test_get_or_set(self):
+        """Check if value is computed only when it is not cached."""
+
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return 'value'
+
+        self.assertEqual(get_or_set('tests', 1, ['a'], compute), 'value')
+        self.assertEqual(get_or_set('tests', 1, ['a'], compute), 'value')
+        self.assertEqual(len(calls), 1)
+
+        bump_version('tests', 1)
+        self.assertEqual(get_or_set('tests', 1, ['a'], compute), 'value')
+        self.assertEqual(len(calls), 2)
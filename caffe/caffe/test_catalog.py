@@ -0,0 +1,245 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103,R0902
+
+import json
+import os
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth.models import Permission
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.six import StringIO
+
+from cash.models import Company, Expense
+from employees.models import Employee
+from reports.catalog import get_catalog
+from reports.models import Category, Product, Unit
+
+from .catalog import import_catalog
+from .imports import get_format, read_rows
+from .models import Caffe
+
+CATALOG = """kind,name,category,unit,threshold,company
+category,Ciasta,,,,
+unit,sztuka,,,,
+product,Brownie,Ciasta,sztuka,5,
+product,Sernik,Ciasta,kawałek,,
+product,Sok,Napoje,litr,2.5,
+expense,Ciasto,,,,GoodCake
+expense,Gazety,,,,
+"""
+
+
+def menu(size):
+    """Return rows of catalog with given number of products."""
+
+    return [
+        {
+            'kind': 'product',
+            'name': 'Produkt {}'.format(i),
+            'category': 'Kategoria {}'.format(i % 10),
+            'unit': 'sztuka'
+        } for i in range(size)
+    ]
+
+
+class CatalogTests(TestCase):
+    """Test importing catalog of products and expenses."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+        self.filtry = Caffe.objects.create(
+            name='filtry',
+            city='Warszawa',
+            street='Filry',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.kate = Employee.objects.create_user(
+            username='KateT',
+            password='KateT',
+            caffe=self.kafo
+        )
+
+        # the same names in other caffe do not collide
+        Unit.objects.create(name='sztuka', caffe=self.filtry)
+
+        self.liter = Unit.objects.create(name='litr', caffe=self.kafo)
+
+    def test_read_rows(self):
+        """Check if CSV and JSON catalogs are read."""
+
+        rows = read_rows(BytesIO(CATALOG.encode('utf-8')), 'csv', 'catalog')
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[3]['unit'], 'kawałek')
+
+        data = json.dumps({'catalog': rows}).encode('utf-8')
+        self.assertEqual(read_rows(BytesIO(data), 'json', 'catalog'), rows)
+
+        with self.assertRaises(ValidationError):
+            read_rows(BytesIO(data), 'json', 'shifts')
+
+        self.assertEqual(get_format('Menu.CSV'), 'csv')
+        with self.assertRaises(ValidationError):
+            get_format('menu.xlsx')
+
+    def test_import_catalog(self):
+        """Check if all elements are created and names are resolved."""
+
+        rows = read_rows(BytesIO(CATALOG.encode('utf-8')), 'csv', 'catalog')
+        get_catalog(self.kafo)
+
+        created = import_catalog(self.kafo, rows)
+        self.assertEqual(created, {
+            'category': 2,
+            'unit': 2,
+            'company': 1,
+            'product': 3,
+            'expense': 2,
+        })
+
+        self.assertEqual(
+            set(Product.objects.filter(caffe=self.kafo).values_list(
+                'name', 'category__name', 'unit__name', 'threshold'
+            )),
+            {
+                ('Brownie', 'Ciasta', 'sztuka', 5),
+                ('Sernik', 'Ciasta', 'kawałek', None),
+                ('Sok', 'Napoje', 'litr', 2.5),
+            }
+        )
+        self.assertEqual(
+            Product.objects.get(name='Sok').unit_id, self.liter.id
+        )
+        self.assertEqual(
+            set(Expense.objects.values_list('name', 'company__name')),
+            {('Ciasto', 'GoodCake'), ('Gazety', None)}
+        )
+        self.assertEqual(Category.objects.filter(caffe=self.kafo).count(), 2)
+        self.assertEqual(Company.objects.get().caffe, self.kafo)
+
+        # catalog of products is invalidated
+        self.assertEqual(len(get_catalog(self.kafo)['products']), 3)
+
+    def test_import_errors(self):
+        """Check if nothing is created when some rows are not valid."""
+
+        Product.objects.create(
+            name='Sok',
+            category=Category.objects.create(name='Soki', caffe=self.kafo),
+            unit=self.liter,
+            caffe=self.kafo
+        )
+
+        rows = [
+            {'kind': 'product', 'name': 'Sok', 'category': 'Soki',
+             'unit': 'litr'},
+            {'kind': 'unit', 'name': 'litr'},
+            {'kind': 'drink', 'name': 'Kawa'},
+            {'kind': 'product', 'name': 'Kawa'},
+            {'kind': 'product', 'name': 'Herbata', 'category': 'Napoje',
+             'unit': 'kubek', 'threshold': 'dużo'},
+            {'kind': 'expense', 'name': 'Gazety'},
+            {'kind': 'expense', 'name': 'Gazety'},
+        ]
+
+        with self.assertRaises(ValidationError) as context:
+            import_catalog(self.kafo, rows)
+
+        messages = context.exception.messages
+        self.assertEqual(len(messages), 6)
+        for number in (1, 2, 3, 4, 5, 7):
+            self.assertTrue(any(
+                message.startswith('Wiersz {}:'.format(number))
+                for message in messages
+            ))
+
+        self.assertEqual(Product.objects.count(), 1)
+        self.assertEqual(Unit.objects.filter(caffe=self.kafo).count(), 1)
+        self.assertFalse(Expense.objects.exists())
+
+    def test_import_queries(self):
+        """Check if number of queries does not depend on number of rows."""
+
+        def count_queries(caffe, rows):
+            with CaptureQueriesContext(connection) as queries:
+                import_catalog(caffe, rows)
+
+            return len(queries)
+
+        Unit.objects.create(name='sztuka', caffe=self.kafo)
+        small = count_queries(self.kafo, menu(10))
+        large = count_queries(self.filtry, menu(50))
+        self.assertEqual(small, large)
+
+        self.assertEqual(Product.objects.filter(caffe=self.filtry).count(), 50)
+        self.assertEqual(
+            Category.objects.filter(caffe=self.filtry).count(), 10
+        )
+
+    def test_import_view(self):
+        """Check if uploaded catalog is imported."""
+
+        self.client.login(username='KateT', password='KateT')
+        url = reverse('caffe_import_catalog')
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.kate.user_permissions.add(*Permission.objects.filter(
+            codename__in=[
+                'add_category', 'add_unit', 'add_product', 'add_company',
+                'add_expense', 'view_report', 'view_cashreport',
+                'view_workedhours'
+            ]
+        ))
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'caffe/import.html')
+
+        response = self.client.post(url, {
+            'catalog': SimpleUploadedFile('menu.txt', b'kind,name')
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].errors)
+
+        response = self.client.post(url, {
+            'catalog': SimpleUploadedFile('menu.csv', CATALOG.encode('utf-8'))
+        }, follow=True)
+        self.assertRedirects(response, reverse('home:navigate'))
+        self.assertEqual(Product.objects.filter(caffe=self.kafo).count(), 3)
+
+    def test_import_command(self):
+        """Check if command imports catalog from a file."""
+
+        handle, path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(handle, 'w') as stream:
+            json.dump({'catalog': menu(3)}, stream)
+
+        try:
+            out = StringIO()
+            call_command('import_catalog', path,
+                         '--caffe={}'.format(self.kafo.id), stdout=out)
+            self.assertIn('3 product', out.getvalue())
+
+            with self.assertRaises(CommandError):
+                call_command('import_catalog', path,
+                             '--caffe={}'.format(self.kafo.id))
+        finally:
+            os.remove(path)
+
+        self.assertEqual(Product.objects.filter(caffe=self.kafo).count(), 3)
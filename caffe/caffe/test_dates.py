@@ -0,0 +1,103 @@
+"""Testing module for the date range helpers."""
+
+from datetime import date, datetime
+
+import pytz
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from reports.models import Report
+
+from .dates import filter_dates, filter_day, local_midnight
+from .models import Caffe
+
+
+@override_settings(TIME_ZONE='Europe/Warsaw')
+class DatesTest(TestCase):
+    """Date range helpers tests."""
+
+    def setUp(self):
+        """Prepare database for tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+    def create_report(self, created_on):
+        """Create Report with given date of creation (in UTC)."""
+
+        report = Report.objects.create(caffe=self.kafo)
+        Report.objects.filter(id=report.id).update(
+            created_on=pytz.utc.localize(created_on)
+        )
+        return report
+
+    def test_local_midnight(self):
+        """Check if midnight is in the current timezone."""
+
+        self.assertEqual(
+            local_midnight(date(2016, 7, 1)),
+            pytz.utc.localize(datetime(2016, 6, 30, 22))
+        )
+        self.assertEqual(
+            local_midnight(date(2016, 1, 1)),
+            pytz.utc.localize(datetime(2015, 12, 31, 23))
+        )
+
+    def test_filter_day(self):
+        """Check if rows from the local day are returned."""
+
+        reports = [
+            self.create_report(datetime(2016, 6, 30, 21, 59)),
+            self.create_report(datetime(2016, 6, 30, 22, 0)),
+            self.create_report(datetime(2016, 7, 1, 21, 59)),
+            self.create_report(datetime(2016, 7, 1, 22, 0)),
+        ]
+
+        self.assertCountEqual(
+            filter_day(Report.objects.all(), 'created_on', date(2016, 7, 1)),
+            reports[1:3]
+        )
+
+        # the same rows as with lookups extracting the local day
+        self.assertCountEqual(
+            Report.objects.filter(
+                created_on__year=2016,
+                created_on__month=7,
+                created_on__day=1
+            ),
+            reports[1:3]
+        )
+
+    def test_filter_dates(self):
+        """Check if range of local dates is half-open."""
+
+        reports = [
+            self.create_report(datetime(2016, 6, 30, 22, 0)),
+            self.create_report(datetime(2016, 7, 2, 12, 0)),
+            self.create_report(datetime(2016, 7, 2, 22, 0)),
+        ]
+
+        self.assertCountEqual(
+            filter_dates(
+                Report.objects.all(),
+                'created_on',
+                date(2016, 7, 1),
+                date(2016, 7, 3)
+            ),
+            reports[:2]
+        )
+
+    def test_filter_day_sql(self):
+        """Check if created_on is compared without extracting parts."""
+
+        day = timezone.localtime(timezone.now()).date()
+        sql = str(filter_day(Report.objects.all(), 'created_on', day).query)
+
+        self.assertNotIn('django_datetime_extract', sql)
+        self.assertIn('"reports_report"."created_on" >=', sql)
+        self.assertIn('"reports_report"."created_on" <', sql)
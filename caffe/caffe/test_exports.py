@@ -0,0 +1,127 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103,R0902
+
+import os
+import tempfile
+from datetime import date
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from employees.models import Employee
+from hours.models import Position, WorkedHours
+
+from .exports import csv_response, keyset_chunks
+from .forms import ExportForm
+from .models import Caffe
+
+
+class ExportsTests(TestCase):
+    """Test helpers of CSV exports."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+        for i in range(5):
+            Caffe.objects.create(
+                name='kafo {}'.format(i),
+                city='Gliwice',
+                street='Wieczorka',
+                house_number='14',
+                postal_code='44-100'
+            )
+
+    def test_keyset_chunks(self):
+        """Check if every chunk takes one query and rows are not repeated."""
+
+        caffes = Caffe.objects.exclude(id=self.kafo.id)
+        chunks = keyset_chunks(caffes, ('name',), size=2)
+
+        with self.assertNumQueries(1):
+            first = next(chunks)
+
+        self.assertEqual(len(first), 2)
+
+        with self.assertNumQueries(3):
+            rest = list(chunks)
+
+        self.assertEqual([len(chunk) for chunk in rest], [2, 1])
+        names = [name for chunk in [first] + rest for _, name in chunk]
+        self.assertEqual(names, ['kafo {}'.format(i) for i in range(5)])
+
+    def test_csv_response(self):
+        """Check if rows are streamed as attachment."""
+
+        response = csv_response(
+            'raporty', date(2016, 7, 1), date(2016, 7, 31), ('a', 'b'),
+            iter([(1, 'x'), (2, 'y,z')])
+        )
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response['Content-Disposition'],
+            'attachment; filename="raporty-20160701-20160731.csv"'
+        )
+        self.assertEqual(
+            b''.join(response.streaming_content),
+            b'a,b\r\n1,x\r\n2,"y,z"\r\n'
+        )
+
+    def test_export_form(self):
+        """Check if end of range can not be before its start."""
+
+        form = ExportForm({'start': '2016-07-02', 'end': '2016-07-01'})
+        self.assertFalse(form.is_valid())
+        self.assertIn('end', form.errors)
+
+        form = ExportForm({'start': '2016-07-01', 'end': '2016-07-01'})
+        self.assertTrue(form.is_valid())
+
+    def test_export_command(self):
+        """Check if command writes CSV to standard output or to a file."""
+
+        kate = Employee.objects.create(
+            username='KateT',
+            first_name='Kate',
+            last_name='Tempest',
+            caffe=self.kafo
+        )
+        WorkedHours.objects.create(
+            start_time='08:00',
+            end_time='16:00',
+            date=date(2016, 7, 1),
+            position=Position.objects.create(name='Barista', caffe=self.kafo),
+            employee=kate,
+            caffe=self.kafo
+        )
+
+        args = ['hours', '--caffe={}'.format(self.kafo.id),
+                '--start=2016-07-01', '--end=2016-07-31']
+
+        out = StringIO()
+        call_command('export_csv', *args, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].endswith(',Kate,Tempest,Barista,480'))
+
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        os.close(handle)
+        try:
+            call_command('export_csv', '--output={}'.format(path), *args)
+            with open(path) as stream:
+                self.assertEqual(stream.read().splitlines(), lines)
+        finally:
+            os.remove(path)
+
+        with self.assertRaises(CommandError):
+            call_command('export_csv', 'hours', '--caffe=0',
+                         '--start=2016-07-01', '--end=2016-07-31')
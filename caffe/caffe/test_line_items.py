@@ -0,0 +1,293 @@
+"""Testing module for the line items helpers."""
+# pylint: disable=C0103,R0902
+
+from django.http import QueryDict
+from django.test import TestCase
+
+from reports.models import Category, FullProduct, Product, Report, Unit
+
+from .line_items import (batches, bulk_update, diff_line_items,
+                         get_submitted_line_items, parse_line_items,
+                         prefill_line_items, sync_line_items)
+from .models import Caffe
+
+
+class LineItemsTests(TestCase):
+    """Line items helpers tests."""
+
+    def setUp(self):
+        """Prepare database for tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        juices = Category.objects.create(name='Soki', caffe=self.kafo)
+        liter = Unit.objects.create(name='litr', caffe=self.kafo)
+
+        self.products = [
+            Product.objects.create(
+                name='Sok {}'.format(i),
+                category=juices,
+                unit=liter,
+                caffe=self.kafo
+            ) for i in range(6)
+        ]
+
+        self.report = Report.objects.create(caffe=self.kafo)
+        for product in self.products[:3]:
+            FullProduct.objects.create(
+                product=product,
+                amount=10,
+                report=self.report,
+                caffe=self.kafo
+            )
+
+    def submitted(self, amounts):
+        """Return not saved FullProducts with given amounts of products."""
+
+        return [
+            FullProduct(
+                product=self.products[i],
+                amount=amount,
+                report=self.report,
+                caffe=self.kafo
+            ) for i, amount in amounts
+        ]
+
+    def test_batches(self):
+        """Check if items are split into batches properly."""
+
+        self.assertEqual(list(batches([])), [])
+        self.assertEqual(list(batches(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(batches(range(4), 2)), [[0, 1], [2, 3]])
+
+    def test_diff_line_items(self):
+        """Check if line items are compared properly."""
+
+        to_create, to_update, to_delete = diff_line_items(
+            self.report.full_products.all(),
+            self.submitted([(0, 10), (1, 20), (3, 30)]),
+            'product_id',
+            ('amount',)
+        )
+
+        self.assertEqual([item.product for item in to_create], [
+            self.products[3]
+        ])
+        self.assertEqual([item.product for item in to_update], [
+            self.products[1]
+        ])
+        self.assertEqual(to_update[0].amount, 20)
+        self.assertIsNotNone(to_update[0].pk)
+        self.assertEqual([item.product for item in to_delete], [
+            self.products[2]
+        ])
+
+    def test_diff_line_items_unchanged(self):
+        """Check if nothing has to be written when nothing has changed."""
+
+        self.assertEqual(
+            diff_line_items(
+                self.report.full_products.all(),
+                self.submitted([(0, 10), (1, 10), (2, 10)]),
+                'product_id',
+                ('amount',)
+            ),
+            ([], [], [])
+        )
+
+    def test_bulk_update(self):
+        """Check if objects are updated with their own values."""
+
+        full_products = list(self.report.full_products.order_by('id'))
+        for i, full_product in enumerate(full_products):
+            full_product.amount = i
+
+        with self.assertNumQueries(1):
+            bulk_update(FullProduct, full_products, ('amount',))
+
+        self.assertEqual(
+            list(
+                self.report.full_products.order_by('id').values_list(
+                    'amount', flat=True
+                )
+            ),
+            [0, 1, 2]
+        )
+
+    def test_sync_line_items(self):
+        """Check if only changed line items are written."""
+
+        stored = {
+            item.product_id: item.pk
+            for item in self.report.full_products.all()
+        }
+
+        # select, delete, update and insert
+        with self.assertNumQueries(4):
+            sync_line_items(
+                self.report.full_products.all(),
+                self.submitted([(0, 10), (1, 20), (3, 30), (4, 40)]),
+                'product_id',
+                ('amount',)
+            )
+
+        full_products = {
+            item.product_id: item
+            for item in self.report.full_products.all()
+        }
+
+        self.assertCountEqual(full_products.keys(), [
+            self.products[i].id for i in [0, 1, 3, 4]
+        ])
+
+        # unchanged and updated rows are kept
+        for i in [0, 1]:
+            product_id = self.products[i].id
+            self.assertEqual(full_products[product_id].pk, stored[product_id])
+
+        self.assertEqual(full_products[self.products[1].id].amount, 20)
+        self.assertEqual(full_products[self.products[4].id].amount, 40)
+
+    def test_sync_line_items_unchanged(self):
+        """Check if nothing is written when nothing has changed."""
+
+        with self.assertNumQueries(1):
+            sync_line_items(
+                self.report.full_products.all(),
+                self.submitted([(0, 10), (1, 10), (2, 10)]),
+                'product_id',
+                ('amount',)
+            )
+
+    def test_prefill_line_items(self):
+        """Check if entries with stored line items are selected."""
+
+        entries = [
+            {'id': product.id, 'selected': False, 'amount': ''}
+            for product in self.products
+        ]
+
+        full_product = self.report.full_products.first()
+        FullProduct.objects.filter(pk=full_product.pk).update(amount=3)
+
+        with self.assertNumQueries(1):
+            prefill_line_items(
+                entries,
+                self.report.full_products.all(),
+                'product_id'
+            )
+
+        selected = {
+            entry['id']: entry['amount']
+            for entry in entries if entry['selected']
+        }
+        self.assertEqual(selected, {
+            self.products[0].id: 10,
+            self.products[1].id: 10,
+            self.products[2].id: 10,
+            full_product.product_id: 3
+        })
+
+        for entry in entries[3:]:
+            self.assertEqual(entry['amount'], '')
+
+    def test_get_submitted_line_items(self):
+        """Check if only line items are taken from submitted data."""
+
+        data = QueryDict(mutable=True)
+        data.setlist('12', ['12', '3.5'])
+        data.setlist('13', ['13'])
+        data['csrfmiddlewaretoken'] = 'hasz'
+        data['cash_before_shift'] = '20'
+
+        self.assertEqual(get_submitted_line_items(data), [('12', '3.5')])
+
+    def test_parse_line_items(self):
+        """Check if submitted line items are resolved with one query."""
+
+        entries = [
+            {'id': product.id, 'selected': False, 'amount': '', 'errors': {}}
+            for product in self.products
+        ]
+        submitted = [
+            (str(product.id), str(i))
+            for i, product in enumerate(self.products)
+        ]
+
+        with self.assertNumQueries(1):
+            full_products, valid = parse_line_items(
+                submitted,
+                entries,
+                Product.objects.filter(caffe=self.kafo),
+                FullProduct,
+                'product',
+                self.kafo
+            )
+
+        self.assertTrue(valid)
+        self.assertEqual(
+            [(item.product, item.amount) for item in full_products],
+            [(product, i) for i, product in enumerate(self.products)]
+        )
+        for full_product in full_products:
+            self.assertEqual(full_product.caffe, self.kafo)
+        self.assertIsNone(full_products[0].pk)
+
+        for i, entry in enumerate(entries):
+            self.assertTrue(entry['selected'])
+            self.assertEqual(entry['amount'], str(i))
+            self.assertEqual(entry['errors'], '')
+
+    def test_parse_line_items_invalid(self):
+        """Check if invalid amounts and unknown ids are reported."""
+
+        other_caffe = Caffe.objects.create(
+            name='filtry',
+            city='Warszawa',
+            street='Filry',
+            house_number='14',
+            postal_code='44-100'
+        )
+        other_product = Product.objects.create(
+            name='Sok',
+            category=Category.objects.create(name='Soki', caffe=other_caffe),
+            unit=Unit.objects.create(name='litr', caffe=other_caffe),
+            caffe=other_caffe
+        )
+
+        entries = [
+            {'id': product.id, 'selected': False, 'amount': '', 'errors': {}}
+            for product in self.products
+        ]
+
+        full_products, valid = parse_line_items(
+            [
+                (str(self.products[0].id), ''),
+                (str(self.products[1].id), '-1'),
+                (str(self.products[2].id), '5'),
+                (str(other_product.id), '5'),
+                ('abc', '5')
+            ],
+            entries,
+            Product.objects.filter(caffe=self.kafo),
+            FullProduct,
+            'product',
+            self.kafo
+        )
+
+        self.assertFalse(valid)
+        self.assertEqual(
+            [item.product for item in full_products],
+            [self.products[2]]
+        )
+        self.assertEqual(entries[0]['amount'], '')
+        self.assertEqual(len(entries[0]['errors']), 1)
+        self.assertEqual(len(entries[1]['errors']), 1)
+        self.assertEqual(entries[2]['errors'], '')
+        self.assertFalse(entries[3]['selected'])
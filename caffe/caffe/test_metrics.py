@@ -0,0 +1,172 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103,R0902
+
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.test import Client, TestCase, override_settings
+
+from employees.models import Employee
+from reports.persistence import create_report
+
+from .cache import get_or_set
+from .metrics import Registry, export, gather, get_namespace, registry
+from .models import Caffe
+
+
+class MetricsTests(TestCase):
+    """Test exporting metrics in format of Prometheus."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+        self.kate = Employee.objects.create_user(
+            username='KateT',
+            password='KateT',
+            caffe=self.kafo
+        )
+
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        cache.clear()
+        registry.clear()
+
+    def test_namespace(self):
+        """Check if namespace is taken from name of view."""
+
+        self.assertEqual(get_namespace('reports:edit'), 'reports')
+        self.assertEqual(get_namespace('caffe_create'), 'caffe')
+        self.assertEqual(get_namespace('<unresolved>'), 'none')
+
+    def test_export(self):
+        """Check if histograms and counters are exported."""
+
+        other = Registry()
+        other.observe('reports:edit', {'queries': 3, 'duration_seconds': 0.2})
+        other.increment('requests_total', view='reports:edit', status=200)
+        other.increment('requests_total', view='reports:edit', status=200)
+
+        lines = export(other).splitlines()
+
+        self.assertIn('# TYPE caffe_request_queries histogram', lines)
+        self.assertIn(
+            'caffe_request_queries_bucket{namespace="reports",'
+            'view="reports:edit",le="2.0"} 0', lines
+        )
+        self.assertIn(
+            'caffe_request_queries_bucket{namespace="reports",'
+            'view="reports:edit",le="5.0"} 1', lines
+        )
+        self.assertIn(
+            'caffe_request_queries_bucket{namespace="reports",'
+            'view="reports:edit",le="+Inf"} 1', lines
+        )
+        self.assertIn(
+            'caffe_request_queries_sum{namespace="reports",'
+            'view="reports:edit"} 3.0', lines
+        )
+        self.assertIn('# TYPE caffe_requests_total counter', lines)
+        self.assertIn(
+            'caffe_requests_total{status="200",view="reports:edit"} 2', lines
+        )
+
+    def test_cache_hit_ratio(self):
+        """Check if hits and misses of the cache are counted."""
+
+        for _ in range(4):
+            get_or_set('tests', self.kafo.id, [], lambda: 1)
+
+        lines = export(registry).splitlines()
+
+        self.assertIn(
+            'caffe_cache_requests_total{namespace="tests",result="hit"} 3',
+            lines
+        )
+        self.assertIn(
+            'caffe_cache_requests_total{namespace="tests",result="miss"} 1',
+            lines
+        )
+        self.assertIn('caffe_cache_hit_ratio{namespace="tests"} 0.75', lines)
+
+    def test_reports_written(self):
+        """Check if written reports are counted."""
+
+        create_report(self.kafo, self.kate, [])
+        create_report(self.kafo, self.kate, [])
+
+        self.assertIn(
+            'caffe_reports_written_total{kind="report"} 2',
+            export(registry).splitlines()
+        )
+
+    def test_gather(self):
+        """Check if metrics of all processes are summed up."""
+
+        other = Registry()
+        other.observe('reports:edit', {'queries': 3})
+        other.increment('requests_total', view='reports:edit', status=200)
+
+        with open(os.path.join(self.directory, 'metrics-1.json'), 'w') as f:
+            json.dump(other.dump(), f)
+
+        with open(os.path.join(self.directory, 'metrics-2.json'), 'w') as f:
+            f.write('{')
+
+        registry.observe('reports:edit', {'queries': 5})
+        registry.increment('requests_total', view='reports:edit', status=200)
+
+        with override_settings(METRICS_DIR=self.directory):
+            gathered = gather()
+
+        self.assertTrue(os.path.exists(os.path.join(
+            self.directory, 'metrics-{}.json'.format(os.getpid())
+        )))
+
+        (name, view, histogram), = gathered.collect()
+        self.assertEqual((name, view), ('queries', 'reports:edit'))
+        self.assertEqual(histogram.count, 2)
+        self.assertEqual(histogram.sum, 8)
+        self.assertEqual(
+            gathered.counters['requests_total',
+                              (('status', 200), ('view', 'reports:edit'))],
+            2
+        )
+
+    def test_metrics_view(self):
+        """Check if metrics are shown only when they are enabled."""
+
+        client = Client()
+        url = reverse('caffe_metrics')
+
+        response = client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+        with override_settings(REQUEST_METRICS=True,
+                               METRICS_DIR=self.directory):
+            client = Client()
+            with self.assertLogs('caffe.metrics', 'INFO'):
+                client.get(url)
+                response = client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response['Content-Type'],
+            'text/plain; version=0.0.4; charset=utf-8'
+        )
+        self.assertIn(
+            'caffe_requests_total{namespace="caffe",status="200",'
+            'view="caffe_metrics"} 1',
+            response.content.decode().splitlines()
+        )
@@ -0,0 +1,110 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103,R0902
+
+import json
+
+from django.contrib.auth.models import Permission
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.urlresolvers import reverse
+from django.test import Client, TestCase, override_settings
+
+from employees.models import Employee
+from reports.models import Report
+
+from .metrics import Histogram, registry
+from .middleware import RequestMetricsMiddleware
+from .models import Caffe
+
+
+@override_settings(REQUEST_METRICS=True, REQUEST_METRICS_MEMORY=True)
+class RequestMetricsTests(TestCase):
+    """Test recording metrics of requests."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+        self.kate = Employee.objects.create_user(
+            username='KateT',
+            password='KateT',
+            caffe=self.kafo
+        )
+        self.kate.user_permissions.add(
+            Permission.objects.get(codename='view_report')
+        )
+        self.report = Report.objects.create(
+            creator=self.kate,
+            caffe=self.kafo
+        )
+
+        registry.clear()
+        self.client = Client()
+        self.client.login(username='KateT', password='KateT')
+
+    def test_histogram(self):
+        """Check if values are counted in cumulative buckets."""
+
+        histogram = Histogram((1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.cumulative(),
+                         [(1, 2), (5, 3), (float('inf'), 4)])
+        self.assertEqual(histogram.sum, 14.5)
+        self.assertEqual(histogram.count, 4)
+
+    def test_request_metrics(self):
+        """Check if metrics of request are logged and observed per view."""
+
+        url = reverse('reports:show', args=(self.report.id,))
+        # permissions are cached by the first request
+        with self.assertLogs('caffe.metrics', 'INFO'):
+            self.client.get(url)
+        registry.clear()
+
+        with self.assertLogs('caffe.metrics', 'INFO') as logs:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'reports:show')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertGreater(record['template_ms'], 0)
+        self.assertGreater(record['memory_kib'], 0)
+        self.assertLessEqual(record['template_ms'], record['duration_ms'])
+
+        with self.assertLogs('caffe.metrics', 'INFO'):
+            self.client.get(url)
+            self.client.get('/not/existing/')
+
+        collected = {
+            (name, view): histogram
+            for name, view, histogram in registry.collect()
+        }
+        self.assertEqual(collected['queries', 'reports:show'].count, 2)
+        self.assertEqual(
+            collected['duration_seconds', '<unresolved>'].count, 1
+        )
+        self.assertEqual(
+            collected['queries', 'reports:show'].sum, record['queries'] * 2
+        )
+
+    def test_disabled(self):
+        """Check if middleware is not used when metrics are disabled."""
+
+        with override_settings(REQUEST_METRICS=False):
+            with self.assertRaises(MiddlewareNotUsed):
+                RequestMetricsMiddleware()
+
+            client = Client()
+            client.login(username='KateT', password='KateT')
+            client.get(reverse('reports:show', args=(self.report.id,)))
+
+        self.assertEqual(registry.collect(), [])
@@ -0,0 +1,104 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103,R0902
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.six import StringIO
+
+from cash.models import CashReport, FullExpense
+from employees.models import Employee
+from hours.models import MonthlyTimesheet, WorkedHours
+from hours.shifts import find_conflicts
+from reports.models import FullProduct, Product, Report, StockLevel
+from stats.models import ProductDailyStats
+
+from .models import Caffe
+from .synthetic import Scale, check_invariants, generate
+
+SCALE = Scale(caffes=2, products=4, days=5, employees=2, shifts=3)
+
+
+class SyntheticTests(TestCase):
+    """Test generating synthetic data of caffes."""
+
+    def test_generate(self):
+        """Check if data is generated at given scale with derived data."""
+
+        caffes = generate(SCALE, 'Test', seed=1)
+        self.assertEqual([caffe.name for caffe in caffes],
+                         ['Test 1', 'Test 2'])
+
+        kafo = caffes[0]
+        self.assertEqual(Employee.objects.filter(caffe=kafo).count(), 2)
+        self.assertEqual(Product.objects.filter(caffe=kafo).count(), 4)
+        self.assertEqual(Report.objects.filter(caffe=kafo).count(), 5)
+        self.assertEqual(FullProduct.objects.filter(caffe=kafo).count(), 20)
+        self.assertEqual(CashReport.objects.filter(caffe=kafo).count(), 5)
+        self.assertEqual(WorkedHours.objects.filter(caffe=kafo).count(), 15)
+
+        # history is kept, not replaced by the time of the insert
+        self.assertEqual(
+            len(set(Report.objects.filter(caffe=kafo).values_list(
+                'created_on', flat=True
+            ))), 5
+        )
+        self.assertFalse(Report.objects.filter(
+            created_on__gte=timezone.now()
+        ).exists())
+
+        self.assertEqual(check_invariants([caffe.id for caffe in caffes]),
+                         [])
+        self.assertEqual(
+            find_conflicts(list(WorkedHours.objects.all())), set()
+        )
+
+        self.assertEqual(StockLevel.objects.count(),
+                         FullProduct.objects.count())
+        self.assertTrue(MonthlyTimesheet.objects.exists())
+        self.assertTrue(ProductDailyStats.objects.exists())
+
+        with self.assertRaises(ValueError):
+            generate(SCALE, 'Test')
+
+    def test_seed(self):
+        """Check if the same seed generates the same data."""
+
+        def amounts(prefix):
+            caffes = generate(SCALE, prefix, seed=7)
+            return [
+                list(FullProduct.objects.filter(caffe=caffe).order_by(
+                    'id'
+                ).values_list('amount', flat=True))
+                for caffe in caffes
+            ]
+
+        self.assertEqual(amounts('A'), amounts('B'))
+
+    def test_check_invariants(self):
+        """Check if broken invariants are found."""
+
+        kafo, filtry = generate(SCALE, 'Test', seed=1)
+
+        Report.objects.filter(caffe=kafo).update(
+            creator=Employee.objects.filter(caffe=filtry).first()
+        )
+        FullExpense.objects.filter(caffe=kafo).update(amount=1000)
+        broken = check_invariants([kafo.id])
+
+        self.assertEqual(len(broken), 2)
+        self.assertIn('reports created by employee of other caffe: 5',
+                      broken)
+        self.assertTrue(broken[1].startswith('cash reports with wrong sum'))
+
+    def test_command(self):
+        """Check if command generates data and rejects wrong scale."""
+
+        out = StringIO()
+        call_command('generate_data', '--caffes=1', '--products=2',
+                     '--days=2', '--seed=1', stdout=out)
+        self.assertIn('Generated 1 caffes', out.getvalue())
+        self.assertTrue(Caffe.objects.filter(name='Kawiarnia 1').exists())
+
+        with self.assertRaises(CommandError):
+            call_command('generate_data', '--employees=1', '--shifts=5')
@@ -1,13 +1,16 @@
 from django.conf.urls import include, url
 from django.contrib import admin
 
-from .views import index_navigate, caffe_create
+from .views import (caffe_create, caffe_import_catalog, caffe_metrics,
+                    index_navigate)
 
 urlpatterns = [
     url(r'^admin/', admin.site.urls),
 
     url(r'^$', index_navigate, name='index_navigate'),
     url(r'^create/$', caffe_create, name='caffe_create'),
+    url(r'^import/$', caffe_import_catalog, name='caffe_import_catalog'),
+    url(r'^metrics/$', caffe_metrics, name='caffe_metrics'),
 
     url(r'cafe/', include('home.urls', namespace='home')),
     url(r'reports/', include('reports.urls', namespace='reports')),
@@ -1,11 +1,18 @@
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.auth.decorators import permission_required
 from django.contrib.auth.models import Group
+from django.core.exceptions import ValidationError
 from django.core.urlresolvers import reverse
+from django.http import Http404, HttpResponse
 from django.shortcuts import redirect, render
 
 from employees.forms import EmployeeForm
 
-from .forms import CaffeForm
+from .catalog import import_catalog
+from .forms import CaffeForm, CatalogForm
+from .imports import get_format, read_rows
+from .metrics import export, gather
 
 
 def index_navigate(request):
@@ -44,3 +51,52 @@ def caffe_create(request):
         'caffe_form': caffe_form,
         'admin_form': admin_form,
     })
+
+
+@permission_required(['reports.add_category', 'reports.add_unit',
+                      'reports.add_product', 'cash.add_company',
+                      'cash.add_expense'])
+def caffe_import_catalog(request):
+    """Create products, expenses and all their elements from uploaded file."""
+
+    form = CatalogForm(request.POST or None, request.FILES or None)
+
+    if form.is_valid():
+        catalog = form.cleaned_data['catalog']
+
+        try:
+            rows = read_rows(catalog, get_format(catalog.name), 'catalog')
+            created = import_catalog(request.user.caffe, rows)
+        except ValidationError as error:
+            form.add_error('catalog', error)
+        else:
+            messages.success(
+                request,
+                u'Katalog został poprawnie dodany ({} produktów, {} '
+                u'wydatków).'.format(created['product'], created['expense'])
+            )
+
+            return redirect(reverse('home:navigate'))
+
+    return render(request, 'caffe/import.html', {
+        'form': form,
+        'title': u'Import katalogu',
+        'button': u'Importuj'
+    })
+
+
+def caffe_metrics(request):
+    """Show metrics of all processes in text format of Prometheus.
+
+    Metrics are available only when REQUEST_METRICS is set. They are not
+    protected by login, so they should not be exposed outside of the
+    internal network (see nginx configuration).
+    """
+
+    if not getattr(settings, 'REQUEST_METRICS', False):
+        raise Http404()
+
+    return HttpResponse(
+        export(gather()),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
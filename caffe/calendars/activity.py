@@ -0,0 +1,136 @@
+"""Module responsible for activity of Caffe shown in the calendar.
+
+Activity of a month is the number of reports, cash reports and worked hours
+for every day of the month. Each model is counted with one grouped query.
+Activity is cached per Caffe and month, and the cache of Caffe is
+invalidated whenever any of the counted rows is saved or deleted, or
+WorkedHours are imported in bulk. Lists of rows of a day shown in the
+calendar are cached in the same namespace.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Count
+
+from caffe.cache import bump_version, get_or_set
+from caffe.dates import annotate_day, filter_dates, month_bounds, to_date
+from cash.models import CashReport
+from hours.models import WorkedHours
+from reports.models import Report
+
+ACTIVITY_NAMESPACE = 'calendars.activity'
+ACTIVITY_TIMEOUT = 60 * 60 * 24
+
+
+def count_by_day(queryset, field, start, end):
+    """Count rows for every local day of given range.
+
+    Args:
+        queryset (QuerySet): Rows which are counted.
+        field (str): Name of date or datetime field.
+        start (date): First day of the range.
+        end (date): First day after the range.
+
+    Returns:
+        Dictionary with number of rows for days which have any rows.
+    """
+
+    queryset = annotate_day(
+        filter_dates(queryset, field, start, end).order_by(),
+        field
+    )
+
+    rows = queryset.values_list('day').annotate(count=Count('id'))
+    return {to_date(day): count for day, count in rows}
+
+
+def build_month_activity(caffe, year, month):
+    """Return activity of Caffe in given month, omitting the cache.
+
+    Args:
+        caffe (Caffe): Caffe which activity is returned.
+        year (int): Year of the month.
+        month (int): Number of the month.
+
+    Returns:
+        List of dictionaries with date and number of reports, cash reports
+        and worked hours, one for every day of the month.
+
+    Raises:
+        ValueError: Month does not exist.
+    """
+
+    start, end = month_bounds(year, month)
+
+    reports = count_by_day(
+        Report.objects.filter(caffe=caffe), 'created_on', start, end
+    )
+    cash_reports = count_by_day(
+        CashReport.objects.filter(caffe=caffe), 'created_on', start, end
+    )
+    worked_hours = count_by_day(
+        WorkedHours.objects.filter(caffe=caffe), 'date', start, end
+    )
+
+    days = []
+    day = start
+    while day < end:
+        days.append({
+            'date': day.isoformat(),
+            'reports': reports.get(day, 0),
+            'cash_reports': cash_reports.get(day, 0),
+            'worked_hours': worked_hours.get(day, 0)
+        })
+        day += timedelta(days=1)
+
+    return days
+
+
+def get_month_activity(caffe, year, month):
+    """Return activity of Caffe in given month.
+
+    Args:
+        caffe (Caffe): Caffe which activity is returned.
+        year (int): Year of the month.
+        month (int): Number of the month.
+
+    Returns:
+        List of dictionaries with date and number of reports, cash reports
+        and worked hours, one for every day of the month.
+
+    Raises:
+        ValueError: Month does not exist.
+    """
+
+    return get_or_set(
+        ACTIVITY_NAMESPACE,
+        caffe.id if caffe else None,
+        [year, month],
+        lambda: build_month_activity(caffe, year, month),
+        ACTIVITY_TIMEOUT
+    )
+
+
+def invalidate_activity(caffe_id):
+    """Invalidate activity of all months for Caffe with given id."""
+
+    bump_version(ACTIVITY_NAMESPACE, caffe_id)
+
+
+def activity_changed(sender, instance, **kwargs):
+    """Invalidate activity when counted row has been saved or deleted."""
+
+    invalidate_activity(instance.caffe_id)
+
+
+def worked_hours_written(sender, caffe, **kwargs):
+    """Invalidate activity when WorkedHours have been written in bulk."""
+
+    invalidate_activity(caffe.id)
+
+
+def caffe_created(sender, instance, created, **kwargs):
+    """Invalidate activity of new Caffe, which can get id of removed one."""
+
+    if created:
+        invalidate_activity(instance.id)
@@ -1,5 +1,22 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class CalendarsConfig(AppConfig):
     name = 'calendars'
+
+    def ready(self):
+        """Connect signals which invalidate activity shown in calendar."""
+
+        from hours.signals import worked_hours_written
+
+        from . import activity
+
+        senders = ['reports.Report', 'cash.CashReport', 'hours.WorkedHours']
+        for sender in senders:
+            post_save.connect(activity.activity_changed, sender=sender)
+            post_delete.connect(activity.activity_changed, sender=sender)
+
+        worked_hours_written.connect(activity.worked_hours_written)
+
+        post_save.connect(activity.caffe_created, sender='caffe.Caffe')
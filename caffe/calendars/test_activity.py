@@ -0,0 +1,159 @@
+"""Testing module for activity shown in the calendar."""
+# pylint: disable=C0103,R0902
+
+from datetime import date, datetime
+
+import pytz
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from caffe.models import Caffe
+from cash.models import CashReport
+from employees.models import Employee
+from hours.models import Position, WorkedHours
+from hours.schedule import import_schedule
+from reports.models import Report
+
+from .activity import build_month_activity, get_month_activity
+
+
+@override_settings(TIME_ZONE='Europe/Warsaw')
+class MonthActivityTest(TestCase):
+    """Tests of activity of Caffe in one month."""
+
+    def setUp(self):
+        """Prepare data for tests."""
+
+        cache.clear()
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+        self.filtry = Caffe.objects.create(
+            name='filtry',
+            city='Warszawa',
+            street='Filry',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.kate = Employee.objects.create(
+            username='KateT',
+            first_name='Kate',
+            last_name='Tempest',
+            caffe=self.kafo
+        )
+        self.barista = Position.objects.create(name='Barista', caffe=self.kafo)
+
+        # local 1st of July, local 30th of June and local 2nd of July
+        for created_on in [datetime(2016, 6, 30, 22, 30),
+                           datetime(2016, 6, 30, 21, 30),
+                           datetime(2016, 7, 1, 23, 0)]:
+            self.create_report(self.kafo, created_on)
+
+        self.create_report(self.filtry, datetime(2016, 7, 1, 12, 0))
+
+        cash_report = CashReport.objects.create(
+            creator=self.kate,
+            caffe=self.kafo,
+            cash_before_shift=0,
+            cash_after_shift=0,
+            card_payments=0,
+            amount_due=0
+        )
+        CashReport.objects.filter(id=cash_report.id).update(
+            created_on=pytz.utc.localize(datetime(2016, 7, 31, 21, 0))
+        )
+
+        for day in [date(2016, 7, 31), date(2016, 7, 31), date(2016, 8, 1)]:
+            WorkedHours.objects.create(
+                start_time='12:30',
+                end_time='15:50',
+                date=day,
+                position=self.barista,
+                employee=self.kate,
+                caffe=self.kafo
+            )
+
+    def create_report(self, caffe, created_on):
+        """Create Report with given date of creation (in UTC)."""
+
+        report = Report.objects.create(caffe=caffe)
+        Report.objects.filter(id=report.id).update(
+            created_on=pytz.utc.localize(created_on)
+        )
+
+    def test_build_month_activity(self):
+        """Check if rows are counted for local days with one query each."""
+
+        with self.assertNumQueries(3):
+            days = build_month_activity(self.kafo, 2016, 7)
+
+        self.assertEqual(len(days), 31)
+        self.assertEqual(days[0], {
+            'date': '2016-07-01',
+            'reports': 1,
+            'cash_reports': 0,
+            'worked_hours': 0
+        })
+        self.assertEqual(days[1]['reports'], 1)
+        self.assertEqual(days[30], {
+            'date': '2016-07-31',
+            'reports': 0,
+            'cash_reports': 1,
+            'worked_hours': 2
+        })
+
+        for day in days[2:30]:
+            self.assertEqual(
+                (day['reports'], day['cash_reports'], day['worked_hours']),
+                (0, 0, 0)
+            )
+
+    def test_build_month_activity_december(self):
+        """Check if December ends with the last day of the year."""
+
+        days = build_month_activity(self.kafo, 2016, 12)
+        self.assertEqual(days[-1]['date'], '2016-12-31')
+
+    def test_get_month_activity_cached(self):
+        """Check if activity is cached until counted rows change."""
+
+        activity = get_month_activity(self.kafo, 2016, 7)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_month_activity(self.kafo, 2016, 7), activity)
+
+        self.create_report(self.kafo, datetime(2016, 7, 10, 12, 0))
+        activity = get_month_activity(self.kafo, 2016, 7)
+        self.assertEqual(activity[9]['reports'], 1)
+
+        WorkedHours.objects.filter(date=date(2016, 7, 31)).first().delete()
+        activity = get_month_activity(self.kafo, 2016, 7)
+        self.assertEqual(activity[30]['worked_hours'], 1)
+
+    def test_get_month_activity_bulk(self):
+        """Check if activity is invalidated when WorkedHours are imported."""
+
+        get_month_activity(self.kafo, 2016, 7)
+
+        import_schedule(self.kafo, [{
+            'employee': 'KateT',
+            'position': 'Barista',
+            'date': '2016-07-31',
+            'start_time': '16:00',
+            'end_time': '18:00'
+        }])
+
+        activity = get_month_activity(self.kafo, 2016, 7)
+        self.assertEqual(activity[30]['worked_hours'], 3)
+
+    def test_get_month_activity_invalid(self):
+        """Check if not existing month is not accepted."""
+
+        with self.assertRaises(ValueError):
+            get_month_activity(self.kafo, 2016, 13)
@@ -0,0 +1,25 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103
+
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from caffe.dates import local_today
+from caffe.query_counts import QueryCountsMixin
+
+from .activity import invalidate_activity
+
+
+class CalendarsQueriesTests(QueryCountsMixin, TestCase):
+    """Test if numbers of queries of views do not depend on data."""
+
+    def test_show_day(self):
+        """Check show day of calendar view."""
+
+        today = local_today()
+        self.assertConstantQueries(
+            lambda caffe: reverse(
+                'calendar:show_day', args=(today.year, today.month, today.day)
+            ),
+            invalidate_activity
+        )
@@ -1,4 +1,4 @@
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 
 from django.contrib.auth.models import Permission
 from django.core.urlresolvers import reverse
@@ -168,3 +168,57 @@ class CalendarViewsTests(TestCase):
             response.context['worked_hours'],
             [self.worked_hours_main]
         )
+
+    def test_calendar_show_day_cached(self):
+        """Check if day is cached until its activity changes."""
+
+        today = date.today()
+        url = reverse(
+            'calendar:show_day',
+            args=(today.year, today.month, today.day,)
+        )
+        report_url = reverse('reports:show', args=(self.minor_report.id,))
+        self.client.get(url)
+
+        Report.objects.filter(id=self.minor_report.id).update(
+            created_on=timezone.now() - timedelta(days=2)
+        )
+        response = self.client.get(url)
+        self.assertContains(response, report_url)
+
+        self.minor_report.delete()
+        response = self.client.get(url)
+        self.assertNotContains(response, report_url)
+
+    def test_calendar_show_day_404(self):
+        """Check if 404 is displayed when day does not exist."""
+
+        response = self.client.get(
+            reverse('calendar:show_day', args=(2016, 2, 30,))
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_calendar_month_activity(self):
+        """Check if activity of month is returned as JSON."""
+
+        today = date.today()
+        response = self.client.get(
+            reverse('calendar:month_activity', args=(today.year, today.month))
+        )
+
+        self.assertEqual(response.status_code, 200)
+        days = response.json()['days']
+
+        today_activity = days[today.day - 1]
+        self.assertEqual(today_activity['date'], today.isoformat())
+        self.assertEqual(today_activity['reports'], 2)
+        self.assertEqual(today_activity['cash_reports'], 1)
+        self.assertEqual(today_activity['worked_hours'], 1)
+
+    def test_calendar_month_activity_404(self):
+        """Check if 404 is displayed when month does not exist."""
+
+        response = self.client.get(
+            reverse('calendar:month_activity', args=(2016, 13))
+        )
+        self.assertEqual(response.status_code, 404)
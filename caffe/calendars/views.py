@@ -1,10 +1,16 @@
+from datetime import date
+
 from django.contrib.auth.decorators import login_required, permission_required
+from django.http import Http404, JsonResponse
 from django.shortcuts import render
 
+from caffe.dates import filter_day
 from cash.models import CashReport
 from hours.models import WorkedHours
 from reports.models import Report
 
+from .activity import get_month_activity
+
 
 @login_required
 def calendar_navigate(request):
@@ -18,26 +24,30 @@ def calendar_navigate(request):
 def calendar_show_day(request, year, month, day):
     """Show day."""
 
-    reports = Report.objects.filter(
-        created_on__year=year,
-        created_on__month=month,
-        created_on__day=day,
-        caffe=request.user.caffe
-    ).all()
-
-    cash_reports = CashReport.objects.filter(
-        created_on__year=year,
-        created_on__month=month,
-        created_on__day=day,
-        caffe=request.user.caffe
-    ).all()
-
-    worked_hours = WorkedHours.objects.filter(
-        date__year=year,
-        date__month=month,
-        date__day=day,
-        caffe=request.user.caffe
-    ).all()
+    try:
+        shown_day = date(int(year), int(month), int(day))
+    except ValueError:
+        raise Http404('Taki dzień nie istnieje.')
+
+    reports = filter_day(
+        Report.objects.filter(caffe=request.user.caffe),
+        'created_on',
+        shown_day
+    )
+
+    cash_reports = filter_day(
+        CashReport.objects.filter(caffe=request.user.caffe),
+        'created_on',
+        shown_day
+    )
+
+    worked_hours = filter_day(
+        WorkedHours.objects.filter(
+            caffe=request.user.caffe
+        ).select_related('employee', 'position'),
+        'date',
+        shown_day
+    )
 
     return render(request, 'calendar/full_day.html', {
         'reports': reports,
@@ -49,3 +59,16 @@ def calendar_show_day(request, year, month, day):
             'day': day
         }
     })
+
+
+@permission_required(['hours.view_workedhours', 'reports.view_report',
+                      'cash.view_cashreport'])
+def calendar_month_activity(request, year, month):
+    """Return activity of each day of the month as JSON."""
+
+    try:
+        days = get_month_activity(request.user.caffe, int(year), int(month))
+    except ValueError:
+        raise Http404('Taki miesiąc nie istnieje.')
+
+    return JsonResponse({'days': days})
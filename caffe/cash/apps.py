@@ -1,5 +1,18 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class CashConfig(AppConfig):
     name = 'cash'
+
+    def ready(self):
+        """Connect signals which invalidate cached expenses."""
+
+        from .catalog import caffe_created, expenses_changed
+
+        for model in ['Company', 'Expense']:
+            sender = self.get_model(model)
+            post_save.connect(expenses_changed, sender=sender)
+            post_delete.connect(expenses_changed, sender=sender)
+
+        post_save.connect(caffe_created, sender='caffe.Caffe')
@@ -0,0 +1,30 @@
+"""Module responsible for cached lists of companies and expenses.
+
+Lists of Companies and Expenses of Caffe are cached in the expenses
+namespace, which is invalidated whenever Company or Expense of that Caffe
+is saved or deleted.
+"""
+
+from caffe.cache import bump_version
+
+EXPENSES_NAMESPACE = 'cash.expenses'
+EXPENSES_TIMEOUT = 60 * 60 * 24
+
+
+def invalidate_expenses(caffe_id):
+    """Invalidate cached expenses for Caffe with given id."""
+
+    bump_version(EXPENSES_NAMESPACE, caffe_id)
+
+
+def expenses_changed(sender, instance, **kwargs):
+    """Invalidate expenses when Company or Expense has changed."""
+
+    invalidate_expenses(instance.caffe_id)
+
+
+def caffe_created(sender, instance, created, **kwargs):
+    """Invalidate expenses of new Caffe, which can get id of removed one."""
+
+    if created:
+        invalidate_expenses(instance.id)
@@ -0,0 +1,61 @@
+"""Module responsible for exporting CashReports with expenses to CSV.
+
+CashReports are read in chunks by primary key and FullExpenses of every
+chunk are read with one more query, so the number of queries grows with
+the number of chunks, not with the number of CashReports.
+"""
+
+from caffe.exports import filter_range, format_datetime, keyset_chunks
+
+from .models import CashReport, FullExpense
+
+HEADER = (
+    'cash_report', 'created_on', 'creator', 'cash_before_shift',
+    'cash_after_shift', 'card_payments', 'amount_due', 'expenses_total',
+    'balance', 'company', 'expense', 'amount'
+)
+
+
+def export_cash_reports(caffe, start, end):
+    """Yield CSV rows of CashReports of Caffe, one row per FullExpense.
+
+    CashReports without expenses are written as one row with empty expense
+    columns.
+
+    Args:
+        caffe (Caffe): Caffe which CashReports are exported.
+        start (date): First day of the export.
+        end (date): Last day of the export.
+
+    Yields:
+        Tuples with values of columns given by HEADER.
+    """
+
+    cash_reports = filter_range(
+        CashReport.objects.filter(caffe=caffe), 'created_on', start, end
+    )
+
+    fields = (
+        'created_on', 'creator__username', 'cash_before_shift',
+        'cash_after_shift', 'card_payments', 'amount_due', 'expenses_total',
+        'stored_balance'
+    )
+    for chunk in keyset_chunks(cash_reports, fields):
+        expenses = FullExpense.objects.filter(
+            cash_report_id__in=[cash_report[0] for cash_report in chunk]
+        ).order_by('cash_report_id', 'expense__name')
+
+        report_expenses = {}
+        for cash_report_id, company, name, amount in expenses.values_list(
+            'cash_report_id', 'expense__company__name', 'expense__name',
+            'amount'
+        ):
+            report_expenses.setdefault(cash_report_id, []).append(
+                (company or '', name, amount)
+            )
+
+        for cash_report_id, created_on, *values in chunk:
+            cash_report = (cash_report_id, format_datetime(created_on))
+            cash_report += tuple(values)
+            for expense in report_expenses.get(cash_report_id, [('',) * 3]):
+                yield cash_report + expense
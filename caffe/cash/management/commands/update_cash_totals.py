@@ -0,0 +1,46 @@
+"""Command which backfills and checks denormalized totals of CashReports."""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from cash.models import CashReport
+from cash.totals import find_outdated, update_totals
+
+
+class Command(BaseCommand):
+    """Recalculate `expenses_total` and `stored_balance` of CashReports."""
+
+    help = (
+        'Recalculate expenses total and balance of all cash reports and '
+        'write the ones which are out of date.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            default=False,
+            help='Only report cash reports which are out of date.'
+        )
+
+    def handle(self, *args, **options):
+        outdated = find_outdated(CashReport)
+
+        if options['check']:
+            for cash_report in outdated:
+                self.stdout.write(
+                    'Cash report {} is out of date.'.format(cash_report.id)
+                )
+
+            if outdated:
+                raise CommandError(
+                    '{} cash reports are out of date.'.format(len(outdated))
+                )
+
+            self.stdout.write('All cash reports are up to date.')
+            return
+
+        with transaction.atomic():
+            update_totals(CashReport, outdated)
+
+        self.stdout.write('Updated {} cash reports.'.format(len(outdated)))
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.4 on 2026-10-18 10:53
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+from cash.totals import find_outdated, update_totals
+
+
+def backfill_totals(apps, schema_editor):
+    """Calculate totals of CashReports written before they were stored."""
+
+    CashReport = apps.get_model('cash', 'CashReport')
+    update_totals(CashReport, find_outdated(CashReport))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cash', '0011_auto_20160619_1722'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cashreport',
+            name='expenses_total',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='cashreport',
+            name='stored_balance',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
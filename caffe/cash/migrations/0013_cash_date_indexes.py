@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.4 on 2026-10-18 10:55
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cash', '0012_cash_report_totals'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='cashreport',
+            index_together=set([('caffe', 'created_on')]),
+        ),
+    ]
@@ -3,8 +3,12 @@
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.db.models import Sum
+from django.db.models.functions import Coalesce
 from django.utils.translation import ugettext_lazy as _
 
+from .signals import cash_report_written
+from .totals import calculate_balance
+
 
 class Company(models.Model):
     """Stores one company a cafe interacts with (e.g., GoodCake bakery)."""
@@ -139,9 +143,33 @@ class FullExpense(models.Model):
                 _('Kawiarnia i kawiarnia wydatku nie zgadza się.')
             )
 
+        previous_cash_report_id = None
+        if self.pk:
+            previous_cash_report_id = FullExpense.objects.filter(
+                pk=self.pk
+            ).values_list('cash_report_id', flat=True).first()
+
         self.full_clean()
         super(FullExpense, self).save(*args, **kwargs)
 
+        if self.cash_report:
+            self.cash_report.update_expenses_total()
+
+        if previous_cash_report_id not in (None, self.cash_report_id):
+            CashReport.objects.get(
+                pk=previous_cash_report_id
+            ).update_expenses_total()
+
+    def delete(self, *args, **kwargs):
+        """Delete model from the database."""
+
+        result = super(FullExpense, self).delete(*args, **kwargs)
+
+        if self.cash_report:
+            self.cash_report.update_expenses_total()
+
+        return result
+
     def __str__(self):
         return '{}: {}'.format(self.expense, self.amount)
 
@@ -164,21 +192,61 @@ class CashReport(models.Model):
     card_payments = models.FloatField()
     amount_due = models.FloatField()
 
+    # denormalized sum of FullExpenses and balance, so reports can be sorted
+    # and filtered by them without joining FullExpenses
+    expenses_total = models.FloatField(default=0, editable=False)
+    stored_balance = models.FloatField(default=0, editable=False)
+
     class Meta:
         ordering = ('-created_on', '-updated_on')
         default_permissions = ('add', 'change', 'delete', 'view')
+        index_together = (('caffe', 'created_on'),)
+
+    def get_balance(self, expenses_total):
+        """Calculate balance for given sum of expenses.
+
+        Args:
+            expenses_total (float): Sum of amounts of all FullExpenses.
+
+        Returns:
+            Balance of the report, negative when there is a deficit.
+        """
+
+        return calculate_balance(self, expenses_total)
+
+    def get_expenses_total(self):
+        """Calculate sum of amounts of FullExpenses stored in the database."""
+
+        return self.full_expenses.aggregate(
+            total=Coalesce(Sum('amount'), 0)
+        )['total']
 
     def balance(self):
-        """Calculate balance within one report, indicate deficit/surplus."""
+        """Calculate balance within one report, indicate deficit/surplus.
 
-        expenses = 0
-        if self.full_expenses.count() > 0:
-            expenses = (
-                self.full_expenses.aggregate(Sum('amount'))['amount__sum']
-            )
+        Balance is calculated from FullExpenses stored in the database. Use
+        `stored_balance` field to get it without a query.
+        """
+
+        return self.get_balance(self.get_expenses_total())
 
-        return (self.cash_after_shift + self.card_payments + expenses - \
-                self.cash_before_shift - self.amount_due)
+    def update_expenses_total(self):
+        """Recalculate and write `expenses_total` and `stored_balance`.
+
+        Only these two fields are written, so the report is not validated
+        again and `updated_on` does not change. Sends `cash_report_written`,
+        as expenses of the report have changed.
+        """
+
+        self.expenses_total = self.get_expenses_total()
+        self.stored_balance = self.get_balance(self.expenses_total)
+
+        CashReport.objects.filter(pk=self.pk).update(
+            expenses_total=self.expenses_total,
+            stored_balance=self.stored_balance
+        )
+
+        cash_report_written.send(sender=CashReport, cash_report=self)
 
     def save(self, *args, **kwargs):
         """Save model into the database."""
@@ -189,6 +257,8 @@ class CashReport(models.Model):
                     _('Kawiarnia i kawiarnia tworzącego powinna się zgadzać')
                 )
 
+        self.stored_balance = self.get_balance(self.expenses_total)
+
         self.full_clean()
         super(CashReport, self).save(*args, **kwargs)
 
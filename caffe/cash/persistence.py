@@ -0,0 +1,119 @@
+"""Module responsible for writing CashReports with their FullExpenses.
+
+All FullExpenses are checked once in memory and written in bulk, together
+with the CashReport, in one transaction. Since after writing the CashReport
+has exactly the given FullExpenses, its `expenses_total` is summed in memory
+and written together with the CashReport. Bulk writes do not send
+`post_save`, so `cash_report_written` is sent instead.
+"""
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.translation import ugettext_lazy as _
+
+from caffe.line_items import sync_line_items
+
+from .models import CashReport, FullExpense
+from .signals import cash_report_written
+
+
+def check_full_expenses(caffe, full_expenses):
+    """Check if FullExpenses can be assigned to one CashReport of Caffe.
+
+    Args:
+        caffe (Caffe): Caffe of the CashReport.
+        full_expenses (List(FullExpense)): FullExpenses with loaded expenses.
+
+    Raises:
+        ValidationError: Some expense occurs twice or some FullExpense or its
+            expense does not belong to the Caffe.
+    """
+
+    expenses = set()
+    for full_expense in full_expenses:
+        if full_expense.expense_id in expenses:
+            raise ValidationError(
+                _('Cash Report should not contain two same expenses.')
+            )
+
+        expenses.add(full_expense.expense_id)
+
+    caffes = set()
+    for full_expense in full_expenses:
+        caffes.add(full_expense.caffe_id)
+        caffes.add(full_expense.expense.caffe_id)
+
+    if caffes - {caffe.id if caffe else None}:
+        raise ValidationError(
+            _('Kawiarnia i kawiarnia wydatku nie zgadza się.')
+        )
+
+
+def create_cash_report(cash_report, full_expenses):
+    """Save new CashReport with given FullExpenses.
+
+    Args:
+        cash_report (CashReport): Not saved CashReport.
+        full_expenses (List(FullExpense)): Not saved FullExpenses.
+
+    Returns:
+        Saved CashReport.
+
+    Raises:
+        ValidationError: FullExpenses or CashReport are not valid.
+    """
+
+    check_full_expenses(cash_report.caffe, full_expenses)
+
+    with transaction.atomic():
+        cash_report.expenses_total = sum(
+            full_expense.amount for full_expense in full_expenses
+        )
+        cash_report.save()
+
+        for full_expense in full_expenses:
+            full_expense.cash_report = cash_report
+
+        FullExpense.objects.bulk_create(full_expenses)
+        cash_report_written.send(sender=CashReport, cash_report=cash_report)
+
+    return cash_report
+
+
+def update_cash_report(cash_report, full_expenses):
+    """Save CashReport and make its FullExpenses equal to the given ones.
+
+    Only FullExpenses which were added, removed or have different amount are
+    written to the database.
+
+    Args:
+        cash_report (CashReport): CashReport which is updated.
+        full_expenses (List(FullExpense)): Not saved FullExpenses.
+
+    Returns:
+        Updated CashReport.
+
+    Raises:
+        ValidationError: FullExpenses or CashReport are not valid.
+    """
+
+    check_full_expenses(cash_report.caffe, full_expenses)
+
+    with transaction.atomic():
+        cash_report.expenses_total = sum(
+            full_expense.amount for full_expense in full_expenses
+        )
+        cash_report.save()
+
+        for full_expense in full_expenses:
+            full_expense.cash_report = cash_report
+
+        sync_line_items(
+            cash_report.full_expenses.all(),
+            full_expenses,
+            'expense_id',
+            ('amount',)
+        )
+        cash_report_written.send(sender=CashReport, cash_report=cash_report)
+
+    return cash_report
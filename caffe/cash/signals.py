@@ -0,0 +1,7 @@
+"""Signals sent by the cash app."""
+
+from django.dispatch import Signal
+
+# Sent when CashReport has been created or edited together with its
+# FullExpenses, which are written in bulk and do not send `post_save`.
+cash_report_written = Signal(providing_args=['cash_report'])
@@ -0,0 +1,91 @@
+"""Cash reports management commands testing module."""
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from caffe.models import Caffe
+from employees.models import Employee
+
+from .models import CashReport, Expense, FullExpense
+
+
+class UpdateCashTotalsTest(TestCase):
+    """Tests of command recalculating totals of CashReports."""
+
+    def setUp(self):
+        """Prepare data for tests."""
+
+        self.caffe = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        kate = Employee.objects.create(
+            username='KateT',
+            first_name='Kate',
+            last_name='Tempest',
+            caffe=self.caffe
+        )
+
+        self.cash_report = CashReport.objects.create(
+            creator=kate,
+            caffe=self.caffe,
+            cash_before_shift=2000,
+            cash_after_shift=3000,
+            card_payments=500,
+            amount_due=1900
+        )
+
+        FullExpense.objects.create(
+            expense=Expense.objects.create(name='Cakes', caffe=self.caffe),
+            amount=50,
+            cash_report=self.cash_report,
+            caffe=self.caffe
+        )
+
+        self.empty_report = CashReport.objects.create(
+            creator=kate,
+            caffe=self.caffe,
+            cash_before_shift=0,
+            cash_after_shift=10,
+            card_payments=0,
+            amount_due=0
+        )
+
+        # rows written before totals were stored
+        CashReport.objects.update(expenses_total=0, stored_balance=0)
+
+    def test_check(self):
+        """Check if outdated cash reports are reported and not changed."""
+
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('update_cash_totals', check=True, stdout=out)
+
+        self.assertIn(str(self.cash_report.id), out.getvalue())
+        self.assertEqual(
+            CashReport.objects.get(id=self.cash_report.id).expenses_total,
+            0
+        )
+
+    def test_update(self):
+        """Check if outdated cash reports are updated."""
+
+        call_command('update_cash_totals', stdout=StringIO())
+
+        cash_report = CashReport.objects.get(id=self.cash_report.id)
+        self.assertEqual(cash_report.expenses_total, 50)
+        self.assertEqual(cash_report.stored_balance, -350)
+
+        empty_report = CashReport.objects.get(id=self.empty_report.id)
+        self.assertEqual(empty_report.expenses_total, 0)
+        self.assertEqual(empty_report.stored_balance, 10)
+
+        out = StringIO()
+        call_command('update_cash_totals', check=True, stdout=out)
+        self.assertIn('up to date', out.getvalue())
@@ -0,0 +1,110 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103,R0902
+
+from django.contrib.auth.models import Permission
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+from django.utils import timezone
+
+from caffe.models import Caffe
+from employees.models import Employee
+
+from .export import HEADER, export_cash_reports
+from .models import CashReport, Company, Expense, FullExpense
+from .persistence import create_cash_report
+
+
+class ExportTests(TestCase):
+    """Test exporting CashReports to CSV."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.kate = Employee.objects.create_user(
+            username='KateT',
+            password='KateT',
+            caffe=self.kafo
+        )
+
+        goodcake = Company.objects.create(name='GoodCake', caffe=self.kafo)
+        self.cakes = Expense.objects.create(
+            name='Cakes',
+            company=goodcake,
+            caffe=self.kafo
+        )
+        self.taxi = Expense.objects.create(name='Taxi', caffe=self.kafo)
+
+        self.today = timezone.localtime(timezone.now()).date()
+
+    def create_cash_report(self, amounts):
+        """Create CashReport with given amounts of expenses."""
+
+        return create_cash_report(
+            CashReport(
+                creator=self.kate,
+                caffe=self.kafo,
+                cash_before_shift=100,
+                cash_after_shift=200,
+                card_payments=50,
+                amount_due=200
+            ),
+            [
+                FullExpense(expense=expense, amount=amount, caffe=self.kafo)
+                for expense, amount in amounts
+            ]
+        )
+
+    def test_export_cash_reports(self):
+        """Check if every expense is one row with totals of the report."""
+
+        first = self.create_cash_report([(self.taxi, 20), (self.cakes, 30)])
+        empty = self.create_cash_report([])
+
+        # one query for reports, one for expenses and one for the end
+        with self.assertNumQueries(3):
+            rows = list(export_cash_reports(self.kafo, self.today,
+                                            self.today))
+
+        self.assertTrue(all(len(row) == len(HEADER) for row in rows))
+        self.assertEqual(
+            [row[:1] + row[2:] for row in rows],
+            [
+                (first.id, 'KateT', 100, 200, 50, 200, 50, 0,
+                 'GoodCake', 'Cakes', 30),
+                (first.id, 'KateT', 100, 200, 50, 200, 50, 0,
+                 '', 'Taxi', 20),
+                (empty.id, 'KateT', 100, 200, 50, 200, 0, -50, '', '', ''),
+            ]
+        )
+
+    def test_export_view(self):
+        """Check if view streams CSV only for valid range."""
+
+        self.create_cash_report([(self.taxi, 20)])
+        self.client.login(username='KateT', password='KateT')
+        url = reverse('cash:export')
+        params = {
+            'start': self.today.isoformat(),
+            'end': self.today.isoformat()
+        }
+
+        self.assertEqual(self.client.get(url, params).status_code, 302)
+        self.kate.user_permissions.add(
+            Permission.objects.get(codename='view_cashreport')
+        )
+
+        self.assertEqual(self.client.get(url).status_code, 400)
+
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode('utf-8')
+        self.assertEqual(len(lines.splitlines()), 2)
+        self.assertTrue(lines.splitlines()[1].endswith(',,Taxi,20.0'))
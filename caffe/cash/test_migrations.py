@@ -0,0 +1,63 @@
+"""Cash reports migrations testing module."""
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+from caffe.models import Caffe
+from employees.models import Employee
+
+from .models import CashReport
+
+
+class CashReportTotalsMigrationTest(TransactionTestCase):
+    """Tests of migration which adds totals of CashReports."""
+
+    before = [('cash', '0011_auto_20160619_1722')]
+
+    def migrate(self, targets):
+        """Migrate database to targets and return their historical apps."""
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        executor.loader.build_graph()
+        return executor.loader.project_state(targets).apps
+
+    def test_backfill_totals(self):
+        """Check if totals of pre-existing cash reports are calculated."""
+
+        latest = MigrationExecutor(connection).loader.graph.leaf_nodes()
+        self.addCleanup(self.migrate, latest)
+
+        caffe = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+        kate = Employee.objects.create(username='KateT', caffe=caffe)
+
+        apps = self.migrate(self.before)
+        cash_report = apps.get_model('cash', 'CashReport').objects.create(
+            creator_id=kate.id,
+            caffe_id=caffe.id,
+            cash_before_shift=2000,
+            cash_after_shift=3000,
+            card_payments=500,
+            amount_due=1900
+        )
+        apps.get_model('cash', 'FullExpense').objects.create(
+            expense=apps.get_model('cash', 'Expense').objects.create(
+                name='Cakes', caffe_id=caffe.id
+            ),
+            amount=50,
+            cash_report=cash_report,
+            caffe_id=caffe.id
+        )
+
+        self.migrate(latest)
+
+        cash_report = CashReport.objects.get(id=cash_report.id)
+        self.assertEqual(cash_report.expenses_total, 50)
+        self.assertEqual(cash_report.stored_balance, -350)
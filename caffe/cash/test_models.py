@@ -82,6 +82,51 @@ class CashReportModelTest(TestCase):
 
         self.assertEqual(self.cash_report.balance(), 150)
 
+    def test_stored_balance(self):
+        """Check if totals are stored when FullExpenses are written."""
+
+        cash_report = CashReport.objects.get(id=self.cash_report.id)
+        self.assertEqual(cash_report.expenses_total, 550)
+        self.assertEqual(cash_report.stored_balance, 150)
+
+        cash_report.amount_due = 2000
+        cash_report.save()
+        self.assertEqual(
+            CashReport.objects.get(id=cash_report.id).stored_balance,
+            50
+        )
+
+        full_expense = cash_report.full_expenses.get(amount=50)
+        full_expense.delete()
+        cash_report = CashReport.objects.get(id=cash_report.id)
+        self.assertEqual(cash_report.expenses_total, 500)
+        self.assertEqual(cash_report.stored_balance, 0)
+
+    def test_stored_balance_moved_expense(self):
+        """Check if totals of both reports change when expense is moved."""
+
+        other_report = CashReport.objects.create(
+            creator=self.kate,
+            caffe=self.caffe,
+            cash_before_shift=0,
+            cash_after_shift=0,
+            card_payments=0,
+            amount_due=0
+        )
+
+        full_expense = self.cash_report.full_expenses.get(amount=500)
+        full_expense.cash_report = other_report
+        full_expense.save()
+
+        self.assertEqual(
+            CashReport.objects.get(id=self.cash_report.id).expenses_total,
+            50
+        )
+        self.assertEqual(
+            CashReport.objects.get(id=other_report.id).stored_balance,
+            500
+        )
+
     def test_cash_report_validation(self):
         """Check cash report validation."""
 
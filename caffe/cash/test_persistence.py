@@ -0,0 +1,163 @@
+"""Cash reports persistence testing module."""
+# pylint: disable=C0103,R0902
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from caffe.models import Caffe
+from employees.models import Employee
+
+from .models import CashReport, Company, Expense, FullExpense
+from .persistence import create_cash_report, update_cash_report
+
+
+class CashReportPersistenceTest(TestCase):
+    """Cash report persistence tests."""
+
+    def setUp(self):
+        """Prepare data for tests."""
+
+        self.caffe = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+        self.filtry = Caffe.objects.create(
+            name='filtry',
+            city='Warszawa',
+            street='Filry',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.kate = Employee.objects.create(
+            username='KateT',
+            first_name='Kate',
+            last_name='Tempest',
+            caffe=self.caffe
+        )
+
+        self.cash_report = CashReport.objects.create(
+            creator=self.kate,
+            caffe=self.caffe,
+            cash_before_shift=2000,
+            cash_after_shift=3000,
+            card_payments=500,
+            amount_due=1900
+        )
+
+        self.goodcake = Company.objects.create(
+            name='GoodCake',
+            caffe=self.caffe
+        )
+
+        self.cakes = Expense.objects.create(
+            name='Cakes',
+            company=self.goodcake,
+            caffe=self.caffe
+        )
+        self.supply = Expense.objects.create(name='Supply', caffe=self.caffe)
+        self.newspapers = Expense.objects.create(
+            name='Newspapers',
+            caffe=self.caffe
+        )
+        self.supply_f = Expense.objects.create(
+            name='Supply',
+            caffe=self.filtry
+        )
+
+        self.full_cakes = FullExpense.objects.create(
+            expense=self.cakes,
+            amount=50,
+            cash_report=self.cash_report,
+            caffe=self.caffe
+        )
+        self.full_supply = FullExpense.objects.create(
+            expense=self.supply,
+            amount=500,
+            cash_report=self.cash_report,
+            caffe=self.caffe
+        )
+
+    def test_update_cash_report(self):
+        """Check if only changed expenses are written."""
+
+        self.cash_report.amount_due = 100
+
+        update_cash_report(self.cash_report, [
+            FullExpense(expense=self.cakes, amount=50, caffe=self.caffe),
+            FullExpense(expense=self.newspapers, amount=20, caffe=self.caffe),
+        ])
+
+        cash_report = CashReport.objects.get(id=self.cash_report.id)
+        self.assertEqual(cash_report.amount_due, 100)
+
+        full_expenses = {
+            full_expense.expense_id: full_expense
+            for full_expense in cash_report.full_expenses.all()
+        }
+
+        self.assertCountEqual(
+            full_expenses.keys(),
+            [self.cakes.id, self.newspapers.id]
+        )
+        self.assertEqual(
+            full_expenses[self.cakes.id].pk,
+            self.full_cakes.pk
+        )
+        self.assertEqual(full_expenses[self.newspapers.id].amount, 20)
+
+        self.assertEqual(cash_report.expenses_total, 70)
+        self.assertEqual(cash_report.stored_balance, cash_report.balance())
+
+    def test_create_cash_report(self):
+        """Check if cash report is created with its expenses and totals."""
+
+        cash_report = create_cash_report(
+            CashReport(
+                creator=self.kate,
+                caffe=self.caffe,
+                cash_before_shift=100,
+                cash_after_shift=200,
+                card_payments=50,
+                amount_due=300
+            ),
+            [
+                FullExpense(expense=self.cakes, amount=50, caffe=self.caffe),
+                FullExpense(expense=self.supply, amount=20, caffe=self.caffe)
+            ]
+        )
+
+        cash_report = CashReport.objects.get(id=cash_report.id)
+        self.assertCountEqual(
+            cash_report.full_expenses.values_list('expense_id', 'amount'),
+            [(self.cakes.id, 50), (self.supply.id, 20)]
+        )
+        self.assertEqual(cash_report.expenses_total, 70)
+        self.assertEqual(cash_report.stored_balance, -80)
+        self.assertEqual(cash_report.balance(), -80)
+
+    def test_update_cash_report_invalid(self):
+        """Check if cash report is not changed for invalid expenses."""
+
+        with self.assertRaises(ValidationError):
+            update_cash_report(self.cash_report, [
+                FullExpense(expense=self.cakes, amount=50, caffe=self.caffe),
+                FullExpense(expense=self.cakes, amount=20, caffe=self.caffe),
+            ])
+
+        with self.assertRaises(ValidationError):
+            update_cash_report(self.cash_report, [
+                FullExpense(
+                    expense=self.supply_f,
+                    amount=50,
+                    caffe=self.caffe
+                ),
+            ])
+
+        self.assertCountEqual(
+            self.cash_report.full_expenses.all(),
+            [self.full_cakes, self.full_supply]
+        )
@@ -0,0 +1,71 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103
+
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from caffe.query_counts import QueryCountsMixin, get_largest
+
+from .catalog import invalidate_expenses
+from .models import CashReport, Company, Expense
+
+
+class CashQueriesTests(QueryCountsMixin, TestCase):
+    """Test if numbers of queries of views do not depend on data."""
+
+    def test_new_cash_report(self):
+        """Check new CashReport view."""
+
+        self.assertConstantQueries(lambda caffe: reverse('cash:new'))
+
+    def test_show_cash_report(self):
+        """Check show CashReport view."""
+
+        self.assertConstantQueries(lambda caffe: reverse(
+            'cash:show',
+            args=(get_largest(
+                CashReport.objects.filter(caffe=caffe), 'full_expenses'
+            ).id,)
+        ))
+
+    def test_edit_cash_report(self):
+        """Check edit CashReport view."""
+
+        self.assertConstantQueries(lambda caffe: reverse(
+            'cash:edit',
+            args=(get_largest(
+                CashReport.objects.filter(caffe=caffe), 'full_expenses'
+            ).id,)
+        ))
+
+    def test_edit_company(self):
+        """Check edit Company view."""
+
+        self.assertConstantQueries(lambda caffe: reverse(
+            'cash:edit_company',
+            args=(Company.objects.filter(caffe=caffe).first().id,)
+        ))
+
+    def test_edit_expense(self):
+        """Check edit Expense view."""
+
+        self.assertConstantQueries(lambda caffe: reverse(
+            'cash:edit_expense',
+            args=(Expense.objects.filter(caffe=caffe).first().id,)
+        ))
+
+    def test_new_company(self):
+        """Check new Company view."""
+
+        self.assertConstantQueries(
+            lambda caffe: reverse('cash:new_company'),
+            invalidate_expenses
+        )
+
+    def test_new_expense(self):
+        """Check new Expense view."""
+
+        self.assertConstantQueries(
+            lambda caffe: reverse('cash:new_expense'),
+            invalidate_expenses
+        )
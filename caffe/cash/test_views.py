@@ -2,14 +2,18 @@
 # -*- encoding: utf-8 -*-
 # pylint: disable=C0103,R0902
 
+import json
 
 from django.contrib.auth.models import Permission
 from django.core.urlresolvers import NoReverseMatch, reverse
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 
 from caffe.models import Caffe
 from employees.models import Employee
 
+from .catalog import invalidate_expenses
 from .forms import CashReportForm, CompanyForm, ExpenseForm
 from .models import CashReport, Company, Expense, FullExpense
 
@@ -335,6 +339,30 @@ class ExpenseViewsTests(TestCase):
                 [str(self.newspapers), str(self.cakes)]
             )
 
+    def test_new_expense_show_cached(self):
+        """Check if expenses are cached until Company or Expense changes."""
+
+        url = reverse('cash:new_expense')
+        self.client.get(url)
+
+        invalidate_expenses(self.caffe.id)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        num_queries = len(queries)
+
+        # expenses with their companies are read with one query
+        with self.assertNumQueries(num_queries - 1):
+            self.client.get(url)
+
+        self.putka.name = 'Putka i syn'
+        self.putka.save()
+
+        response = self.client.get(url)
+        self.assertIn(
+            'Ciasta, Putka i syn',
+            [element['desc'] for element in response.context['elements']]
+        )
+
     def test_new_expense_post_fail(self):
         """Check if new expense fails to create when form is not valid."""
 
@@ -636,6 +664,42 @@ class CashReportViewTests(TestCase):
         self.assertIsInstance(form, CashReportForm)
         self.assertEqual(form.instance, self.cash_report_main)
 
+    def test_edit_cashreport_show_queries(self):
+        """Check if edit CashReport makes same queries for more expenses."""
+
+        url = reverse('cash:edit', args=(self.cash_report_main.id,))
+
+        # permissions are cached by the first request
+        self.client.get(url)
+
+        # captured queries are lost when next request resets them
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        num_queries = len(queries)
+
+        for i in range(5):
+            expense = Expense.objects.create(
+                name='Wydatek {}'.format(i),
+                company=self.putka,
+                caffe=self.caffe
+            )
+            FullExpense.objects.create(
+                expense=expense,
+                amount=i,
+                cash_report=self.cash_report_main,
+                caffe=self.caffe
+            )
+
+        with self.assertNumQueries(num_queries):
+            response = self.client.get(url)
+
+        expenses = json.loads(response.context['expenses'])
+        self.assertEqual(len(expenses), 7)
+        self.assertEqual(
+            len([expense for expense in expenses if expense['selected']]),
+            7
+        )
+
     def test_edit_cashreport_post_success(self):
         """Check success of edit CashReport post request."""
 
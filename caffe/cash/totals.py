@@ -0,0 +1,85 @@
+"""Module responsible for denormalized totals of CashReports.
+
+`expenses_total` and `stored_balance` of CashReport are written together
+with its FullExpenses. Functions of this module recalculate them for all
+stored reports, e.g. when the fields are added by migration or checked by
+`update_cash_totals` command. They take model class as an argument, so
+historical models of migrations can be given too.
+"""
+
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+
+from caffe.line_items import BATCH_SIZE, bulk_update
+
+# sums calculated in different order can differ a little
+PRECISION = 1e-6
+
+
+def differ(stored, calculated):
+    """Check if stored value is different than the calculated one."""
+
+    return abs(stored - calculated) > PRECISION
+
+
+def calculate_balance(cash_report, expenses_total):
+    """Calculate balance of CashReport for given sum of expenses.
+
+    Args:
+        cash_report (CashReport): Report with amounts of the shift.
+        expenses_total (float): Sum of amounts of all FullExpenses.
+
+    Returns:
+        Balance of the report, negative when there is a deficit.
+    """
+
+    return (cash_report.cash_after_shift + cash_report.card_payments +
+            expenses_total - cash_report.cash_before_shift -
+            cash_report.amount_due)
+
+
+def find_outdated(model):
+    """Return CashReports with stored totals different than calculated.
+
+    Args:
+        model (Model): CashReport model class.
+
+    Returns:
+        List of not saved CashReports with recalculated totals.
+    """
+
+    outdated = []
+    last_id = 0
+
+    while True:
+        # sums are calculated by the database, one batch at a time
+        cash_reports = list(
+            model.objects.filter(id__gt=last_id).annotate(
+                total=Coalesce(Sum('full_expenses__amount'), 0)
+            ).order_by('id')[:BATCH_SIZE]
+        )
+
+        if not cash_reports:
+            return outdated
+
+        for cash_report in cash_reports:
+            balance = calculate_balance(cash_report, cash_report.total)
+            if (differ(cash_report.expenses_total, cash_report.total) or
+                    differ(cash_report.stored_balance, balance)):
+                cash_report.expenses_total = cash_report.total
+                cash_report.stored_balance = balance
+                outdated.append(cash_report)
+
+        last_id = cash_reports[-1].id
+
+
+def update_totals(model, cash_reports):
+    """Write recalculated totals of given CashReports.
+
+    Args:
+        model (Model): CashReport model class.
+        cash_reports (List(CashReport)): Reports returned by
+            `find_outdated`.
+    """
+
+    bulk_update(model, cash_reports, ('expenses_total', 'stored_balance'))
@@ -2,8 +2,8 @@ from django.conf.urls import url
 from django.contrib import admin
 
 from .views import (cash_edit_cash_report, cash_edit_company,
-                    cash_edit_expense, cash_navigate, cash_new_cash_report,
-                    cash_new_company, cash_new_expense,
+                    cash_edit_expense, cash_export, cash_navigate,
+                    cash_new_cash_report, cash_new_company, cash_new_expense,
                     cash_show_cash_report)
 
 urlpatterns = [
@@ -17,6 +17,7 @@ urlpatterns = [
         cash_edit_cash_report,
         name='edit'
     ),
+    url(r'^export/$', cash_export, name='export'),
 
     url(r'^new/company/$', cash_new_company, name='new_company'),
     url(
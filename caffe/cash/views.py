@@ -2,19 +2,59 @@ import json
 
 from django.contrib import messages
 from django.contrib.auth.decorators import permission_required
+from django.core.exceptions import ValidationError
 from django.core.urlresolvers import reverse
+from django.http import HttpResponseBadRequest
 from django.shortcuts import get_object_or_404, redirect, render
 
-from .forms import CashReportForm, CompanyForm, ExpenseForm, FullExpenseForm
+from caffe.cache import get_or_set
+from caffe.exports import csv_response
+from caffe.forms import ExportForm
+from caffe.line_items import (get_submitted_line_items, parse_line_items,
+                              prefill_line_items)
+
+from .catalog import EXPENSES_NAMESPACE, EXPENSES_TIMEOUT
+from .export import HEADER, export_cash_reports
+from .forms import CashReportForm, CompanyForm, ExpenseForm
 from .models import CashReport, Company, Expense, FullExpense
+from .persistence import create_cash_report, update_cash_report
+
+
+def get_all_expenses(caffe):
+    """Return all Expenses of given Caffe ready to be used in CashReport form.
+
+    Args:
+        caffe (Caffe): Caffe which Expenses are returned.
+
+    Returns:
+        List of serialized Expenses with their Companies.
+    """
+
+    all_expenses = []
+    expenses = Expense.objects.filter(caffe=caffe).select_related('company')
+
+    for expense in expenses:
+        all_expenses.append({
+            'id': expense.id,
+            'name': expense.name,
+            'selected': False,
+            'amount': 0,
+            'errors': {}
+        })
+
+        if expense.company:
+            all_expenses[-1]['company'] = {
+                'id': expense.company.id,
+                'name': expense.company.name,
+            }
+
+    return all_expenses
 
 
 @permission_required('cash.add_company')
 def cash_new_company(request):
     """Show form to create new Company and show existing Companies."""
 
-    elements = []
-
     form = CompanyForm(request.POST or None, caffe=request.user.caffe)
 
     if form.is_valid():
@@ -23,12 +63,17 @@ def cash_new_company(request):
         return redirect(reverse('cash:navigate'))
 
     companies = Company.objects.filter(caffe=request.user.caffe).all()
-    for company in companies:
-        elements.append({
+    elements = get_or_set(
+        EXPENSES_NAMESPACE,
+        request.user.caffe_id,
+        ['companies'],
+        lambda: [{
             'edit_href': reverse('cash:edit_company', args=(company.id,)),
             'id': company.id,
             'desc': str(company)
-        })
+        } for company in companies],
+        EXPENSES_TIMEOUT
+    )
 
     return render(request, 'cash/new_element.html', {
         'form': form,
@@ -77,7 +122,6 @@ def cash_edit_company(request, company_id):
 def cash_new_expense(request):
     """Show form to create new Expense and show already existing Expenses."""
 
-    elements = []
     form = ExpenseForm(request.POST or None, caffe=request.user.caffe)
 
     if form.is_valid():
@@ -85,13 +129,20 @@ def cash_new_expense(request):
         messages.success(request, 'Wydatek został poprawnie dodany.')
         return redirect(reverse('cash:navigate'))
 
-    expenses = Expense.objects.filter(caffe=request.user.caffe).all()
-    for expense in expenses:
-        elements.append({
+    expenses = Expense.objects.filter(
+        caffe=request.user.caffe
+    ).select_related('company')
+    elements = get_or_set(
+        EXPENSES_NAMESPACE,
+        request.user.caffe_id,
+        ['expenses'],
+        lambda: [{
             'edit_href': reverse('cash:edit_expense', args=(expense.id,)),
             'id': expense.id,
             'desc': str(expense)
-        })
+        } for expense in expenses],
+        EXPENSES_TIMEOUT
+    )
 
     return render(request, 'cash/new_element.html', {
         'form': form,
@@ -140,79 +191,36 @@ def cash_edit_expense(request, expense_id):
 def cash_new_cash_report(request):
     """Show form to create CashReport and show already existing CashReport."""
 
-    all_expenses = []
     form = CashReportForm(
         request.POST or None,
         caffe=request.user.caffe,
         creator=request.user
     )
 
-    for expense in Expense.objects.filter(caffe=request.user.caffe).all():
-        all_expenses.append({
-            'id': expense.id,
-            'name': expense.name,
-            'selected': False,
-            'amount': 0,
-            'errors': {}
-        })
-
-        if expense.company:
-            all_expenses[-1]['company'] = {
-                'id': expense.company.id,
-                'name': expense.company.name,
-            }
+    all_expenses = get_all_expenses(request.user.caffe)
 
     if request.POST:
-        forms = []
-        valid = form.is_valid()
-
-        for full_expense in request.POST:
-            fe_list = []
-
-            try:
-                full_expense = int(full_expense)
-                fe_list = request.POST.getlist(str(full_expense))
-            except ValueError:
-                continue
-
-            if len(fe_list) != 2:
-                continue
-
-            expense_form = FullExpenseForm(
-                {'expense': fe_list[0], 'amount': fe_list[1]},
-                caffe=request.user.caffe
-            )
-
-            valid = valid & expense_form.is_valid()
-
-            expense = next(
-                (e for e in all_expenses if e['id'] == int(fe_list[0])),
-                None
-            )
-
-            if expense:
-                expense['selected'] = True
-
-                if expense_form.is_valid():
-                    expense['amount'] = fe_list[1]
-                    expense['errors'] = ''
-                else:
-                    expense['amount'] = ''
-                    expense['errors'] = expense_form.errors.get('amount')
-
-            forms.append(expense_form)
+        full_expenses, valid = parse_line_items(
+            get_submitted_line_items(request.POST),
+            all_expenses,
+            Expense.objects.filter(caffe=request.user.caffe),
+            FullExpense,
+            'expense',
+            request.user.caffe
+        )
+        valid = form.is_valid() and valid
 
         if valid:
-            cash_report = form.save()
-
-            for form in forms:
-                full_expense = form.save()
-                full_expense.cash_report = cash_report
-                full_expense.save()
-
-            cash_report.save()
-            messages.success(request, 'Raport z kasy został poprawnie dodany.')
-            return redirect(reverse('cash:navigate'))
+            try:
+                create_cash_report(form.save(commit=False), full_expenses)
+            except ValidationError as error:
+                messages.error(request, ' '.join(error.messages))
+            else:
+                messages.success(
+                    request, 'Raport z kasy został poprawnie dodany.'
+                )
+
+                return redirect(reverse('cash:navigate'))
         else:
             messages.error(
                 request, u'Formularz został niepoprawnie wypełniony.'
@@ -247,86 +255,38 @@ def cash_edit_cash_report(request, report_id):
         instance=cash_report
     )
 
-    all_expenses = []
-    for expense in Expense.objects.filter(caffe=request.user.caffe).all():
-        all_expenses.append({
-            'id': expense.id,
-            'name': expense.name,
-            'selected': False,
-            'amount': 0,
-            'errors': {}
-        })
+    all_expenses = get_all_expenses(request.user.caffe)
 
-        if expense.company:
-            all_expenses[-1]['company'] = {
-                'id': expense.company.id,
-                'name': expense.company.name,
-            }
-
-        full_expense = FullExpense.objects.filter(
-            cash_report=cash_report.id, expense=expense.id
-        ).first()
-
-        if full_expense and (not request.POST):
-            all_expenses[-1]['selected'] = True
-            all_expenses[-1]['amount'] = full_expense.amount
+    if not request.POST:
+        # mark as selected expenses which are assigned to report
+        prefill_line_items(
+            all_expenses,
+            cash_report.full_expenses.all(),
+            'expense_id'
+        )
 
     if request.POST:
-        forms = []
-        valid = form.is_valid()
-
-        for full_expense in request.POST:
-            fe_list = []
-
-            try:
-                full_expense = int(full_expense)
-                fe_list = request.POST.getlist(str(full_expense))
-            except ValueError:
-                continue
-
-            if len(fe_list) != 2:
-                continue
-
-            expense_form = FullExpenseForm(
-                {'expense': fe_list[0], 'amount': fe_list[1]},
-                caffe=request.user.caffe
-            )
-
-            valid = valid & expense_form.is_valid()
-
-            expense = next(
-                (e for e in all_expenses if e['id'] == int(fe_list[0])),
-                None
-            )
-
-            if expense:
-                expense['selected'] = True
-                if expense_form.is_valid():
-                    expense['amount'] = fe_list[1]
-                    expense['errors'] = ''
-                else:
-                    expense['amount'] = ''
-                    expense['errors'] = expense_form.errors.get('amount')
-
-            forms.append(expense_form)
+        full_expenses, valid = parse_line_items(
+            get_submitted_line_items(request.POST),
+            all_expenses,
+            Expense.objects.filter(caffe=request.user.caffe),
+            FullExpense,
+            'expense',
+            request.user.caffe
+        )
+        valid = form.is_valid() and valid
 
         if valid:
-            cash_report = form.save()
-
-            for full_expense in cash_report.full_expenses.all():
-                full_expense.delete()
-
-            for form in forms:
-                full_expense = form.save()
-                full_expense.cash_report = cash_report
-                full_expense.save()
-
-            cash_report.save()
-            messages.success(
-                request, 'Raport z kasy został poprawnie zmieniony.'
-            )
-
-            return redirect(reverse('cash:navigate'))
+            try:
+                update_cash_report(form.save(commit=False), full_expenses)
+            except ValidationError as error:
+                messages.error(request, ' '.join(error.messages))
+            else:
+                messages.success(
+                    request, 'Raport z kasy został poprawnie zmieniony.'
+                )
+
+                return redirect(reverse('cash:navigate'))
         else:
             messages.error(
                 request, u'Formularz został niepoprawnie wypełniony.'
@@ -353,10 +313,8 @@ def cash_show_cash_report(request, report_id):
         id=report_id,
         caffe=request.user.caffe
     )
-    cash_report.balance = cash_report.balance()
-
     all_expenses = []
-    for full_expense in cash_report.full_expenses.all():
+    for full_expense in cash_report.full_expenses.select_related('expense'):
         all_expenses.append({
             'name': full_expense.expense.name,
             'amount': full_expense.amount
@@ -368,6 +326,22 @@ def cash_show_cash_report(request, report_id):
     })
 
 
+@permission_required('cash.view_cashreport')
+def cash_export(request):
+    """Stream CashReports with expenses from given range of days as CSV."""
+
+    form = ExportForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(u'Niepoprawny zakres dni.')
+
+    start = form.cleaned_data['start']
+    end = form.cleaned_data['end']
+    return csv_response(
+        'raporty-kasowe', start, end, HEADER,
+        export_cash_reports(request.user.caffe, start, end)
+    )
+
+
 def cash_navigate(request):
     """Show navigation view for CashReport."""
 
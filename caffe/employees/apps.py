@@ -1,5 +1,27 @@
 from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
 
 
 class EmployeesConfig(AppConfig):
     name = 'employees'
+
+    def ready(self):
+        """Connect signals which invalidate cached permissions."""
+
+        from django.contrib.auth.models import Group, Permission
+
+        from .permissions import (employee_changed,
+                                  employee_permissions_changed,
+                                  groups_changed)
+
+        employee = self.get_model('Employee')
+        post_save.connect(employee_changed, sender=employee)
+        post_delete.connect(employee_changed, sender=employee)
+
+        for through in [employee.groups.through,
+                        employee.user_permissions.through]:
+            m2m_changed.connect(employee_permissions_changed, sender=through)
+
+        m2m_changed.connect(groups_changed, sender=Group.permissions.through)
+        post_delete.connect(groups_changed, sender=Group)
+        post_delete.connect(groups_changed, sender=Permission)
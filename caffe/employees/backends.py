@@ -0,0 +1,23 @@
+from django.contrib.auth.backends import ModelBackend
+
+from .permissions import get_permissions
+
+
+class CachedPermissionsBackend(ModelBackend):
+    """Authentication backend which reads permissions from the cache.
+
+    Permissions are cached between requests (see `employees.permissions`),
+    so checking them does not query the database.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        """Return names of all permissions of user."""
+
+        if not user_obj.is_active or user_obj.is_anonymous() or \
+                obj is not None:
+            return set()
+
+        if not hasattr(user_obj, '_perm_cache'):
+            user_obj._perm_cache = set(get_permissions(user_obj))
+
+        return user_obj._perm_cache
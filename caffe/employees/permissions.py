@@ -0,0 +1,112 @@
+"""Module responsible for cached permissions of Employees.
+
+All permissions of Employee, its own and the ones of its groups, are read
+with one query and cached per Caffe (see `caffe.cache`). Permissions of
+Employees of a Caffe are invalidated when groups or permissions of any of
+them change. Groups are shared by all Caffes, so changes of groups
+invalidate permissions of all Employees by bumping one global version, which
+is a part of every key.
+"""
+
+from django.contrib.auth.models import Permission
+from django.db.models import Q
+
+from caffe.cache import bump_version, get_or_set, get_version
+
+PERMISSIONS_NAMESPACE = 'employees.permissions'
+GROUPS_NAMESPACE = 'employees.groups'
+PERMISSIONS_TIMEOUT = 60 * 60 * 24
+
+
+def load_permissions(employee):
+    """Return names of all permissions of Employee, omitting the cache.
+
+    Args:
+        employee (Employee): Active Employee.
+
+    Returns:
+        Set of names of permissions, e.g. 'reports.add_report'.
+    """
+
+    if employee.is_superuser:
+        permissions = Permission.objects.all()
+    else:
+        permissions = Permission.objects.filter(
+            Q(user=employee) | Q(group__user=employee)
+        )
+
+    return {
+        '{}.{}'.format(app_label, codename)
+        for app_label, codename in permissions.values_list(
+            'content_type__app_label', 'codename'
+        ).order_by().distinct()
+    }
+
+
+def get_permissions(employee):
+    """Return names of all permissions of Employee.
+
+    Flags which change permissions are loaded with Employee, so they are a
+    part of the key and saving Employee does not invalidate anything.
+
+    Args:
+        employee (Employee): Active Employee.
+
+    Returns:
+        Set of names of permissions, e.g. 'reports.add_report'.
+    """
+
+    return get_or_set(
+        PERMISSIONS_NAMESPACE,
+        employee.caffe_id,
+        [get_version(GROUPS_NAMESPACE, None), employee.id,
+         employee.is_superuser],
+        lambda: load_permissions(employee),
+        PERMISSIONS_TIMEOUT
+    )
+
+
+def invalidate_permissions(caffe_id):
+    """Invalidate permissions of all Employees of Caffe with given id."""
+
+    bump_version(PERMISSIONS_NAMESPACE, caffe_id)
+
+
+def invalidate_groups():
+    """Invalidate permissions of all Employees of all Caffes."""
+
+    bump_version(GROUPS_NAMESPACE, None)
+
+
+def employee_changed(sender, instance, created=True, **kwargs):
+    """Invalidate permissions of Caffe when Employee is created or deleted.
+
+    Ids of deleted Employees can be reused, so new Employee can not get
+    cached permissions of removed one.
+    """
+
+    if created:
+        invalidate_permissions(instance.caffe_id)
+
+
+def employee_permissions_changed(sender, instance, action, reverse,
+                                 **kwargs):
+    """Invalidate permissions when groups or permissions of Employee change.
+
+    When Employees are changed from the side of Group or Permission, they
+    can belong to any Caffe.
+    """
+
+    if not action.startswith('post_'):
+        return
+
+    if reverse:
+        invalidate_groups()
+    else:
+        invalidate_permissions(instance.caffe_id)
+
+
+def groups_changed(sender, **kwargs):
+    """Invalidate permissions when Group or Permission has changed."""
+
+    invalidate_groups()
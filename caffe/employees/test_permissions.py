@@ -0,0 +1,129 @@
+"""Testing module for cached permissions of Employees."""
+# -*- encoding: utf-8 -*-
+
+from django.contrib.auth.models import Group, Permission
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from caffe.models import Caffe
+
+from .models import Employee
+
+
+class CachedPermissionsTest(TestCase):
+    """Tests of permissions cached between requests."""
+
+    def setUp(self):
+        """Set up data to tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.baristas = Group.objects.create(name='Bariści')
+        self.baristas.permissions.add(
+            Permission.objects.get(codename='add_report')
+        )
+
+        self.kate = Employee.objects.create_user(
+            username='KateT',
+            password='KateT',
+            caffe=self.kafo
+        )
+        self.kate.groups.add(self.baristas)
+        self.kate.user_permissions.add(
+            Permission.objects.get(codename='view_report')
+        )
+
+    def get_kate(self):
+        """Return Kate loaded again, as in next request."""
+
+        return Employee.objects.get(id=self.kate.id)
+
+    def test_permissions_cached(self):
+        """Check if permissions are read with one query and then cached."""
+
+        kate = self.get_kate()
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                kate.get_all_permissions(),
+                {'reports.add_report', 'reports.view_report'}
+            )
+            self.assertTrue(kate.has_perm('reports.view_report'))
+            self.assertTrue(kate.has_module_perms('reports'))
+
+        kate = self.get_kate()
+        with self.assertNumQueries(0):
+            self.assertTrue(kate.has_perm('reports.add_report'))
+            self.assertFalse(kate.has_perm('reports.change_report'))
+
+    def test_user_permissions_changed(self):
+        """Check if permissions change with permissions of Employee."""
+
+        self.get_kate().get_all_permissions()
+
+        self.kate.user_permissions.add(
+            Permission.objects.get(codename='change_report')
+        )
+        self.assertTrue(self.get_kate().has_perm('reports.change_report'))
+
+        self.kate.groups.clear()
+        self.assertFalse(self.get_kate().has_perm('reports.add_report'))
+
+    def test_groups_changed(self):
+        """Check if permissions change with permissions of groups."""
+
+        self.get_kate().get_all_permissions()
+
+        self.baristas.permissions.add(
+            Permission.objects.get(codename='add_cashreport')
+        )
+        self.assertTrue(self.get_kate().has_perm('cash.add_cashreport'))
+
+        self.baristas.user_set.remove(self.kate)
+        self.assertFalse(self.get_kate().has_perm('cash.add_cashreport'))
+
+        self.kate.groups.add(self.baristas)
+        self.get_kate().get_all_permissions()
+        self.baristas.delete()
+        self.assertFalse(self.get_kate().has_perm('reports.add_report'))
+
+    def test_superuser_and_inactive(self):
+        """Check if flags of Employee are not cached with permissions."""
+
+        self.get_kate().get_all_permissions()
+
+        Employee.objects.filter(id=self.kate.id).update(is_superuser=True)
+        self.assertIn('cash.add_cashreport',
+                      self.get_kate().get_all_permissions())
+
+        Employee.objects.filter(id=self.kate.id).update(is_active=False)
+        self.assertEqual(self.get_kate().get_all_permissions(), set())
+
+    def test_view_permissions_cached(self):
+        """Check if view does not query permissions in next requests."""
+
+        self.kate.user_permissions.add(
+            Permission.objects.get(codename='view_cashreport'),
+            Permission.objects.get(codename='view_workedhours')
+        )
+
+        client = Client()
+        client.login(username='KateT', password='KateT')
+        url = reverse('calendar:show_day', args=(2016, 7, 1))
+        client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([
+            query for query in queries
+            if 'auth_permission' in query['sql']
+        ])
@@ -0,0 +1,26 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103
+
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from caffe.query_counts import QueryCountsMixin
+
+from .models import Employee
+
+
+class EmployeesQueriesTests(QueryCountsMixin, TestCase):
+    """Test if numbers of queries of views do not depend on data."""
+
+    def test_all_employees(self):
+        """Check all Employees view."""
+
+        self.assertConstantQueries(lambda caffe: reverse('employees:all'))
+
+    def test_edit_employee(self):
+        """Check edit Employee view."""
+
+        self.assertConstantQueries(lambda caffe: reverse(
+            'employees:edit',
+            args=(Employee.objects.filter(caffe=caffe).first().id,)
+        ))
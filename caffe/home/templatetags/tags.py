@@ -2,6 +2,9 @@ import re
 
 from django import template
 from django.core.urlresolvers import NoReverseMatch, reverse
+from django.utils.safestring import mark_safe
+
+from caffe.cache import FRAGMENT_TIMEOUT, get_or_set
 
 register = template.Library()
 
@@ -32,3 +35,52 @@ def field_type(field):
     """Get field type from field."""
 
     return field.field.widget.__class__.__name__
+
+
+class CacheFragmentNode(template.Node):
+    """Node which renders its content only when it is not cached."""
+
+    def __init__(self, nodelist, namespace, caffe_id, parts):
+        self.nodelist = nodelist
+        self.namespace = namespace
+        self.caffe_id = caffe_id
+        self.parts = parts
+
+    def render(self, context):
+        parts = ['fragment'] + [part.resolve(context) for part in self.parts]
+
+        return mark_safe(get_or_set(
+            self.namespace.resolve(context),
+            self.caffe_id.resolve(context),
+            parts,
+            lambda: self.nodelist.render(context),
+            FRAGMENT_TIMEOUT
+        ))
+
+
+@register.tag
+def cache_fragment(parser, token):
+    """Cache rendered fragment of template in namespace of Caffe.
+
+    Fragment is invalidated together with other values of the namespace
+    (see `caffe.cache`). Everything what changes the fragment, e.g.
+    permissions of the user, has to be given as a part of the key:
+
+        {% cache_fragment 'stencils.list' user.caffe_id 'all' perm %}
+            ...
+        {% endcache_fragment %}
+    """
+
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            "'{}' tag requires namespace and id of caffe.".format(bits[0])
+        )
+
+    nodelist = parser.parse(('endcache_fragment',))
+    parser.delete_first_token()
+
+    namespace, caffe_id = [parser.compile_filter(bit) for bit in bits[1:3]]
+    parts = [parser.compile_filter(bit) for bit in bits[3:]]
+
+    return CacheFragmentNode(nodelist, namespace, caffe_id, parts)
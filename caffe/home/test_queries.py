@@ -0,0 +1,16 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103
+
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from caffe.query_counts import QueryCountsMixin
+
+
+class HomeQueriesTests(QueryCountsMixin, TestCase):
+    """Test if numbers of queries of views do not depend on data."""
+
+    def test_navigate(self):
+        """Check main page with the latest reports."""
+
+        self.assertConstantQueries(lambda caffe: reverse('home:navigate'))
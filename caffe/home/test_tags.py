@@ -0,0 +1,58 @@
+"""Testing module for template tags of the project."""
+# pylint: disable=C0103
+
+from django.core.cache import cache
+from django.template import Context, Template, TemplateSyntaxError
+from django.test import TestCase
+
+from caffe.cache import bump_version
+
+
+class CacheFragmentTest(TestCase):
+    """Tests of caching fragments of templates."""
+
+    def setUp(self):
+        """Prepare template for tests."""
+
+        cache.clear()
+
+        self.template = Template(
+            '{% load tags %}'
+            '{% cache_fragment "tests" caffe_id "list" perm %}'
+            '<b>{{ name }}</b>'
+            '{% endcache_fragment %}'
+        )
+
+    def render(self, **context):
+        """Render template with given context."""
+
+        return self.template.render(Context(context))
+
+    def test_cache_fragment(self):
+        """Check if fragment is cached until namespace is invalidated."""
+
+        self.assertEqual(self.render(caffe_id=1, perm=True, name='Kawa'),
+                         '<b>Kawa</b>')
+        self.assertEqual(self.render(caffe_id=1, perm=True, name='Soki'),
+                         '<b>Kawa</b>')
+
+        # other caffe and other parts of key have own fragments
+        self.assertEqual(self.render(caffe_id=2, perm=True, name='Soki'),
+                         '<b>Soki</b>')
+        self.assertEqual(self.render(caffe_id=1, perm=False, name='Soki'),
+                         '<b>Soki</b>')
+
+        bump_version('tests', 1)
+        self.assertEqual(self.render(caffe_id=1, perm=True, name='Soki'),
+                         '<b>Soki</b>')
+        self.assertEqual(self.render(caffe_id=2, perm=True, name='Kawa'),
+                         '<b>Soki</b>')
+
+    def test_cache_fragment_syntax(self):
+        """Check if namespace and id of caffe are required."""
+
+        with self.assertRaises(TemplateSyntaxError):
+            Template(
+                '{% load tags %}'
+                '{% cache_fragment "tests" %}{% endcache_fragment %}'
+            )
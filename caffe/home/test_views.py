@@ -9,7 +9,8 @@ from caffe.models import Caffe
 from cash.models import CashReport
 from employees.models import Employee
 from hours.models import Position, WorkedHours
-from reports.models import Report
+from reports.models import Category, FullProduct, Product, Report, Unit
+from reports.persistence import create_report
 
 
 class CaffeViewsTests(TestCase):
@@ -144,3 +145,31 @@ class CaffeViewsTests(TestCase):
             response.context['worked_hours'],
             [self.worked_hours_main]
         )
+
+        self.assertCountEqual(response.context['alerts'], [])
+
+    def test_caffe_navigate_alerts(self):
+        """Check if alerts of products of the caffe are displayed."""
+
+        products = []
+        owners = [(self.kafo, self.user), (self.filtry, self.user_f)]
+        for caffe, user in owners:
+            product = Product.objects.create(
+                name='Mleko',
+                category=Category.objects.create(name='Napoje', caffe=caffe),
+                unit=Unit.objects.create(name='litr', caffe=caffe),
+                caffe=caffe,
+                threshold=2
+            )
+            create_report(caffe, user, [
+                FullProduct(product=product, amount=1, caffe=caffe)
+            ])
+            products.append(product)
+
+        response = self.client.get(reverse('home:navigate'))
+
+        self.assertEqual(
+            [alert.product for alert in response.context['alerts']],
+            products[:1]
+        )
+        self.assertContains(response, 'Produkty do zamówienia')
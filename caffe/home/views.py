@@ -1,11 +1,10 @@
-from datetime import date
-
 from django.contrib.auth.decorators import permission_required
 from django.shortcuts import render
 
+from caffe.dates import filter_day, local_today
 from cash.models import CashReport
 from hours.models import WorkedHours
-from reports.models import Report
+from reports.models import Report, StockAlert
 
 
 @permission_required(['hours.view_workedhours', 'reports.view_report',
@@ -13,35 +12,37 @@ from reports.models import Report
 def caffe_navigate(request):
     """Show caffe main page."""
 
-    year = date.today().year
-    month = date.today().month
-    day = date.today().day
+    today = local_today()
 
-    reports = Report.objects.filter(
-        created_on__year=year,
-        created_on__month=month,
-        created_on__day=day,
-        caffe=request.user.caffe
-    ).all()
+    reports = filter_day(
+        Report.objects.filter(caffe=request.user.caffe),
+        'created_on',
+        today
+    )
 
-    cash_reports = CashReport.objects.filter(
-        created_on__year=year,
-        created_on__month=month,
-        created_on__day=day,
-        caffe=request.user.caffe
-    ).all()
+    cash_reports = filter_day(
+        CashReport.objects.filter(caffe=request.user.caffe),
+        'created_on',
+        today
+    )
+
+    worked_hours = filter_day(
+        WorkedHours.objects.filter(
+            caffe=request.user.caffe
+        ).select_related('employee', 'position'),
+        'date',
+        today
+    )
 
-    worked_hours = WorkedHours.objects.filter(
-        date__year=year,
-        date__month=month,
-        date__day=day,
+    alerts = StockAlert.objects.filter(
         caffe=request.user.caffe
-    ).all()
+    ).select_related('product', 'product__unit')
 
     return render(request, 'home/caffe.html', {
         'reports': reports,
         'cash_reports': cash_reports,
-        'worked_hours': worked_hours
+        'worked_hours': worked_hours,
+        'alerts': alerts
     })
 
 
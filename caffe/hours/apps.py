@@ -1,5 +1,27 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_save
 
 
 class HoursConfig(AppConfig):
     name = 'hours'
+
+    def ready(self):
+        """Connect signals which refresh monthly timesheets."""
+
+        from . import timesheets
+        from .signals import worked_hours_written
+
+        worked_hours = self.get_model('WorkedHours')
+        pre_save.connect(
+            timesheets.worked_hours_changing,
+            sender=worked_hours
+        )
+        post_save.connect(
+            timesheets.worked_hours_changed,
+            sender=worked_hours
+        )
+        post_delete.connect(
+            timesheets.worked_hours_changed,
+            sender=worked_hours
+        )
+        worked_hours_written.connect(timesheets.worked_hours_written)
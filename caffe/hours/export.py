@@ -0,0 +1,44 @@
+"""Module responsible for exporting WorkedHours to CSV.
+
+WorkedHours are read in chunks by primary key with names of employees and
+positions joined, and worked minutes are computed by the database, so every
+chunk takes one query.
+"""
+
+from caffe.exports import keyset_chunks
+
+from .models import WorkedHours
+from .timesheets import WorkedMinutes
+
+HEADER = (
+    'worked_hours', 'date', 'start_time', 'end_time', 'employee',
+    'first_name', 'last_name', 'position', 'minutes'
+)
+
+
+def export_worked_hours(caffe, start, end):
+    """Yield CSV rows of WorkedHours of Caffe.
+
+    Args:
+        caffe (Caffe): Caffe which WorkedHours are exported.
+        start (date): First day of the export.
+        end (date): Last day of the export.
+
+    Yields:
+        Tuples with values of columns given by HEADER.
+    """
+
+    worked_hours = WorkedHours.objects.filter(
+        caffe=caffe,
+        date__gte=start,
+        date__lte=end
+    ).annotate(minutes=WorkedMinutes())
+
+    fields = (
+        'date', 'start_time', 'end_time', 'employee__username',
+        'employee__first_name', 'employee__last_name', 'position__name',
+        'minutes'
+    )
+    for chunk in keyset_chunks(worked_hours, fields):
+        for row in chunk:
+            yield row
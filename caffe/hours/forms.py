@@ -6,7 +6,8 @@ from django import forms
 from django.core.exceptions import ValidationError
 from django.utils.translation import ugettext_lazy as _
 
-from .models import Position, WorkedHours
+from .models import Position, WorkedHours, get_shift_bounds
+from .shifts import find_overlapping
 
 
 class PositionForm(forms.ModelForm):
@@ -111,29 +112,34 @@ class WorkedHoursForm(forms.ModelForm):
         cleaned_date = cleaned_data.get("date")
 
         if cleaned_start_time and cleaned_end_time and cleaned_date:
-            intersect = WorkedHours.objects.filter(
-                employee=self._employee,
-                caffe=self._caffe,
-                date=cleaned_date,
-                start_time__lte=cleaned_end_time,
-                end_time__gte=cleaned_start_time,
+            if cleaned_start_time == cleaned_end_time:
+                self.add_error(
+                    'start_time',
+                    u'Czas rozpoczęcia jest taki sam jak czas zakończenia.'
+                )
+                return
+
+            # shifts which end before they start last past midnight
+            started_on, ended_on = get_shift_bounds(
+                cleaned_date,
+                cleaned_start_time,
+                cleaned_end_time
             )
 
-            if self.instance.pk:
-                intersect = intersect.exclude(pk=self.instance.pk)
+            intersect = find_overlapping(
+                self._employee.pk if self._employee else None,
+                self._caffe.pk if self._caffe else None,
+                started_on,
+                ended_on,
+                exclude_pk=self.instance.pk
+            )
 
-            if intersect.exists() > 0:
+            if intersect.exists():
                 self.add_error(
                     'date',
                     u'Godziny w danym dniu się nakładają.'
                 )
 
-            if cleaned_start_time > cleaned_end_time:
-                self.add_error(
-                    'start_time',
-                    u'Czas rozpoczęcia jest później niż czas zakończenia.'
-                )
-
     def save(self, commit=True):
         """Save WorkedHoursForm data to model."""
 
@@ -144,3 +150,15 @@ class WorkedHoursForm(forms.ModelForm):
             hours.save()
 
         return hours
+
+
+class ScheduleForm(forms.Form):
+    """Responsible for uploading schedule of worked hours."""
+
+    schedule = forms.FileField(label=u'Grafik (CSV lub JSON)')
+
+    def __init__(self, *args, **kwargs):
+        """Initialize schedule field."""
+
+        kwargs.setdefault('label_suffix', '')
+        super(ScheduleForm, self).__init__(*args, **kwargs)
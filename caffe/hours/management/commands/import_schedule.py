@@ -0,0 +1,46 @@
+"""Command which imports schedule of worked hours from a file."""
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from caffe.imports import FORMATS, get_format
+from caffe.models import Caffe
+from hours.schedule import import_schedule, read_schedule
+
+
+class Command(BaseCommand):
+    """Import schedule of worked hours."""
+
+    help = 'Create worked hours of many employees from CSV or JSON file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to file with schedule.')
+        parser.add_argument(
+            '--caffe',
+            type=int,
+            required=True,
+            help='Id of caffe to which schedule belongs.'
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            default=None,
+            help='Format of file, taken from its extension when not given.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            caffe = Caffe.objects.get(id=options['caffe'])
+        except Caffe.DoesNotExist:
+            raise CommandError('Caffe does not exist.')
+
+        try:
+            file_format = options['format'] or get_format(options['path'])
+            with open(options['path'], 'rb') as stream:
+                rows = read_schedule(stream, file_format)
+
+            shifts = import_schedule(caffe, rows)
+        except ValidationError as error:
+            raise CommandError('\n'.join(error.messages))
+
+        self.stdout.write('Imported {} shifts.'.format(len(shifts)))
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.4 on 2026-10-18 11:15
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caffe', '0006_auto_20160621_0051'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('hours', '0002_hours_date_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyTimesheet',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('minutes', models.PositiveIntegerField(default=0)),
+                ('shifts', models.PositiveIntegerField(default=0)),
+                ('caffe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='caffe.Caffe')),
+                ('employee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('position', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='hours.Position')),
+            ],
+            options={
+                'ordering': ('date', 'employee', 'position'),
+                'default_permissions': (),
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='monthlytimesheet',
+            unique_together=set([('caffe', 'date', 'employee', 'position')]),
+        ),
+    ]
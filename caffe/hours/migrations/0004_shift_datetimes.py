@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from datetime import datetime, timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def set_shift_bounds(apps, schema_editor):
+    """Fill start and end datetimes of stored WorkedHours."""
+
+    WorkedHours = apps.get_model('hours', 'WorkedHours')
+    for worked_hours in WorkedHours.objects.all().iterator():
+        started_on = datetime.combine(worked_hours.date,
+                                      worked_hours.start_time)
+        ended_on = datetime.combine(worked_hours.date, worked_hours.end_time)
+        if ended_on < started_on:
+            ended_on += timedelta(days=1)
+
+        WorkedHours.objects.filter(pk=worked_hours.pk).update(
+            started_on=timezone.make_aware(started_on, is_dst=False),
+            ended_on=timezone.make_aware(ended_on, is_dst=False)
+        )
+
+
+def check_overlaps(apps, schema_editor):
+    """Stop migration when stored WorkedHours overlap each other.
+
+    Shifts are compared like in `hours.shifts`. The former check of
+    WorkedHoursForm did not prevent all of them, e.g. ones written at the
+    same time or in the admin, and exclusion constraint cannot be added
+    while they exist. They have to be corrected by hand, so migration fails
+    on every database with pks of all of them.
+    """
+
+    WorkedHours = apps.get_model('hours', 'WorkedHours')
+    shifts = WorkedHours.objects.order_by(
+        'caffe_id', 'employee_id', 'started_on'
+    ).values_list('pk', 'caffe_id', 'employee_id', 'started_on', 'ended_on')
+
+    overlapping = []
+    previous = None
+    for pk, caffe_id, employee_id, started_on, ended_on in shifts.iterator():
+        if (previous is not None and
+                previous[1:3] == (caffe_id, employee_id) and
+                previous[3] >= started_on):
+            overlapping.append((previous[0], pk))
+
+        # the shift which ends later can overlap the next ones
+        if (previous is None or previous[1:3] != (caffe_id, employee_id) or
+                previous[3] < ended_on):
+            previous = (pk, caffe_id, employee_id, ended_on)
+
+    if overlapping:
+        raise RuntimeError(
+            'Overlapping worked hours have to be corrected before migration: '
+            '{}.'.format(', '.join(
+                '{} and {}'.format(*pair) for pair in overlapping
+            ))
+        )
+
+
+def add_exclusion_constraint(apps, schema_editor):
+    """Forbid overlapping WorkedHours of one employee on PostgreSQL.
+
+    Shifts which only touch each other overlap too, so ranges include both
+    bounds. Other databases rely on the check made by `hours.shifts`.
+    """
+
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    schema_editor.execute(
+        'ALTER TABLE hours_workedhours '
+        'ADD CONSTRAINT hours_workedhours_no_overlap '
+        'EXCLUDE USING gist ('
+        'employee_id WITH =, '
+        'caffe_id WITH =, '
+        "tstzrange(started_on, ended_on, '[]') WITH &&"
+        ')'
+    )
+
+
+def remove_exclusion_constraint(apps, schema_editor):
+    """Drop constraint added by `add_exclusion_constraint`."""
+
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(
+        'ALTER TABLE hours_workedhours '
+        'DROP CONSTRAINT IF EXISTS hours_workedhours_no_overlap'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hours', '0003_monthly_timesheets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workedhours',
+            name='started_on',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='workedhours',
+            name='ended_on',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(set_shift_bounds, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='workedhours',
+            name='started_on',
+            field=models.DateTimeField(blank=True, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='workedhours',
+            name='ended_on',
+            field=models.DateTimeField(blank=True, editable=False),
+        ),
+        migrations.AlterIndexTogether(
+            name='workedhours',
+            index_together=set([('employee', 'started_on'), ('caffe', 'date')]),
+        ),
+        migrations.RunPython(check_overlaps, migrations.RunPython.noop),
+        migrations.RunPython(
+            add_exclusion_constraint,
+            remove_exclusion_constraint
+        ),
+    ]
@@ -1,8 +1,37 @@
+from datetime import date, datetime, time, timedelta
+
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
 
+def get_shift_bounds(day, start_time, end_time):
+    """Return timezone aware start and end of a shift.
+
+    Shift which ends before it starts lasts past midnight, so it ends on the
+    next day.
+
+    Args:
+        day (date): Local day when the shift starts.
+        start_time (time): Local time when the shift starts.
+        end_time (time): Local time when the shift ends.
+
+    Returns:
+        Tuple with start and end datetime.
+    """
+
+    started_on = datetime.combine(day, start_time)
+    ended_on = datetime.combine(day, end_time)
+    if ended_on < started_on:
+        ended_on += timedelta(days=1)
+
+    return (
+        timezone.make_aware(started_on, is_dst=False),
+        timezone.make_aware(ended_on, is_dst=False)
+    )
+
+
 class Position(models.Model):
     """Stores the Position on which Employee has been working."""
 
@@ -30,7 +59,11 @@ class Position(models.Model):
 
 
 class WorkedHours(models.Model):
-    """Stores one period of worked hours by one employee."""
+    """Stores one period of worked hours by one employee.
+
+    Start and end of the period are also stored as datetimes, so periods
+    past midnight can be compared with each other.
+    """
 
     created_on = models.DateTimeField(auto_now_add=True)
     updated_on = models.DateTimeField(auto_now=True)
@@ -51,9 +84,27 @@ class WorkedHours(models.Model):
         default=None,
     )
 
+    # set from date, start_time and end_time when model is cleaned
+    started_on = models.DateTimeField(blank=True, editable=False)
+    ended_on = models.DateTimeField(blank=True, editable=False)
+
     class Meta:
         ordering = ('-date', '-end_time')
         default_permissions = ('add', 'change', 'delete', 'view', 'change_all')
+        index_together = (('caffe', 'date'), ('employee', 'started_on'))
+
+    def clean(self):
+        """Set start and end datetime of the period."""
+
+        # fields which are not valid are reported by `clean_fields`
+        if (isinstance(self.date, date) and
+                isinstance(self.start_time, time) and
+                isinstance(self.end_time, time)):
+            self.started_on, self.ended_on = get_shift_bounds(
+                self.date,
+                self.start_time,
+                self.end_time
+            )
 
     def save(self, *args, **kwargs):
         """Save model into the database."""
@@ -79,3 +130,36 @@ class WorkedHours(models.Model):
             self.end_time,
             self.date
         )
+
+
+class MonthlyTimesheet(models.Model):
+    """Stores minutes worked by one employee on one position in a month.
+
+    Date is the first day of the month. Rows are refreshed whenever
+    WorkedHours of the month are written.
+    """
+
+    caffe = models.ForeignKey('caffe.Caffe', on_delete=models.CASCADE)
+    date = models.DateField()
+    employee = models.ForeignKey(
+        'employees.Employee',
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE
+    )
+    position = models.ForeignKey('Position', on_delete=models.CASCADE)
+    minutes = models.PositiveIntegerField(default=0)
+    shifts = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ('date', 'employee', 'position')
+        unique_together = ('caffe', 'date', 'employee', 'position')
+        default_permissions = ()
+
+    def __str__(self):
+        return '{:%Y-%m}: {} {} {}'.format(
+            self.date,
+            self.employee_id,
+            self.position_id,
+            self.minutes
+        )
@@ -0,0 +1,174 @@
+"""Module responsible for importing schedules of worked hours.
+
+Schedule is a list of shifts of many employees, e.g. of a whole week, read
+from CSV or JSON. Employees and positions of all shifts are resolved with
+one query each, shifts are checked for overlaps with one query (see
+`hours.shifts`) and all of them are inserted in bulk in one transaction.
+"""
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.translation import ugettext_lazy as _
+
+from caffe.imports import read_rows, row_error
+from caffe.line_items import BATCH_SIZE, batches
+from employees.models import Employee
+
+from .models import Position, WorkedHours, get_shift_bounds
+from .shifts import find_conflicts
+from .signals import worked_hours_written
+
+FIELDS = ('employee', 'position', 'date', 'start_time', 'end_time')
+
+# the same formats are accepted regardless of the active language
+DATE_INPUT_FORMATS = ('%Y-%m-%d', '%d.%m.%Y')
+TIME_INPUT_FORMATS = ('%H:%M', '%H:%M:%S')
+
+
+def read_schedule(stream, file_format):
+    """Read rows of schedule.
+
+    CSV should have a header with FIELDS. JSON should be a list of objects
+    with FIELDS, or an object with such list under `shifts`.
+
+    Args:
+        stream (file): Binary stream with UTF-8 encoded schedule.
+        file_format (str): One of `caffe.imports.FORMATS`.
+
+    Returns:
+        List of dictionaries.
+
+    Raises:
+        ValidationError: Schedule can not be read.
+    """
+
+    return read_rows(stream, file_format, 'shifts')
+
+
+def build_shift(row, caffe, employees, positions):
+    """Return not saved WorkedHours from row of schedule.
+
+    Raises:
+        ValidationError: Row is not valid.
+    """
+
+    missing = [field for field in FIELDS if not row.get(field)]
+    if missing:
+        raise ValidationError(
+            _('Brakuje pól: {}.').format(', '.join(missing))
+        )
+
+    employee = employees.get(str(row['employee']))
+    if employee is None:
+        raise ValidationError(_('Nie ma takiego pracownika.'))
+
+    position = positions.get(str(row['position']))
+    if position is None:
+        raise ValidationError(_('Nie ma takiego stanowiska.'))
+
+    day = forms.DateField(input_formats=DATE_INPUT_FORMATS).clean(
+        row['date']
+    )
+    start_time = forms.TimeField(input_formats=TIME_INPUT_FORMATS).clean(
+        row['start_time']
+    )
+    end_time = forms.TimeField(input_formats=TIME_INPUT_FORMATS).clean(
+        row['end_time']
+    )
+    if start_time == end_time:
+        raise ValidationError(
+            _('Czas rozpoczęcia jest taki sam jak czas zakończenia.')
+        )
+
+    started_on, ended_on = get_shift_bounds(day, start_time, end_time)
+    return WorkedHours(
+        employee=employee,
+        position=position,
+        caffe=caffe,
+        date=day,
+        start_time=start_time,
+        end_time=end_time,
+        started_on=started_on,
+        ended_on=ended_on
+    )
+
+
+def build_shifts(caffe, rows):
+    """Return not saved WorkedHours from all rows of schedule.
+
+    Args:
+        caffe (Caffe): Caffe to which schedule belongs.
+        rows (List(dict)): Rows of schedule.
+
+    Returns:
+        List of WorkedHours.
+
+    Raises:
+        ValidationError: Some rows are not valid or overlap other shifts.
+            Every message says which row is wrong.
+    """
+
+    employees = Employee.objects.filter(
+        caffe=caffe,
+        username__in={str(row.get('employee')) for row in rows}
+    )
+    employees = {employee.username: employee for employee in employees}
+
+    positions = Position.objects.filter(
+        caffe=caffe,
+        name__in={str(row.get('position')) for row in rows}
+    )
+    positions = {position.name: position for position in positions}
+
+    errors = []
+    shifts = []
+    numbers = []
+    for number, row in enumerate(rows, 1):
+        try:
+            shifts.append(build_shift(row, caffe, employees, positions))
+            numbers.append(number)
+        except ValidationError as error:
+            for message in error.messages:
+                errors.append(row_error(number, message))
+
+    for index in sorted(find_conflicts(shifts)):
+        errors.append(row_error(
+            numbers[index],
+            _('Godziny w danym dniu się nakładają.')
+        ))
+
+    if errors:
+        raise ValidationError(errors)
+
+    return shifts
+
+
+def import_schedule(caffe, rows):
+    """Create WorkedHours from all rows of schedule.
+
+    Args:
+        caffe (Caffe): Caffe to which schedule belongs.
+        rows (List(dict)): Rows of schedule.
+
+    Returns:
+        List of created WorkedHours.
+
+    Raises:
+        ValidationError: Some rows are not valid or overlap other shifts,
+            nothing is created then.
+    """
+
+    shifts = build_shifts(caffe, rows)
+
+    with transaction.atomic():
+        for batch in batches(shifts, BATCH_SIZE):
+            WorkedHours.objects.bulk_create(batch)
+
+        worked_hours_written.send(
+            sender=WorkedHours,
+            caffe=caffe,
+            days=sorted({shift.date for shift in shifts})
+        )
+
+    return shifts
@@ -0,0 +1,126 @@
+"""Module responsible for checking if shifts of employees overlap.
+
+Shifts are compared by their start and end datetimes, so shifts past
+midnight are handled like any other. Like in the former check of
+WorkedHoursForm, only shifts of the same employee in the same Caffe are
+compared and shifts which only touch each other, e.g. one ends at 16:00
+and the other starts at 16:00, overlap too. No shift is longer than
+MAX_SHIFT, so shifts which can overlap given period start in a bounded
+range of time and are found by one probe of the (employee, started_on)
+index. On PostgreSQL overlapping shifts are also forbidden by exclusion
+constraint.
+"""
+
+import bisect
+import operator
+from datetime import timedelta
+from functools import reduce
+
+from django.db.models import Q
+
+from .models import WorkedHours
+
+# shift given by start and end time lasts less than a day
+MAX_SHIFT = timedelta(days=1)
+
+
+def find_overlapping(employee_id, caffe_id, started_on, ended_on,
+                     exclude_pk=None):
+    """Return stored shifts of employee which overlap given period.
+
+    Args:
+        employee_id (int): Id of Employee.
+        caffe_id (int): Id of Caffe in which shifts are compared.
+        started_on (datetime): Start of the period.
+        ended_on (datetime): End of the period.
+        exclude_pk (Optional(int)): Pk of WorkedHours which are skipped,
+            e.g. the edited ones.
+
+    Returns:
+        QuerySet of WorkedHours.
+    """
+
+    shifts = WorkedHours.objects.filter(
+        employee_id=employee_id,
+        caffe_id=caffe_id,
+        started_on__gt=started_on - MAX_SHIFT,
+        started_on__lte=ended_on,
+        ended_on__gte=started_on
+    )
+
+    if exclude_pk is not None:
+        shifts = shifts.exclude(pk=exclude_pk)
+
+    return shifts
+
+
+def find_conflicts(shifts):
+    """Find shifts which overlap stored shifts or each other.
+
+    All stored shifts which can overlap are read with one query. Stored
+    shifts which are among given ones are replaced by them.
+
+    Args:
+        shifts (List(WorkedHours)): Shifts with set `started_on` and
+            `ended_on`, e.g. cleaned ones.
+
+    Returns:
+        Set of indices of shifts which overlap some other shift.
+    """
+
+    # shifts are compared within pairs of (caffe_id, employee_id)
+    bounds = {}
+    for shift in shifts:
+        key = (shift.caffe_id, shift.employee_id)
+        first, last = bounds.get(key, (shift.started_on, shift.ended_on))
+        bounds[key] = (
+            min(first, shift.started_on),
+            max(last, shift.ended_on)
+        )
+
+    if not bounds:
+        return set()
+
+    conditions = [
+        Q(
+            caffe_id=caffe_id,
+            employee_id=employee_id,
+            started_on__gt=first - MAX_SHIFT,
+            started_on__lte=last
+        ) for (caffe_id, employee_id), (first, last) in bounds.items()
+    ]
+
+    stored = WorkedHours.objects.filter(reduce(operator.or_, conditions))
+    stored = stored.exclude(
+        pk__in=[shift.pk for shift in shifts if shift.pk is not None]
+    ).values_list('caffe_id', 'employee_id', 'started_on', 'ended_on')
+
+    # periods of every employee: (start, end, index or None when stored)
+    periods = {}
+    for caffe_id, employee_id, started_on, ended_on in stored:
+        periods.setdefault((caffe_id, employee_id), []).append(
+            (started_on, ended_on, None)
+        )
+
+    for index, shift in enumerate(shifts):
+        periods.setdefault((shift.caffe_id, shift.employee_id), []).append(
+            (shift.started_on, shift.ended_on, index)
+        )
+
+    conflicts = set()
+    for employee_periods in periods.values():
+        employee_periods.sort(key=lambda period: period[0])
+        starts = [period[0] for period in employee_periods]
+
+        for started_on, ended_on, index in employee_periods:
+            if index is None:
+                continue
+
+            first = bisect.bisect_right(starts, started_on - MAX_SHIFT)
+            last = bisect.bisect_right(starts, ended_on)
+            for other in employee_periods[first:last]:
+                if other[2] != index and other[1] >= started_on:
+                    conflicts.add(index)
+                    break
+
+    return conflicts
@@ -0,0 +1,7 @@
+"""Signals sent by the hours app."""
+
+from django.dispatch import Signal
+
+# Sent when WorkedHours of Caffe have been written in bulk, which does not
+# send `post_save`. Days are dates of the written WorkedHours.
+worked_hours_written = Signal(providing_args=['caffe', 'days'])
@@ -0,0 +1,96 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103,R0902
+
+from datetime import date, time
+
+from django.contrib.auth.models import Permission
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from caffe.models import Caffe
+from employees.models import Employee
+
+from .export import HEADER, export_worked_hours
+from .models import Position, WorkedHours
+
+
+class ExportTests(TestCase):
+    """Test exporting WorkedHours to CSV."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.kate = Employee.objects.create_user(
+            username='KateT',
+            password='KateT',
+            first_name='Kate',
+            last_name='Tempest',
+            caffe=self.kafo
+        )
+        self.barista = Position.objects.create(name='Barista', caffe=self.kafo)
+
+    def add_hours(self, day, start, end):
+        """Create WorkedHours of Kate."""
+
+        return WorkedHours.objects.create(
+            start_time=start,
+            end_time=end,
+            date=day,
+            position=self.barista,
+            employee=self.kate,
+            caffe=self.kafo
+        )
+
+    def test_export_worked_hours(self):
+        """Check if shifts from range are exported with worked minutes."""
+
+        day = self.add_hours(date(2016, 7, 1), '08:00', '16:00')
+        night = self.add_hours(date(2016, 7, 31), '22:00', '02:00')
+        self.add_hours(date(2016, 8, 1), '08:00', '16:00')
+
+        # one query for shifts and one for the end
+        with self.assertNumQueries(2):
+            rows = list(export_worked_hours(
+                self.kafo, date(2016, 7, 1), date(2016, 7, 31)
+            ))
+
+        self.assertTrue(all(len(row) == len(HEADER) for row in rows))
+        self.assertEqual(rows, [
+            (day.id, date(2016, 7, 1), time(8), time(16), 'KateT', 'Kate',
+             'Tempest', 'Barista', 480),
+            (night.id, date(2016, 7, 31), time(22), time(2), 'KateT', 'Kate',
+             'Tempest', 'Barista', 240),
+        ])
+
+    def test_export_view(self):
+        """Check if shifts of all employees are exported only to managers."""
+
+        self.add_hours(date(2016, 7, 1), '08:00', '16:00')
+        self.client.login(username='KateT', password='KateT')
+        url = reverse('hours:export')
+        params = {'start': '2016-07-01', 'end': '2016-07-31'}
+
+        self.kate.user_permissions.add(
+            Permission.objects.get(codename='view_workedhours')
+        )
+        self.assertEqual(self.client.get(url, params).status_code, 302)
+
+        self.kate.user_permissions.add(
+            Permission.objects.get(codename='change_all_workedhours')
+        )
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode('utf-8')
+        self.assertEqual(
+            lines.splitlines()[1].split(',')[1:],
+            ['2016-07-01', '08:00:00', '16:00:00', 'KateT', 'Kate',
+             'Tempest', 'Barista', '480']
+        )
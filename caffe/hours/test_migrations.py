@@ -0,0 +1,88 @@
+"""Worked hours migrations testing module."""
+
+from datetime import date, time
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+from caffe.models import Caffe
+from employees.models import Employee
+
+from .models import WorkedHours, get_shift_bounds
+
+
+class ShiftDatetimesMigrationTest(TransactionTestCase):
+    """Tests of migration which stores shifts as datetime ranges."""
+
+    before = [('hours', '0003_monthly_timesheets')]
+
+    def migrate(self, targets):
+        """Migrate database to targets and return their historical apps."""
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        executor.loader.build_graph()
+        return executor.loader.project_state(targets).apps
+
+    def setUp(self):
+        """Migrate database back and store shifts of one employee."""
+
+        latest = MigrationExecutor(connection).loader.graph.leaf_nodes()
+        self.addCleanup(self.migrate, latest)
+
+        self.caffe = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+        self.kate = Employee.objects.create(username='KateT',
+                                            caffe=self.caffe)
+
+        apps = self.migrate(self.before)
+        Position = apps.get_model('hours', 'Position')
+        self.WorkedHours = apps.get_model('hours', 'WorkedHours')
+        self.barista = Position.objects.create(name='Barista',
+                                               caffe_id=self.caffe.id)
+        self.latest = latest
+
+    def add_shift(self, start, end):
+        """Store shift of Kate with historical model."""
+
+        return self.WorkedHours.objects.create(
+            start_time=start,
+            end_time=end,
+            date=date(2016, 7, 1),
+            position=self.barista,
+            employee_id=self.kate.id,
+            caffe_id=self.caffe.id
+        )
+
+    def test_shifts_migrated(self):
+        """Check if shifts which do not overlap get their datetimes."""
+
+        shift = self.add_shift(time(8), time(12))
+        self.add_shift(time(13), time(16))
+
+        self.migrate(self.latest)
+
+        shift = WorkedHours.objects.get(id=shift.id)
+        self.assertEqual(
+            (shift.started_on, shift.ended_on),
+            get_shift_bounds(date(2016, 7, 1), time(8), time(12))
+        )
+
+    def test_overlapping_shifts(self):
+        """Check if migration stops when stored shifts overlap."""
+
+        first = self.add_shift(time(8), time(16))
+        self.add_shift(time(9), time(10))
+        last = self.add_shift(time(16), time(18))
+
+        with self.assertRaisesRegex(RuntimeError,
+                                    '{} and {}'.format(first.id, last.id)):
+            self.migrate(self.latest)
+
+        self.WorkedHours.objects.all().delete()
@@ -0,0 +1,43 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103
+
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from caffe.dates import local_today
+from caffe.query_counts import QueryCountsMixin
+
+from .models import Position, WorkedHours
+
+
+class HoursQueriesTests(QueryCountsMixin, TestCase):
+    """Test if numbers of queries of views do not depend on data."""
+
+    def test_new_position(self):
+        """Check new Position view."""
+
+        self.assertConstantQueries(lambda caffe: reverse('hours:new_position'))
+
+    def test_edit_position(self):
+        """Check edit Position view."""
+
+        self.assertConstantQueries(lambda caffe: reverse(
+            'hours:edit_position',
+            args=(Position.objects.filter(caffe=caffe).first().id,)
+        ))
+
+    def test_edit_worked_hours(self):
+        """Check edit WorkedHours view."""
+
+        self.assertConstantQueries(lambda caffe: reverse(
+            'hours:edit',
+            args=(WorkedHours.objects.filter(caffe=caffe).first().id,)
+        ))
+
+    def test_payroll(self):
+        """Check payroll of the current month view."""
+
+        today = local_today()
+        self.assertConstantQueries(lambda caffe: reverse(
+            'hours:payroll', args=(today.year, today.month)
+        ))
@@ -0,0 +1,240 @@
+import json
+import os
+import tempfile
+from datetime import date
+
+from django.contrib.auth.models import Permission
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.six import BytesIO, StringIO
+
+from caffe.models import Caffe
+from calendars.activity import get_month_activity
+from employees.models import Employee
+from stats.models import HoursDailyStats
+
+from .models import MonthlyTimesheet, Position, WorkedHours
+from .schedule import import_schedule, read_schedule
+
+SCHEDULE = '''employee,position,date,start_time,end_time
+KateT,Barista,2016-07-04,08:00,16:00
+KateT,Barista,2016-07-04,22:00,02:00
+BobD,Sprzątanie,05.07.2016,10:00,12:30
+'''
+
+
+class ScheduleTests(TestCase):
+    """Test importing schedules of worked hours."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+        self.filtry = Caffe.objects.create(
+            name='filtry',
+            city='Warszawa',
+            street='Filry',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.kate = Employee.objects.create_user(
+            username='KateT',
+            password='KateT',
+            caffe=self.kafo
+        )
+        self.bob = Employee.objects.create(username='BobD', caffe=self.kafo)
+        Employee.objects.create(username='AnnF', caffe=self.filtry)
+
+        self.barista = Position.objects.create(name='Barista', caffe=self.kafo)
+        self.cleaning = Position.objects.create(
+            name='Sprzątanie',
+            caffe=self.kafo
+        )
+
+    def rows(self, count):
+        """Return rows of schedule with one shift per day."""
+
+        return [
+            {
+                'employee': 'KateT',
+                'position': 'Barista',
+                'date': '2016-08-{:02d}'.format(day),
+                'start_time': '08:00',
+                'end_time': '12:00'
+            } for day in range(1, count + 1)
+        ]
+
+    def test_read_schedule(self):
+        """Check if CSV and JSON schedules are read."""
+
+        rows = read_schedule(BytesIO(SCHEDULE.encode('utf-8')), 'csv')
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[2]['position'], 'Sprzątanie')
+
+        data = json.dumps({'shifts': rows}).encode('utf-8')
+        self.assertEqual(read_schedule(BytesIO(data), 'json'), rows)
+        self.assertEqual(
+            read_schedule(BytesIO(json.dumps(rows).encode('utf-8')), 'json'),
+            rows
+        )
+
+        for data in [b'{"shifts": 1}', b'[1, 2]', b'{', b'\xff']:
+            with self.assertRaises(ValidationError):
+                read_schedule(BytesIO(data), 'json')
+
+    def test_import_schedule(self):
+        """Check if shifts are created and rollups are refreshed."""
+
+        rows = read_schedule(BytesIO(SCHEDULE.encode('utf-8')), 'csv')
+        shifts = import_schedule(self.kafo, rows)
+
+        self.assertEqual(len(shifts), 3)
+        self.assertEqual(WorkedHours.objects.count(), 3)
+
+        night = WorkedHours.objects.get(start_time='22:00')
+        self.assertEqual(night.employee, self.kate)
+        self.assertEqual(night.ended_on.date(), date(2016, 7, 5))
+
+        self.assertEqual(
+            set(MonthlyTimesheet.objects.values_list('employee', 'minutes')),
+            {(self.kate.id, 720), (self.bob.id, 150)}
+        )
+        self.assertEqual(
+            set(HoursDailyStats.objects.values_list('date', 'minutes')),
+            {(date(2016, 7, 4), 720), (date(2016, 7, 5), 150)}
+        )
+
+    def test_import_schedule_activity(self):
+        """Check if activity shown in the calendar includes imported shifts."""
+
+        activity = get_month_activity(self.kafo, 2016, 7)
+        self.assertEqual(activity[3]['worked_hours'], 0)
+
+        rows = read_schedule(BytesIO(SCHEDULE.encode('utf-8')), 'csv')
+        import_schedule(self.kafo, rows)
+
+        activity = get_month_activity(self.kafo, 2016, 7)
+        self.assertEqual(activity[3]['worked_hours'], 2)
+        self.assertEqual(activity[4]['worked_hours'], 1)
+
+    def test_import_schedule_queries(self):
+        """Check if number of queries does not depend on number of shifts."""
+
+        with CaptureQueriesContext(connection) as queries:
+            import_schedule(self.kafo, self.rows(1))
+        num_queries = len(queries)
+
+        WorkedHours.objects.all().delete()
+        with self.assertNumQueries(num_queries):
+            import_schedule(self.kafo, self.rows(20))
+
+        self.assertEqual(WorkedHours.objects.count(), 20)
+
+    def test_import_schedule_errors(self):
+        """Check if invalid schedule is not imported at all."""
+
+        WorkedHours.objects.create(
+            start_time='20:00',
+            end_time='23:00',
+            date=date(2016, 8, 2),
+            position=self.barista,
+            employee=self.kate,
+            caffe=self.kafo
+        )
+
+        rows = self.rows(3) + [
+            dict(self.rows(1)[0], start_time='11:00', end_time='13:00'),
+            dict(self.rows(1)[0], employee='AnnF'),
+            dict(self.rows(1)[0], position='Kucharz'),
+            dict(self.rows(1)[0], date='2016-13-01'),
+            dict(self.rows(1)[0], end_time=''),
+            dict(self.rows(2)[1], start_time='22:30', end_time='01:00'),
+        ]
+
+        with self.assertRaises(ValidationError) as context:
+            import_schedule(self.kafo, rows)
+
+        messages = context.exception.messages
+        self.assertEqual(len(messages), 7)
+        self.assertEqual(
+            [message.split(':')[0] for message in messages],
+            ['Wiersz {}'.format(number) for number in [5, 6, 7, 8, 1, 4, 9]]
+        )
+        self.assertIn('nakładają', messages[-1])
+        self.assertIn('end_time', messages[3])
+        self.assertEqual(WorkedHours.objects.count(), 1)
+
+    def test_import_view(self):
+        """Check if schedule is uploaded by manager."""
+
+        self.kate.user_permissions.add(
+            Permission.objects.get(codename='add_workedhours'),
+            Permission.objects.get(codename='change_all_workedhours'),
+            Permission.objects.get(codename='view_report'),
+            Permission.objects.get(codename='view_cashreport'),
+            Permission.objects.get(codename='view_workedhours'),
+        )
+        self.client.login(username='KateT', password='KateT')
+
+        url = reverse('hours:import')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'hours/import.html')
+
+        response = self.client.post(url, {
+            'schedule': SimpleUploadedFile('week.txt', b'')
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('schedule', response.context['form'].errors)
+
+        response = self.client.post(url, {
+            'schedule': SimpleUploadedFile('week.csv',
+                                           SCHEDULE.encode('utf-8'))
+        }, follow=True)
+        self.assertRedirects(response, reverse('home:navigate'))
+        self.assertEqual(WorkedHours.objects.count(), 3)
+
+        response = self.client.post(url, {
+            'schedule': SimpleUploadedFile('week.csv',
+                                           SCHEDULE.encode('utf-8'))
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['form'].errors['schedule']), 3)
+        self.assertEqual(WorkedHours.objects.count(), 3)
+
+    def test_import_schedule_command(self):
+        """Check if command imports schedule from file."""
+
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'wb') as stream:
+            stream.write(SCHEDULE.encode('utf-8'))
+
+        try:
+            out = StringIO()
+            call_command('import_schedule', path,
+                         '--caffe={}'.format(self.kafo.id), stdout=out)
+            self.assertIn('Imported 3 shifts', out.getvalue())
+
+            with self.assertRaises(CommandError):
+                call_command('import_schedule', path,
+                             '--caffe={}'.format(self.kafo.id), stdout=out)
+
+            with self.assertRaises(CommandError):
+                call_command('import_schedule', path, '--caffe=0',
+                             stdout=out)
+        finally:
+            os.remove(path)
+
+        self.assertEqual(WorkedHours.objects.count(), 3)
@@ -0,0 +1,208 @@
+from datetime import date, datetime, time
+
+from django.test import TestCase
+from django.utils import timezone
+
+from caffe.models import Caffe
+from employees.models import Employee
+
+from .forms import WorkedHoursForm
+from .models import Position, WorkedHours, get_shift_bounds
+from .shifts import find_conflicts, find_overlapping
+
+
+def aware(*args):
+    """Return timezone aware datetime in the current timezone."""
+
+    return timezone.make_aware(datetime(*args))
+
+
+class ShiftsTests(TestCase):
+    """Test checking if shifts overlap."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.kate = Employee.objects.create(
+            username='KateT',
+            first_name='Kate',
+            last_name='Tempest',
+            caffe=self.kafo
+        )
+        self.bob = Employee.objects.create(
+            username='BobD',
+            first_name='Bob',
+            last_name='Dylan',
+            caffe=self.kafo
+        )
+
+        self.barista = Position.objects.create(name='Barista', caffe=self.kafo)
+
+    def shift(self, employee, day, start, end):
+        """Return not saved and cleaned WorkedHours."""
+
+        worked_hours = WorkedHours(
+            start_time=start,
+            end_time=end,
+            date=day,
+            position=self.barista,
+            employee=employee,
+            caffe=self.kafo
+        )
+        worked_hours.full_clean()
+        return worked_hours
+
+    def form(self, employee, day, start, end, instance=None):
+        """Return WorkedHoursForm with given period."""
+
+        return WorkedHoursForm(
+            {
+                'start_time': start,
+                'end_time': end,
+                'date': day,
+                'position': self.barista.id
+            },
+            employee=employee,
+            caffe=self.kafo,
+            instance=instance
+        )
+
+    def test_shift_bounds(self):
+        """Check if shift past midnight ends on the next day."""
+
+        self.assertEqual(
+            get_shift_bounds(date(2016, 7, 1), time(8), time(16)),
+            (aware(2016, 7, 1, 8), aware(2016, 7, 1, 16))
+        )
+        self.assertEqual(
+            get_shift_bounds(date(2016, 7, 1), time(22), time(2)),
+            (aware(2016, 7, 1, 22), aware(2016, 7, 2, 2))
+        )
+
+        worked_hours = self.shift(self.kate, date(2016, 7, 1), '22:00',
+                                  '02:00')
+        worked_hours.save()
+        worked_hours.refresh_from_db()
+        self.assertEqual(worked_hours.ended_on, aware(2016, 7, 2, 2))
+
+    def test_find_overlapping(self):
+        """Check if overlapping shifts are found also after midnight."""
+
+        night = self.shift(self.kate, date(2016, 7, 1), '22:00', '02:00')
+        night.save()
+
+        self.assertEqual(
+            list(find_overlapping(self.kate.id, self.kafo.id,
+                                  aware(2016, 7, 2, 1), aware(2016, 7, 2, 8))),
+            [night]
+        )
+        self.assertFalse(find_overlapping(
+            self.kate.id, self.kafo.id,
+            aware(2016, 7, 2, 3), aware(2016, 7, 2, 8)
+        ).exists())
+        self.assertFalse(find_overlapping(
+            self.bob.id, self.kafo.id,
+            aware(2016, 7, 2, 1), aware(2016, 7, 2, 8)
+        ).exists())
+        self.assertFalse(find_overlapping(
+            self.kate.id, self.kafo.id,
+            aware(2016, 7, 2, 1), aware(2016, 7, 2, 8),
+            exclude_pk=night.pk
+        ).exists())
+
+    def test_touching_shifts(self):
+        """Check if shifts which only touch each other overlap."""
+
+        night = self.shift(self.kate, date(2016, 7, 1), '22:00', '02:00')
+        night.save()
+
+        self.assertEqual(
+            list(find_overlapping(self.kate.id, self.kafo.id,
+                                  aware(2016, 7, 2, 2), aware(2016, 7, 2, 8))),
+            [night]
+        )
+        self.assertEqual(
+            list(find_overlapping(self.kate.id, self.kafo.id,
+                                  aware(2016, 7, 1, 16),
+                                  aware(2016, 7, 1, 22))),
+            [night]
+        )
+
+    def test_other_caffe(self):
+        """Check if shifts are compared only within one Caffe."""
+
+        self.shift(self.kate, date(2016, 7, 1), '22:00', '02:00').save()
+
+        other = Caffe.objects.create(
+            name='other',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='15',
+            postal_code='44-100'
+        )
+        self.assertFalse(find_overlapping(
+            self.kate.id, other.id, aware(2016, 7, 2, 1), aware(2016, 7, 2, 8)
+        ).exists())
+
+        shift = self.shift(self.kate, date(2016, 7, 2), '01:00', '08:00')
+        shift.caffe = other
+        self.assertEqual(find_conflicts([shift]), set())
+
+    def test_form_overnight_shift(self):
+        """Check if form accepts shifts past midnight which do not overlap."""
+
+        form = self.form(self.kate, date(2016, 7, 1), '22:00', '02:00')
+        self.assertTrue(form.is_valid())
+        night = form.save()
+
+        form = self.form(self.kate, date(2016, 7, 2), '01:00', '08:00')
+        self.assertFalse(form.is_valid())
+        self.assertIn('date', form.errors)
+
+        form = self.form(self.kate, date(2016, 7, 2), '02:00', '08:00')
+        self.assertFalse(form.is_valid())
+        self.assertIn('date', form.errors)
+
+        form = self.form(self.kate, date(2016, 7, 2), '03:00', '08:00')
+        self.assertTrue(form.is_valid())
+
+        form = self.form(self.kate, date(2016, 7, 1), '23:00', '01:30',
+                         instance=night)
+        self.assertTrue(form.is_valid())
+
+        form = self.form(self.kate, date(2016, 7, 1), '08:00', '08:00')
+        self.assertFalse(form.is_valid())
+        self.assertIn('start_time', form.errors)
+
+    def test_find_conflicts(self):
+        """Check if many shifts are checked with one query."""
+
+        self.shift(self.kate, date(2016, 7, 1), '22:00', '02:00').save()
+        edited = self.shift(self.bob, date(2016, 7, 3), '08:00', '16:00')
+        edited.save()
+
+        shifts = [
+            self.shift(self.kate, date(2016, 7, 2), '01:00', '03:00'),
+            self.shift(self.kate, date(2016, 7, 2), '08:00', '12:00'),
+            self.shift(self.bob, date(2016, 7, 2), '08:00', '12:00'),
+            self.shift(self.bob, date(2016, 7, 2), '11:00', '13:00'),
+            self.shift(self.bob, date(2016, 7, 2), '23:00', '01:00'),
+            self.shift(self.kate, date(2016, 7, 2), '12:00', '16:00'),
+        ]
+        edited.start_time = time(10)
+        edited.full_clean()
+        shifts.append(edited)
+
+        with self.assertNumQueries(1):
+            conflicts = find_conflicts(shifts)
+
+        self.assertEqual(conflicts, {0, 1, 2, 3, 5})
+        self.assertEqual(find_conflicts([]), set())
@@ -0,0 +1,210 @@
+from datetime import date
+
+from django.contrib.auth.models import Permission
+from django.core.urlresolvers import reverse
+from django.test import TestCase, override_settings
+
+from caffe.models import Caffe
+from employees.models import Employee
+
+from .models import MonthlyTimesheet, Position, WorkedHours
+from .timesheets import (WorkedMinutes, get_payroll, get_timesheet,
+                         refresh_timesheets)
+
+
+class TimesheetsTests(TestCase):
+    """Test timesheets and payroll of worked hours."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+        self.filtry = Caffe.objects.create(
+            name='filtry',
+            city='Warszawa',
+            street='Filry',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.kate = Employee.objects.create_user(
+            username='KateT',
+            password='KateT',
+            first_name='Kate',
+            last_name='Tempest',
+            caffe=self.kafo
+        )
+        self.bob = Employee.objects.create(
+            username='BobD',
+            first_name='Bob',
+            last_name='Dylan',
+            caffe=self.kafo
+        )
+
+        self.barista = Position.objects.create(name='Barista', caffe=self.kafo)
+        self.cleaning = Position.objects.create(
+            name='Sprzątanie',
+            caffe=self.kafo
+        )
+
+    def add_hours(self, employee, position, day, start, end):
+        """Create WorkedHours of employee."""
+
+        return WorkedHours.objects.create(
+            start_time=start,
+            end_time=end,
+            date=day,
+            position=position,
+            employee=employee,
+            caffe=self.kafo
+        )
+
+    def test_worked_minutes(self):
+        """Check if minutes are computed by database also after midnight."""
+
+        self.add_hours(self.kate, self.barista, date(2016, 7, 1),
+                       '08:00', '16:30')
+        self.add_hours(self.bob, self.barista, date(2016, 7, 1),
+                       '22:00', '02:00')
+
+        minutes = WorkedHours.objects.annotate(
+            minutes=WorkedMinutes()
+        ).order_by('start_time').values_list('minutes', flat=True)
+        self.assertEqual(list(minutes), [510, 240])
+
+    def test_get_timesheet(self):
+        """Check if minutes are summed up per week."""
+
+        # 2016-07-03 is Sunday, 2016-07-04 is Monday
+        self.add_hours(self.kate, self.barista, date(2016, 7, 3),
+                       '08:00', '10:00')
+        self.add_hours(self.kate, self.barista, date(2016, 7, 3),
+                       '12:00', '13:00')
+        self.add_hours(self.kate, self.barista, date(2016, 7, 4),
+                       '08:00', '08:30')
+        self.add_hours(self.kate, self.cleaning, date(2016, 7, 4),
+                       '20:00', '21:00')
+        self.add_hours(self.kate, self.cleaning, date(2016, 8, 1),
+                       '20:00', '21:00')
+
+        with self.assertNumQueries(1):
+            timesheet = get_timesheet(
+                self.kafo, date(2016, 7, 1), date(2016, 8, 1)
+            )
+
+        rows = {row['position']: row for row in timesheet}
+        self.assertEqual(len(rows), 2)
+
+        barista = rows[self.barista.id]
+        self.assertEqual(barista['employee'], self.kate.id)
+        self.assertEqual(barista['minutes'], 210)
+        self.assertEqual(barista['shifts'], 3)
+        self.assertEqual(barista['weeks'], {
+            date(2016, 6, 27): 180,
+            date(2016, 7, 4): 30,
+        })
+
+        self.assertEqual(rows[self.cleaning.id]['minutes'], 60)
+
+    def test_monthly_timesheets_refreshed(self):
+        """Check if monthly totals follow saved and deleted hours."""
+
+        worked_hours = self.add_hours(self.kate, self.barista,
+                                      date(2016, 7, 1), '12:00', '15:30')
+        self.add_hours(self.kate, self.barista, date(2016, 7, 20),
+                       '16:00', '17:00')
+
+        timesheet = MonthlyTimesheet.objects.get()
+        self.assertEqual(timesheet.date, date(2016, 7, 1))
+        self.assertEqual(timesheet.minutes, 270)
+        self.assertEqual(timesheet.shifts, 2)
+
+        worked_hours.date = date(2016, 6, 30)
+        worked_hours.save()
+        self.assertEqual(
+            list(MonthlyTimesheet.objects.values_list('date', 'minutes')),
+            [(date(2016, 6, 1), 210), (date(2016, 7, 1), 60)]
+        )
+
+        worked_hours.delete()
+        self.assertEqual(MonthlyTimesheet.objects.count(), 1)
+
+        MonthlyTimesheet.objects.all().delete()
+        refresh_timesheets()
+        self.assertEqual(MonthlyTimesheet.objects.get().minutes, 60)
+
+    def test_get_payroll(self):
+        """Check if payroll of a month is read with one query."""
+
+        self.add_hours(self.kate, self.barista, date(2016, 7, 1),
+                       '08:00', '16:00')
+        self.add_hours(self.kate, self.barista, date(2016, 7, 2),
+                       '08:00', '12:00')
+        self.add_hours(self.bob, self.cleaning, date(2016, 7, 2),
+                       '22:00', '01:00')
+        self.add_hours(self.bob, self.cleaning, date(2016, 8, 1),
+                       '08:00', '09:00')
+
+        expected = [
+            {
+                'employee': self.bob.id,
+                'first_name': 'Bob',
+                'last_name': 'Dylan',
+                'position': self.cleaning.id,
+                'position_name': 'Sprzątanie',
+                'minutes': 180,
+                'shifts': 1
+            },
+            {
+                'employee': self.kate.id,
+                'first_name': 'Kate',
+                'last_name': 'Tempest',
+                'position': self.barista.id,
+                'position_name': 'Barista',
+                'minutes': 720,
+                'shifts': 2
+            },
+        ]
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_payroll(self.kafo, 2016, 7), expected)
+
+        with override_settings(TIMESHEETS_MATERIALIZED=False):
+            with self.assertNumQueries(1):
+                self.assertEqual(get_payroll(self.kafo, 2016, 7), expected)
+
+        self.assertEqual(get_payroll(self.filtry, 2016, 7), [])
+
+        with self.assertRaises(ValueError):
+            get_payroll(self.kafo, 2016, 13)
+
+    def test_payroll_view(self):
+        """Check if payroll is shown only to managers."""
+
+        self.add_hours(self.kate, self.barista, date(2016, 7, 1),
+                       '08:00', '16:00')
+        self.client.login(username='KateT', password='KateT')
+
+        url = reverse('hours:payroll', args=(2016, 7))
+        self.kate.user_permissions.add(
+            Permission.objects.get(codename='view_workedhours')
+        )
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.kate.user_permissions.add(
+            Permission.objects.get(codename='change_all_workedhours')
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'hours/payroll.html')
+        self.assertEqual(response.context['total'], 480)
+        self.assertContains(response, 'Tempest')
+
+        response = self.client.get(reverse('hours:payroll', args=(2016, 13)))
+        self.assertEqual(response.status_code, 404)
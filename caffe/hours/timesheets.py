@@ -0,0 +1,295 @@
+"""Module responsible for timesheets of worked hours.
+
+Worked minutes of a shift are computed by the database from its start and
+end time (see `WorkedMinutes`), so shifts are summed up by grouped queries
+and never loaded one by one.
+
+Monthly totals per employee and position can be materialized in
+MonthlyTimesheets, which are refreshed whenever WorkedHours of the month are
+written. Then payroll of a month is read from them, otherwise it is
+aggregated from WorkedHours. Both ways take one query.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, Func, Sum
+from django.db.models.expressions import Date
+
+from caffe.dates import month_bounds
+
+from .models import MonthlyTimesheet, WorkedHours
+
+SECONDS_IN_DAY = 60 * 60 * 24
+
+
+class WorkedMinutes(Func):
+    """Number of minutes between start and end time of a shift.
+
+    Shifts which end before they start last past midnight.
+    """
+
+    template = (
+        '(CASE WHEN %(seconds)s < 0 THEN %(seconds)s + {} '
+        'ELSE %(seconds)s END) / 60'.format(SECONDS_IN_DAY)
+    )
+
+    def __init__(self, start='start_time', end='end_time', **extra):
+        super(WorkedMinutes, self).__init__(
+            start, end, output_field=models.IntegerField(), **extra
+        )
+
+    def compile_times(self, compiler, connection):
+        """Compile start and end time expressions."""
+
+        start, start_params = compiler.compile(self.source_expressions[0])
+        end, end_params = compiler.compile(self.source_expressions[1])
+        return start, end, end_params + start_params
+
+    def render(self, seconds, params):
+        """Render template with SQL which computes seconds of the shift."""
+
+        sql = self.template % {'seconds': '({})'.format(seconds)}
+        return sql, params * 3
+
+    def as_sql(self, compiler, connection):
+        start, end, params = self.compile_times(compiler, connection)
+        seconds = 'EXTRACT(EPOCH FROM ({} - {}))'.format(end, start)
+        return self.render(seconds, params)
+
+    def as_sqlite(self, compiler, connection):
+        start, end, params = self.compile_times(compiler, connection)
+        seconds = "strftime('%%s', {}) - strftime('%%s', {})".format(
+            end, start
+        )
+        return self.render(seconds, params)
+
+    def as_mysql(self, compiler, connection):
+        start, end, params = self.compile_times(compiler, connection)
+        seconds = 'TIME_TO_SEC({}) - TIME_TO_SEC({})'.format(end, start)
+        return self.render(seconds, params)
+
+
+def summarize(worked_hours, *fields):
+    """Sum worked minutes and count shifts grouped by given fields.
+
+    Args:
+        worked_hours (QuerySet): Summed WorkedHours.
+        *fields (str): Fields by which WorkedHours are grouped.
+
+    Returns:
+        QuerySet of dictionaries with `minutes`, `shifts` and given fields.
+    """
+
+    return worked_hours.order_by().values(*fields).annotate(
+        minutes=Sum(WorkedMinutes()),
+        shifts=Count('id')
+    ).order_by(*fields)
+
+
+def filter_worked_hours(caffe_id, start=None, end=None):
+    """Return WorkedHours of Caffe from given range of days."""
+
+    worked_hours = WorkedHours.objects.filter(caffe_id__isnull=False)
+    if caffe_id is not None:
+        worked_hours = worked_hours.filter(caffe_id=caffe_id)
+
+    if start is not None:
+        worked_hours = worked_hours.filter(date__gte=start, date__lt=end)
+
+    return worked_hours
+
+
+def week_start(day):
+    """Return Monday of the week of given day."""
+
+    return day - timedelta(days=day.weekday())
+
+
+def get_timesheet(caffe, start, end):
+    """Return worked minutes per employee, position and week.
+
+    Minutes are summed up per day by the database, and days are folded into
+    weeks, which start on Mondays.
+
+    Args:
+        caffe (Caffe): Caffe which timesheet is returned.
+        start (date): First day of the timesheet.
+        end (date): First day after the timesheet.
+
+    Returns:
+        List of dictionaries with `employee`, `position`, `minutes`, `shifts`
+        and `weeks`, which maps Mondays to minutes.
+    """
+
+    days = summarize(
+        filter_worked_hours(caffe.id, start, end),
+        'employee', 'position', 'date'
+    )
+
+    rows = {}
+    for day in days:
+        key = (day['employee'], day['position'])
+        if key not in rows:
+            rows[key] = {
+                'employee': day['employee'],
+                'position': day['position'],
+                'minutes': 0,
+                'shifts': 0,
+                'weeks': {}
+            }
+
+        row = rows[key]
+        row['minutes'] += day['minutes']
+        row['shifts'] += day['shifts']
+
+        monday = week_start(day['date'])
+        row['weeks'][monday] = row['weeks'].get(monday, 0) + day['minutes']
+
+    return list(rows.values())
+
+
+def month_rows(caffe_id=None, start=None, end=None):
+    """Compute MonthlyTimesheets from WorkedHours."""
+
+    worked_hours = filter_worked_hours(caffe_id, start, end).annotate(
+        month=Date('date', 'month')
+    )
+
+    rows = summarize(worked_hours, 'caffe', 'month', 'employee', 'position')
+    for row in rows.iterator():
+        yield MonthlyTimesheet(
+            caffe_id=row['caffe'],
+            date=row['month'],
+            employee_id=row['employee'],
+            position_id=row['position'],
+            minutes=row['minutes'],
+            shifts=row['shifts']
+        )
+
+
+def refresh_timesheets(caffe_id=None, start=None, end=None):
+    """Replace MonthlyTimesheets with the computed ones.
+
+    Args:
+        caffe_id (Optional(int)): Id of Caffe, all Caffes when not given.
+        start (Optional(date)): First day of the first refreshed month, whole
+            history when not given.
+        end (Optional(date)): First day after the last refreshed month.
+    """
+
+    stored = MonthlyTimesheet.objects.all()
+    if caffe_id is not None:
+        stored = stored.filter(caffe_id=caffe_id)
+
+    if start is not None:
+        stored = stored.filter(date__gte=start, date__lt=end)
+
+    with transaction.atomic():
+        stored.delete()
+        MonthlyTimesheet.objects.bulk_create(
+            list(month_rows(caffe_id, start, end))
+        )
+
+
+def is_materialized():
+    """Check if monthly totals are materialized in MonthlyTimesheets."""
+
+    return getattr(settings, 'TIMESHEETS_MATERIALIZED', True)
+
+
+def get_payroll(caffe, year, month):
+    """Return minutes worked in a month per employee and position.
+
+    Args:
+        caffe (Caffe): Caffe which payroll is returned.
+        year (int): Year of the month.
+        month (int): Number of the month, starting from 1.
+
+    Returns:
+        List of dictionaries with `employee`, `first_name`, `last_name`,
+        `position`, `minutes` and `shifts`.
+
+    Raises:
+        ValueError: Month does not exist.
+    """
+
+    start, end = month_bounds(year, month)
+    # pairs of returned name and path, in order in which rows are sorted
+    names = (
+        ('last_name', 'employee__last_name'),
+        ('first_name', 'employee__first_name'),
+        ('position_name', 'position__name'),
+    )
+    paths = [path for _, path in names]
+
+    if is_materialized():
+        rows = MonthlyTimesheet.objects.filter(caffe=caffe, date=start).values(
+            'employee', 'position', 'minutes', 'shifts', *paths
+        ).order_by(*paths)
+    else:
+        rows = summarize(
+            filter_worked_hours(caffe.id, start, end),
+            'employee', 'position', *paths
+        ).order_by(*paths)
+
+    payroll = []
+    for row in rows:
+        for name, path in names:
+            row[name] = row.pop(path)
+
+        payroll.append(row)
+
+    return payroll
+
+
+def worked_hours_changing(sender, instance, **kwargs):
+    """Remember month of WorkedHours before they are changed."""
+
+    instance._timesheet_previous = None
+    if instance.pk:
+        instance._timesheet_previous = WorkedHours.objects.filter(
+            pk=instance.pk
+        ).values_list('caffe_id', 'date').first()
+
+
+def worked_hours_changed(sender, instance, **kwargs):
+    """Refresh MonthlyTimesheets of the month of changed WorkedHours.
+
+    When the month or Caffe of WorkedHours has changed, the previous month is
+    refreshed too.
+    """
+
+    if not is_materialized():
+        return
+
+    days = {(instance.caffe_id, instance.date)}
+
+    previous = getattr(instance, '_timesheet_previous', None)
+    if previous:
+        days.add(previous)
+
+    months = {
+        (caffe_id, month_bounds(day.year, day.month))
+        for caffe_id, day in days if caffe_id
+    }
+    for caffe_id, (start, end) in months:
+        refresh_timesheets(caffe_id, start, end)
+
+
+def worked_hours_written(sender, caffe, days, **kwargs):
+    """Refresh MonthlyTimesheets of range of months of WorkedHours written in
+    bulk.
+    """
+
+    if not is_materialized():
+        return
+
+    if days:
+        first, last = min(days), max(days)
+        refresh_timesheets(
+            caffe.id,
+            month_bounds(first.year, first.month)[0],
+            month_bounds(last.year, last.month)[1]
+        )
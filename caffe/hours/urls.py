@@ -2,12 +2,15 @@ from django.conf.urls import url
 from django.contrib import admin
 
 from .views import (hours_edit_position, hours_edit_worked_hours,
-                    hours_new_position, hours_new_worked_hours)
+                    hours_export, hours_import_schedule, hours_new_position,
+                    hours_new_worked_hours, hours_payroll)
 
 urlpatterns = [
     url(r'^admin/', admin.site.urls),
 
     url(r'^new/$', hours_new_worked_hours, name='new'),
+    url(r'^import/$', hours_import_schedule, name='import'),
+    url(r'^export/$', hours_export, name='export'),
     url(
         r'^edit/(?P<hours_pk>\d{0,17})/$',
         hours_edit_worked_hours,
@@ -20,4 +23,10 @@ urlpatterns = [
         hours_edit_position,
         name='edit_position'
     ),
+
+    url(
+        r'^payroll/(?P<year>[0-9]{4})/(?P<month>[0-9]{1,2})/$',
+        hours_payroll,
+        name='payroll'
+    ),
 ]
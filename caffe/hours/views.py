@@ -2,12 +2,20 @@
 
 from django.contrib import messages
 from django.contrib.auth.decorators import permission_required
+from django.core.exceptions import ValidationError
 from django.core.urlresolvers import reverse
-from django.http import Http404
+from django.http import Http404, HttpResponseBadRequest
 from django.shortcuts import get_object_or_404, redirect, render
 
-from .forms import PositionForm, WorkedHoursForm
+from caffe.exports import csv_response
+from caffe.forms import ExportForm
+from caffe.imports import get_format
+
+from .export import HEADER, export_worked_hours
+from .forms import PositionForm, ScheduleForm, WorkedHoursForm
 from .models import Position, WorkedHours
+from .schedule import import_schedule, read_schedule
+from .timesheets import get_payroll
 
 
 @permission_required('hours.change_position')
@@ -96,6 +104,38 @@ def hours_new_worked_hours(request):
     })
 
 
+@permission_required(['hours.add_workedhours',
+                      'hours.change_all_workedhours'])
+def hours_import_schedule(request):
+    """Create WorkedHours of many employees from uploaded schedule."""
+
+    form = ScheduleForm(request.POST or None, request.FILES or None)
+
+    if form.is_valid():
+        schedule = form.cleaned_data['schedule']
+
+        try:
+            rows = read_schedule(schedule, get_format(schedule.name))
+            shifts = import_schedule(request.user.caffe, rows)
+        except ValidationError as error:
+            form.add_error('schedule', error)
+        else:
+            messages.success(
+                request,
+                u'Grafik został poprawnie dodany ({} zmian).'.format(
+                    len(shifts)
+                )
+            )
+
+            return redirect(reverse('home:navigate'))
+
+    return render(request, 'hours/import.html', {
+        'form': form,
+        'title': u'Import grafiku',
+        'button': u'Importuj'
+    })
+
+
 @permission_required('hours.change_workedhours')
 def hours_edit_worked_hours(request, hours_pk):
     """Edit WorkedHours with pk.
@@ -135,3 +175,42 @@ def hours_edit_worked_hours(request, hours_pk):
         'title': u'Edytuj przepracowane godziny',
         'button': u'Uaktualnij'
     })
+
+
+@permission_required(['hours.view_workedhours',
+                      'hours.change_all_workedhours'])
+def hours_payroll(request, year, month):
+    """Show minutes worked in a month by all employees of the caffe.
+
+    Args:
+        year (str): Year of the month.
+        month (str): Number of the month.
+    """
+
+    try:
+        payroll = get_payroll(request.user.caffe, int(year), int(month))
+    except ValueError:
+        raise Http404(u'Taki miesiąc nie istnieje.')
+
+    return render(request, 'hours/payroll.html', {
+        'payroll': payroll,
+        'total': sum(row['minutes'] for row in payroll),
+        'title': u'Godziny pracy {}/{}'.format(month, year)
+    })
+
+
+@permission_required(['hours.view_workedhours',
+                      'hours.change_all_workedhours'])
+def hours_export(request):
+    """Stream WorkedHours of all employees from given range of days as CSV."""
+
+    form = ExportForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(u'Niepoprawny zakres dni.')
+
+    start = form.cleaned_data['start']
+    end = form.cleaned_data['end']
+    return csv_response(
+        'godziny', start, end, HEADER,
+        export_worked_hours(request.user.caffe, start, end)
+    )
@@ -0,0 +1,74 @@
+"""Module responsible for alerts about products which should be reordered.
+
+Product should be reordered when its latest stock level is not above its
+threshold. Alerts are evaluated only for products counted in a written
+report, with one query for all of them, and stored as StockAlerts, so the
+dashboard does not compute stock state on every view.
+"""
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Product, StockAlert
+
+
+def evaluate_alerts(condition):
+    """Replace alerts of products with ones computed from their stock.
+
+    Args:
+        condition (Q): Condition which selects evaluated Products.
+    """
+
+    rows = Product.objects.filter(condition).distinct().values_list(
+        'id', 'threshold', 'stock__report_id', 'stock__caffe_id',
+        'stock__counted_on', 'stock__amount'
+    )
+
+    product_ids = []
+    alerts = []
+    for product_id, threshold, report_id, caffe_id, counted_on, amount in \
+            rows:
+        product_ids.append(product_id)
+
+        if threshold is None or amount is None or amount > threshold:
+            continue
+
+        alerts.append(StockAlert(
+            product_id=product_id,
+            report_id=report_id,
+            caffe_id=caffe_id,
+            counted_on=counted_on,
+            amount=amount,
+            threshold=threshold
+        ))
+
+    if not product_ids:
+        return
+
+    with transaction.atomic():
+        StockAlert.objects.filter(product_id__in=product_ids).delete()
+        StockAlert.objects.bulk_create(alerts)
+
+
+def report_written(sender, report, **kwargs):
+    """Evaluate alerts of products counted in written Report.
+
+    Alerts raised by the Report are also evaluated, because its products
+    could have been removed from it.
+    """
+
+    evaluate_alerts(Q(fullproduct__report=report) | Q(alert__report=report))
+
+
+def report_deleted(sender, instance, **kwargs):
+    """Evaluate alerts of products counted in deleted Report."""
+
+    product_ids = getattr(instance, '_stock_product_ids', [])
+    if product_ids:
+        evaluate_alerts(Q(id__in=product_ids))
+
+
+def product_saved(sender, instance, **kwargs):
+    """Evaluate alert of Product, as its threshold could have changed."""
+
+    evaluate_alerts(Q(id=instance.id))
@@ -1,5 +1,38 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_delete
 
 
 class ReportsConfig(AppConfig):
     name = 'reports'
+
+    def ready(self):
+        """Connect signals which invalidate catalog of products and which
+        keep stock time series of products, their alerts and forecasts up to
+        date.
+        """
+
+        from . import alerts, forecast, stock
+        from .catalog import caffe_created, catalog_changed
+        from .signals import report_written
+
+        for model in ['Product', 'Category', 'Unit']:
+            sender = self.get_model(model)
+            post_save.connect(catalog_changed, sender=sender)
+            post_delete.connect(catalog_changed, sender=sender)
+
+        post_save.connect(caffe_created, sender='caffe.Caffe')
+
+        # alerts and forecasts are computed from stock, so they are
+        # connected after it
+        report_written.connect(stock.report_written)
+        report_written.connect(alerts.report_written)
+        report_written.connect(forecast.report_written)
+
+        report = self.get_model('Report')
+        pre_delete.connect(stock.report_deleting, sender=report)
+        post_delete.connect(stock.report_deleted, sender=report)
+        post_delete.connect(alerts.report_deleted, sender=report)
+        post_delete.connect(forecast.report_deleted, sender=report)
+
+        product = self.get_model('Product')
+        post_save.connect(alerts.product_saved, sender=product)
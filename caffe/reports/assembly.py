@@ -0,0 +1,73 @@
+"""Module responsible for assembling Reports before they are displayed.
+
+Report is shown as a tree: categories with products (name, amount, unit).
+Building that tree by following FullProduct -> Product -> Category/Unit
+relations one by one costs a few queries per product, so all the data needed
+for the tree is fetched with one query, no matter how many Reports and
+products are displayed.
+"""
+
+from .models import FullProduct
+
+
+def get_reports_categories(reports):
+    """Return all categories with products for each of given Reports.
+
+    Args:
+        reports (Iterable(Report)): Reports which we want to display.
+
+    Returns:
+        Dictionary which maps id of each Report to its categories with
+        products. Report without products is mapped to empty dictionary.
+    """
+
+    all_reports = {report.id: {} for report in reports}
+    if not all_reports:
+        return all_reports
+
+    full_products = FullProduct.objects.filter(
+        report__in=list(all_reports)
+    ).order_by('id').values_list(
+        'report_id',
+        'amount',
+        'product__name',
+        'product__unit__name',
+        'product__category__name'
+    )
+
+    for report_id, amount, name, unit, category in full_products:
+        all_categories = all_reports[report_id]
+
+        # add product to specific category
+        if category not in all_categories:
+            all_categories[category] = []
+
+        all_categories[category].append({
+            'name': name,
+            'amount': amount,
+            'unit': unit
+        })
+
+    return all_reports
+
+
+def attach_reports_categories(reports):
+    """Assign categories with products to each of given Reports.
+
+    Categories are available as `categories` attribute of each Report, so
+    they can be easily displayed in templates.
+
+    Args:
+        reports (Iterable(Report)): Reports which we want to display.
+
+    Returns:
+        List of given Reports.
+    """
+
+    reports = list(reports)
+    all_reports = get_reports_categories(reports)
+
+    for report in reports:
+        report.categories = all_reports[report.id]
+
+    return reports
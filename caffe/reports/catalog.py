@@ -0,0 +1,97 @@
+"""Module responsible for catalog of products used in report forms.
+
+Catalog contains all products of Caffe with their units and categories,
+already serialized. It is cached per Caffe and invalidated whenever Product,
+Category or Unit of that Caffe is saved or deleted.
+"""
+
+import json
+
+from caffe.cache import bump_version, get_or_set
+
+from .models import Product
+
+CATALOG_NAMESPACE = 'reports.catalog'
+CATALOG_TIMEOUT = 60 * 60 * 24
+
+
+def build_catalog(caffe):
+    """Return catalog of products for given Caffe, omitting the cache.
+
+    Args:
+        caffe (Caffe): Caffe which products are in the catalog.
+
+    Returns:
+        Dictionary with list of serialized products (`products`) and the same
+        list dumped to JSON (`json`).
+    """
+
+    products = Product.objects.filter(caffe=caffe).select_related(
+        'unit', 'category'
+    ).all()
+
+    all_products = []
+    for product in products:
+        all_products.append({
+            'id': product.id,
+            'name': product.name,
+            'unit': product.unit.name,
+            'category': {
+                'id': product.category.id,
+                'name': product.category.name
+            },
+            'selected': False,
+            'amount': '',
+            'errors': {}
+        })
+
+    return {
+        'products': all_products,
+        'json': json.dumps(all_products)
+    }
+
+
+def get_catalog(caffe):
+    """Return catalog of products for given Caffe.
+
+    Catalog is returned from the cache, so it can be freely changed by the
+    caller.
+
+    Args:
+        caffe (Caffe): Caffe which products are in the catalog.
+
+    Returns:
+        Dictionary with list of serialized products (`products`) and the same
+        list dumped to JSON (`json`).
+    """
+
+    return get_or_set(
+        CATALOG_NAMESPACE,
+        caffe.id if caffe else None,
+        [],
+        lambda: build_catalog(caffe),
+        CATALOG_TIMEOUT
+    )
+
+
+def invalidate_catalog(caffe_id):
+    """Invalidate catalog of products for Caffe with given id."""
+
+    bump_version(CATALOG_NAMESPACE, caffe_id)
+
+
+def catalog_changed(sender, instance, **kwargs):
+    """Invalidate catalog when Product, Category or Unit has changed."""
+
+    invalidate_catalog(instance.caffe_id)
+
+
+def caffe_created(sender, instance, created, **kwargs):
+    """Invalidate catalog of new Caffe.
+
+    New Caffe can get id of removed one, so the catalog of removed Caffe can
+    not be returned.
+    """
+
+    if created:
+        invalidate_catalog(instance.id)
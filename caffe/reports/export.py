@@ -0,0 +1,52 @@
+"""Module responsible for exporting Reports with their products to CSV.
+
+Reports are read in chunks by primary key and FullProducts of every chunk
+are read with one more query, so the number of queries grows with the number
+of chunks, not with the number of Reports.
+"""
+
+from caffe.exports import filter_range, format_datetime, keyset_chunks
+
+from .models import FullProduct, Report
+
+HEADER = (
+    'report', 'created_on', 'creator', 'category', 'product', 'unit',
+    'amount'
+)
+
+
+def export_reports(caffe, start, end):
+    """Yield CSV rows of Reports of Caffe, one row per FullProduct.
+
+    Reports without products are written as one row with empty product
+    columns.
+
+    Args:
+        caffe (Caffe): Caffe which Reports are exported.
+        start (date): First day of the export.
+        end (date): Last day of the export.
+
+    Yields:
+        Tuples with values of columns given by HEADER.
+    """
+
+    reports = filter_range(
+        Report.objects.filter(caffe=caffe), 'created_on', start, end
+    )
+
+    for chunk in keyset_chunks(reports, ('created_on', 'creator__username')):
+        products = FullProduct.objects.filter(
+            report_id__in=[report[0] for report in chunk]
+        ).order_by('report_id', 'product__category__name', 'product__name')
+
+        report_products = {}
+        for report_id, *product in products.values_list(
+            'report_id', 'product__category__name', 'product__name',
+            'product__unit__name', 'amount'
+        ):
+            report_products.setdefault(report_id, []).append(product)
+
+        for report_id, created_on, creator in chunk:
+            report = (report_id, format_datetime(created_on), creator)
+            for product in report_products.get(report_id, [('',) * 4]):
+                yield report + tuple(product)
@@ -0,0 +1,171 @@
+"""Module responsible for forecasts of consumption of products.
+
+Forecast of a product is based on consumption rates of its stock time series
+(see `reports.stock`). The latest rates are smoothed exponentially, so the
+newest rates weigh the most, which gives the predicted rate. From the rate
+and the latest stock level, the time when the product runs out and the
+amount which should be ordered are predicted.
+
+Forecasts of all products of a Caffe are computed together with NumPy
+arrays, without a loop per product, and stored as ProductForecasts.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from caffe.line_items import BATCH_SIZE, batches
+
+from .models import ProductForecast, ProductStock, StockLevel
+from .stock import SECONDS_IN_DAY, SMOOTHING
+
+# number of the latest rates of a product used by forecast
+WINDOW = 30
+# only rates from this number of last days are used by forecast
+HISTORY_DAYS = 90
+# number of days for which ordered amount should be enough
+ORDER_DAYS = 7
+# products which run out later than in this number of days are not predicted
+HORIZON_DAYS = 365
+
+
+def smooth_rates(product_ids, rates):
+    """Compute exponentially smoothed rate for every product.
+
+    Args:
+        product_ids (ndarray): Ids of products of rates, grouped by product,
+            with the newest rates first in every group.
+        rates (ndarray): Consumption rates.
+
+    Returns:
+        Sorted ids of products and their smoothed rates.
+    """
+
+    ids, starts, inverse = np.unique(
+        product_ids, return_index=True, return_inverse=True
+    )
+
+    # position of rate in its group: 0 for the newest one
+    positions = np.arange(len(rates)) - starts[inverse]
+    weights = np.where(
+        positions < WINDOW,
+        (1 - SMOOTHING) ** positions,
+        0.0
+    )
+
+    smoothed = (
+        np.bincount(inverse, weights * rates, len(ids)) /
+        np.bincount(inverse, weights, len(ids))
+    )
+    return ids, smoothed
+
+
+def compute_forecasts(caffe_id, now=None):
+    """Compute forecasts of all products of Caffe.
+
+    Args:
+        caffe_id (int): Id of Caffe.
+        now (Optional(datetime)): Time of the forecast, current time when
+            not given.
+
+    Returns:
+        List of not saved ProductForecasts.
+    """
+
+    if now is None:
+        now = timezone.now()
+
+    stocks = list(ProductStock.objects.filter(caffe_id=caffe_id).values_list(
+        'product_id', 'counted_on', 'amount', 'product__threshold'
+    ))
+    if not stocks:
+        return []
+
+    levels = StockLevel.objects.filter(
+        caffe_id=caffe_id,
+        counted_on__gte=now - timedelta(days=HISTORY_DAYS),
+        rate__isnull=False
+    ).order_by('product_id', '-counted_on', '-report_id')
+    levels = np.array(
+        list(levels.values_list('product_id', 'rate')),
+        dtype=float
+    ).reshape(-1, 2)
+
+    product_ids = np.array([stock[0] for stock in stocks])
+    counted_on = [stock[1] for stock in stocks]
+    amounts = np.array([stock[2] for stock in stocks], dtype=float)
+    thresholds = np.array(
+        [stock[3] or 0 for stock in stocks], dtype=float
+    )
+
+    # products without known consumption get NaN rates
+    rates = np.full(len(stocks), np.nan)
+    if len(levels):
+        ids, smoothed = smooth_rates(levels[:, 0].astype(int), levels[:, 1])
+        positions = np.searchsorted(ids, product_ids)
+        positions = np.minimum(positions, len(ids) - 1)
+        found = ids[positions] == product_ids
+        rates[found] = smoothed[positions[found]]
+
+    elapsed = np.array([
+        (now - value).total_seconds() / SECONDS_IN_DAY for value in counted_on
+    ])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days_left = np.where(rates > 0, amounts / rates, np.inf)
+
+    needed = rates * (elapsed + ORDER_DAYS) + thresholds - amounts
+    order_amounts = np.where(np.isnan(needed), 0.0, np.maximum(needed, 0.0))
+
+    forecasts = []
+    for i, product_id in enumerate(product_ids.tolist()):
+        runs_out_on = None
+        if days_left[i] <= HORIZON_DAYS:
+            try:
+                runs_out_on = counted_on[i] + timedelta(days=days_left[i])
+            except OverflowError:
+                pass
+
+        forecasts.append(ProductForecast(
+            product_id=product_id,
+            caffe_id=caffe_id,
+            rate=None if np.isnan(rates[i]) else float(rates[i]),
+            runs_out_on=runs_out_on,
+            order_amount=float(order_amounts[i]),
+            computed_on=now
+        ))
+
+    return forecasts
+
+
+def refresh_forecasts(caffe_id, now=None):
+    """Replace stored forecasts of Caffe with the computed ones.
+
+    Args:
+        caffe_id (int): Id of Caffe.
+        now (Optional(datetime)): Time of the forecast, current time when
+            not given.
+    """
+
+    forecasts = compute_forecasts(caffe_id, now)
+
+    with transaction.atomic():
+        ProductForecast.objects.filter(caffe_id=caffe_id).delete()
+
+        for batch in batches(forecasts, BATCH_SIZE):
+            ProductForecast.objects.bulk_create(batch)
+
+
+def report_written(sender, report, **kwargs):
+    """Refresh forecasts of Caffe of written Report."""
+
+    if report.caffe_id:
+        refresh_forecasts(report.caffe_id)
+
+
+def report_deleted(sender, instance, **kwargs):
+    """Refresh forecasts of Caffe of deleted Report."""
+
+    report_written(sender, instance)
@@ -12,7 +12,7 @@ class ProductForm(forms.ModelForm):
 
     class Meta:
         model = Product
-        fields = ('name', 'category', 'unit',)
+        fields = ('name', 'category', 'unit', 'threshold',)
 
     def __init__(self, *args, **kwargs):
         """Initialize all Product's fields."""
@@ -24,6 +24,7 @@ class ProductForm(forms.ModelForm):
         self.fields['name'].label = 'Nazwa'
         self.fields['category'].label = 'Kategoria'
         self.fields['unit'].label = 'Jednostka'
+        self.fields['threshold'].label = 'Próg zamówienia'
         self.fields['category'].empty_label = None
         self.fields['unit'].empty_label = None
         self.fields['category'].queryset =\
@@ -0,0 +1,23 @@
+"""Command which rebuilds stock time series of products from the history."""
+
+from django.core.management.base import BaseCommand
+
+from reports.stock import rebuild_stock
+
+
+class Command(BaseCommand):
+    """Rebuild stock time series of products."""
+
+    help = 'Rebuild stock levels of products from the whole history.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--caffe',
+            type=int,
+            default=None,
+            help='Id of caffe which stock is rebuilt, all when not given.'
+        )
+
+    def handle(self, *args, **options):
+        rebuild_stock(options['caffe'])
+        self.stdout.write('Stock levels have been rebuilt.')
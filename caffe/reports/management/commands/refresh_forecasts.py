@@ -0,0 +1,31 @@
+"""Command which computes forecasts of consumption of products."""
+
+from django.core.management.base import BaseCommand
+
+from caffe.models import Caffe
+from reports.forecast import refresh_forecasts
+
+
+class Command(BaseCommand):
+    """Refresh forecasts of products."""
+
+    help = 'Compute forecasts of consumption of products again.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--caffe',
+            type=int,
+            default=None,
+            help='Id of caffe which forecasts are computed, all when not '
+                 'given.'
+        )
+
+    def handle(self, *args, **options):
+        caffe_ids = [options['caffe']]
+        if options['caffe'] is None:
+            caffe_ids = Caffe.objects.values_list('id', flat=True)
+
+        for caffe_id in caffe_ids:
+            refresh_forecasts(caffe_id)
+
+        self.stdout.write('Forecasts have been refreshed.')
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.4 on 2026-10-18 10:55
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0010_auto_20160619_1702'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='report',
+            index_together=set([('caffe', 'created_on')]),
+        ),
+    ]
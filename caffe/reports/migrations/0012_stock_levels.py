@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.4 on 2026-10-18 11:05
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caffe', '0006_auto_20160621_0051'),
+        ('reports', '0011_reports_date_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductStock',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stock', serialize=False, to='reports.Product')),
+                ('counted_on', models.DateTimeField()),
+                ('amount', models.FloatField()),
+                ('average_rate', models.FloatField(blank=True, null=True)),
+                ('caffe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='caffe.Caffe')),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reports.Report')),
+            ],
+            options={
+                'default_permissions': (),
+            },
+        ),
+        migrations.CreateModel(
+            name='StockLevel',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('counted_on', models.DateTimeField()),
+                ('amount', models.FloatField()),
+                ('consumed', models.FloatField(blank=True, null=True)),
+                ('rate', models.FloatField(blank=True, null=True)),
+                ('average_rate', models.FloatField(blank=True, null=True)),
+                ('caffe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='caffe.Caffe')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reports.Product')),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_levels', to='reports.Report')),
+            ],
+            options={
+                'ordering': ('counted_on', 'report'),
+                'default_permissions': (),
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='stocklevel',
+            unique_together=set([('product', 'report')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='stocklevel',
+            index_together=set([('product', 'counted_on')]),
+        ),
+    ]
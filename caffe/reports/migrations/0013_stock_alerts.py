@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.4 on 2026-10-18 11:10
+from __future__ import unicode_literals
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caffe', '0006_auto_20160621_0051'),
+        ('reports', '0012_stock_levels'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockAlert',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='alert', serialize=False, to='reports.Product')),
+                ('counted_on', models.DateTimeField()),
+                ('amount', models.FloatField()),
+                ('threshold', models.FloatField()),
+                ('caffe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='caffe.Caffe')),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reports.Report')),
+            ],
+            options={
+                'ordering': ('-counted_on', 'product'),
+                'default_permissions': (),
+            },
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='threshold',
+            field=models.FloatField(blank=True, default=None, null=True, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.AlterIndexTogether(
+            name='stockalert',
+            index_together=set([('caffe', 'counted_on')]),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.4 on 2026-10-18 11:13
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('caffe', '0006_auto_20160621_0051'),
+        ('reports', '0013_stock_alerts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductForecast',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='forecast', serialize=False, to='reports.Product')),
+                ('rate', models.FloatField(blank=True, null=True)),
+                ('runs_out_on', models.DateTimeField(blank=True, null=True)),
+                ('order_amount', models.FloatField(default=0)),
+                ('computed_on', models.DateTimeField()),
+                ('caffe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='caffe.Caffe')),
+            ],
+            options={
+                'ordering': ('product',),
+                'default_permissions': (),
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='stocklevel',
+            index_together=set([('product', 'counted_on'), ('caffe', 'counted_on')]),
+        ),
+    ]
@@ -5,6 +5,10 @@ Category: a class of products sharing common characteristics.
 Product: a single item in a cafe.
 Unit: a measure of products.
 FullProduct: a product with its quantity.
+StockLevel: amount of a product counted in one report, with consumption.
+ProductStock: latest stock level of a product.
+StockAlert: a product which stock has fallen to its reorder threshold.
+ProductForecast: predicted consumption of a product and amount to order.
 """
 
 from django.core.exceptions import ValidationError
@@ -38,6 +42,7 @@ class Report(models.Model):
     class Meta:
         ordering = ('-created_on',)
         default_permissions = ('add', 'change', 'delete', 'view')
+        index_together = (('caffe', 'created_on'),)
 
     def save(self, *args, **kwargs):
         """Save model into the database."""
@@ -121,11 +126,18 @@ class Product(models.Model):
 
     Intended to be created once and then to reuse it in future reports.
     Unit specifies how the amount of product is counted.
+    Product should be reordered when its stock falls to the threshold.
     """
 
     name = models.CharField(max_length=100)
     category = models.ForeignKey('Category', on_delete=models.CASCADE)
     unit = models.ForeignKey('Unit', on_delete=models.CASCADE)
+    threshold = models.FloatField(
+        null=True,
+        blank=True,
+        default=None,
+        validators=[MinValueValidator(0)]
+    )
     caffe = models.ForeignKey(
         'caffe.Caffe',
         null=True,
@@ -218,3 +230,128 @@ class FullProduct(models.Model):
             self.amount,
             self.product.unit
         )
+
+
+class StockLevel(models.Model):
+    """Stores amount of a product counted in one report.
+
+    Levels of one product ordered by time of counting make its stock time
+    series. Every level stores consumption since the previous count and
+    smoothed consumption rate, so the series can be continued from any
+    level without reading the ones before it.
+    """
+
+    product = models.ForeignKey('Product', on_delete=models.CASCADE)
+    report = models.ForeignKey(
+        'Report',
+        on_delete=models.CASCADE,
+        related_name='stock_levels'
+    )
+    caffe = models.ForeignKey('caffe.Caffe', on_delete=models.CASCADE)
+    counted_on = models.DateTimeField()
+    amount = models.FloatField()
+
+    # empty when it is the first count or the product has been restocked
+    consumed = models.FloatField(null=True, blank=True)
+    rate = models.FloatField(null=True, blank=True)
+    average_rate = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        ordering = ('counted_on', 'report')
+        unique_together = ('product', 'report')
+        index_together = (('product', 'counted_on'), ('caffe', 'counted_on'))
+        default_permissions = ()
+
+    def __str__(self):
+        return '{0}: {1:g} ({2:%Y-%m-%d %H:%M})'.format(
+            self.product_id,
+            self.amount,
+            self.counted_on
+        )
+
+
+class ProductStock(models.Model):
+    """Stores the latest stock level of a product.
+
+    It is the running state of the stock time series, which is continued
+    when a new report is written.
+    """
+
+    product = models.OneToOneField(
+        'Product',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stock'
+    )
+    report = models.ForeignKey('Report', on_delete=models.CASCADE)
+    caffe = models.ForeignKey('caffe.Caffe', on_delete=models.CASCADE)
+    counted_on = models.DateTimeField()
+    amount = models.FloatField()
+    average_rate = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        default_permissions = ()
+
+    def __str__(self):
+        return '{0}: {1:g}'.format(self.product_id, self.amount)
+
+
+class StockAlert(models.Model):
+    """Stores a product which latest stock level is not above its threshold.
+
+    Alerts are evaluated when reports are written, so they are only read by
+    the dashboard.
+    """
+
+    product = models.OneToOneField(
+        'Product',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='alert'
+    )
+    report = models.ForeignKey('Report', on_delete=models.CASCADE)
+    caffe = models.ForeignKey('caffe.Caffe', on_delete=models.CASCADE)
+    counted_on = models.DateTimeField()
+    amount = models.FloatField()
+    threshold = models.FloatField()
+
+    class Meta:
+        ordering = ('-counted_on', 'product')
+        index_together = (('caffe', 'counted_on'),)
+        default_permissions = ()
+
+    def __str__(self):
+        return '{0}: {1:g} <= {2:g}'.format(
+            self.product_id,
+            self.amount,
+            self.threshold
+        )
+
+
+class ProductForecast(models.Model):
+    """Stores predicted consumption of a product.
+
+    Forecasts of all products of a Caffe are computed together from their
+    stock time series and stored, so they are only read by the API.
+    """
+
+    product = models.OneToOneField(
+        'Product',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='forecast'
+    )
+    caffe = models.ForeignKey('caffe.Caffe', on_delete=models.CASCADE)
+
+    # empty when consumption of the product is not known yet
+    rate = models.FloatField(null=True, blank=True)
+    runs_out_on = models.DateTimeField(null=True, blank=True)
+    order_amount = models.FloatField(default=0)
+    computed_on = models.DateTimeField()
+
+    class Meta:
+        ordering = ('product',)
+        default_permissions = ()
+
+    def __str__(self):
+        return '{0}: {1:g}'.format(self.product_id, self.order_amount)
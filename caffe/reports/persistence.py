@@ -0,0 +1,114 @@
+"""Module responsible for writing Reports with their FullProducts.
+
+Saving every FullProduct on its own runs `full_clean` which scans all
+products already assigned to the Report, so saving big Report is quadratic
+in queries. Here all FullProducts are checked once in memory and then
+written in bulk, together with the Report, in one transaction. Bulk writes
+do not send `post_save`, so `report_written` is sent instead.
+"""
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.translation import ugettext_lazy as _
+
+from caffe.line_items import sync_line_items
+
+from .models import FullProduct, Report
+from .signals import report_written
+
+
+def check_full_products(caffe, full_products):
+    """Check if FullProducts can be assigned to one Report of given Caffe.
+
+    Args:
+        caffe (Caffe): Caffe of the Report.
+        full_products (List(FullProduct)): FullProducts with loaded products.
+
+    Raises:
+        ValidationError: Some product occurs twice or some FullProduct or its
+            product does not belong to the Caffe.
+    """
+
+    products = set()
+    for full_product in full_products:
+        if full_product.product_id in products:
+            raise ValidationError(
+                _('Report should not contain two same products.')
+            )
+
+        products.add(full_product.product_id)
+
+    caffes = set()
+    for full_product in full_products:
+        caffes.add(full_product.caffe_id)
+        caffes.add(full_product.product.caffe_id)
+
+    if caffes - {caffe.id if caffe else None}:
+        raise ValidationError(
+            _('Kawiarnia i kawiarnia produktu nie zgadza się.')
+        )
+
+
+def create_report(caffe, creator, full_products):
+    """Create new Report with given FullProducts.
+
+    Args:
+        caffe (Caffe): Caffe to which Report belongs.
+        creator (Employee): Employee who creates the Report.
+        full_products (List(FullProduct)): Not saved FullProducts.
+
+    Returns:
+        Created Report.
+
+    Raises:
+        ValidationError: FullProducts or Report are not valid.
+    """
+
+    check_full_products(caffe, full_products)
+
+    with transaction.atomic():
+        report = Report.objects.create(caffe=caffe, creator=creator)
+
+        for full_product in full_products:
+            full_product.report = report
+
+        FullProduct.objects.bulk_create(full_products)
+        report_written.send(sender=Report, report=report)
+
+    return report
+
+
+def update_report(report, full_products):
+    """Save Report and make its FullProducts equal to the given ones.
+
+    Only FullProducts which were added, removed or have different amount are
+    written to the database.
+
+    Args:
+        report (Report): Report which is updated.
+        full_products (List(FullProduct)): Not saved FullProducts.
+
+    Returns:
+        Updated Report.
+
+    Raises:
+        ValidationError: FullProducts or Report are not valid.
+    """
+
+    check_full_products(report.caffe, full_products)
+
+    with transaction.atomic():
+        report.save()
+
+        for full_product in full_products:
+            full_product.report = report
+
+        sync_line_items(
+            report.full_products.all(),
+            full_products,
+            'product_id',
+            ('amount',)
+        )
+        report_written.send(sender=Report, report=report)
+
+    return report
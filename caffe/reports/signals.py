@@ -0,0 +1,7 @@
+"""Signals sent by the reports app."""
+
+from django.dispatch import Signal
+
+# Sent when Report has been created or edited together with its
+# FullProducts, which are written in bulk and do not send `post_save`.
+report_written = Signal(providing_args=['report'])
@@ -0,0 +1,265 @@
+"""Module responsible for stock time series of products.
+
+Every FullProduct of a Report is a count of the product, so FullProducts of
+one product ordered by time of their reports make its stock time series.
+Series are stored as StockLevels, each with consumption since the previous
+count, consumption rate per day and smoothed rate.
+
+Series are continued from the running state of products (ProductStock), so
+writing the latest report costs the same regardless of the length of the
+history. When an older report is written or deleted, only levels of its
+products counted since that report are computed again.
+"""
+
+import operator
+from functools import reduce
+
+from django.db import transaction
+from django.db.models import Max, Q
+
+from caffe.dates import local_midnight
+from caffe.line_items import BATCH_SIZE, batches
+
+from .models import FullProduct, ProductStock, StockLevel
+
+# weight of the newest rate in the smoothed consumption rate
+SMOOTHING = 0.3
+SECONDS_IN_DAY = 60 * 60 * 24
+
+
+def next_level(previous, product_id, report_id, caffe_id, counted_on, amount):
+    """Return stock level which follows the previous one.
+
+    Args:
+        previous (Optional(StockLevel or ProductStock)): Previous level of
+            the product, None when it is the first count.
+        product_id (int): Id of counted Product.
+        report_id (int): Id of Report in which product has been counted.
+        caffe_id (int): Id of Caffe of the Report.
+        counted_on (datetime): Time of creation of the Report.
+        amount (float): Counted amount.
+
+    Returns:
+        Not saved StockLevel.
+    """
+
+    level = StockLevel(
+        product_id=product_id,
+        report_id=report_id,
+        caffe_id=caffe_id,
+        counted_on=counted_on,
+        amount=amount
+    )
+
+    if previous is None:
+        return level
+
+    level.average_rate = previous.average_rate
+
+    # when amount has grown the product has been restocked and it is not
+    # known how much has been consumed
+    if amount <= previous.amount:
+        level.consumed = previous.amount - amount
+
+    days = (counted_on - previous.counted_on).total_seconds() / SECONDS_IN_DAY
+    if level.consumed is not None and days > 0:
+        level.rate = level.consumed / days
+
+        if level.average_rate is None:
+            level.average_rate = level.rate
+        else:
+            level.average_rate = (
+                SMOOTHING * level.rate +
+                (1 - SMOOTHING) * level.average_rate
+            )
+
+    return level
+
+
+def get_previous_levels(product_ids, since):
+    """Return the latest stock levels counted before given time.
+
+    Running states of products are used when they are older than the time,
+    which is the case when the latest report is written. Otherwise levels are
+    looked up in the index of levels of products, with the same number of
+    queries for any number of products.
+
+    Args:
+        product_ids (List(int)): Ids of Products.
+        since (datetime): Time before which levels were counted.
+
+    Returns:
+        Dictionary with StockLevel or ProductStock for ids of products which
+        were counted before the time.
+    """
+
+    previous = {}
+    missing = []
+    stocks = ProductStock.objects.in_bulk(product_ids)
+    for product_id in product_ids:
+        stock = stocks.get(product_id)
+        if stock is not None and stock.counted_on < since:
+            previous[product_id] = stock
+        else:
+            missing.append(product_id)
+
+    if not missing:
+        return previous
+
+    latest = StockLevel.objects.filter(
+        product_id__in=missing,
+        counted_on__lt=since
+    ).order_by().values_list('product_id').annotate(Max('counted_on'))
+
+    conditions = [
+        Q(product_id=product_id, counted_on=counted_on)
+        for product_id, counted_on in latest
+    ]
+    if not conditions:
+        return previous
+
+    # levels counted at the same time are ordered by their reports
+    levels = StockLevel.objects.filter(reduce(operator.or_, conditions))
+    for level in levels.order_by('counted_on', 'report_id'):
+        previous[level.product_id] = level
+
+    return previous
+
+
+def replay(product_ids, since=None):
+    """Compute stock levels of products again, starting at given time.
+
+    Args:
+        product_ids (Iterable(int)): Ids of Products.
+        since (Optional(datetime)): Time since which levels are computed
+            again, the whole history when not given.
+    """
+
+    for batch in batches(product_ids, BATCH_SIZE):
+        with transaction.atomic():
+            replay_batch(batch, since)
+
+
+def replay_batch(product_ids, since):
+    """Compute stock levels of at most BATCH_SIZE products again."""
+
+    previous = {}
+    levels = StockLevel.objects.filter(product_id__in=product_ids)
+    full_products = FullProduct.objects.filter(
+        product_id__in=product_ids,
+        report__caffe__isnull=False
+    )
+
+    if since is not None:
+        previous = get_previous_levels(product_ids, since)
+        levels = levels.filter(counted_on__gte=since)
+        full_products = full_products.filter(report__created_on__gte=since)
+
+    levels.delete()
+
+    rows = full_products.order_by('report__created_on', 'report_id')
+    rows = rows.values_list(
+        'product_id', 'report_id', 'report__caffe_id',
+        'report__created_on', 'amount'
+    )
+
+    def compute():
+        for product_id, report_id, caffe_id, counted_on, amount in \
+                rows.iterator():
+            level = next_level(
+                previous.get(product_id),
+                product_id, report_id, caffe_id, counted_on, amount
+            )
+            previous[product_id] = level
+            yield level
+
+    for batch in batches(compute(), BATCH_SIZE):
+        StockLevel.objects.bulk_create(batch)
+
+    # the last levels become running states of products
+    ProductStock.objects.filter(product_id__in=product_ids).delete()
+    ProductStock.objects.bulk_create([
+        ProductStock(
+            product_id=level.product_id,
+            report_id=level.report_id,
+            caffe_id=level.caffe_id,
+            counted_on=level.counted_on,
+            amount=level.amount,
+            average_rate=level.average_rate
+        ) for level in previous.values()
+    ])
+
+
+def get_stock_series(product, start=None, end=None):
+    """Return stock time series of product.
+
+    Args:
+        product (Product): Product which levels are returned.
+        start (Optional(date)): First local day of the series.
+        end (Optional(date)): First local day after the series.
+
+    Returns:
+        QuerySet of StockLevels ordered by time of counting.
+    """
+
+    levels = StockLevel.objects.filter(product=product)
+    if start is not None:
+        levels = levels.filter(counted_on__gte=local_midnight(start))
+
+    if end is not None:
+        levels = levels.filter(counted_on__lt=local_midnight(end))
+
+    return levels.order_by('counted_on', 'report_id')
+
+
+def rebuild_stock(caffe_id=None):
+    """Compute stock time series of all products from the whole history.
+
+    Args:
+        caffe_id (Optional(int)): Id of Caffe, all Caffes when not given.
+    """
+
+    products = FullProduct.objects.filter(report__caffe__isnull=False)
+    if caffe_id is not None:
+        products = products.filter(report__caffe_id=caffe_id)
+
+    stocks = ProductStock.objects.all()
+    if caffe_id is not None:
+        stocks = stocks.filter(caffe_id=caffe_id)
+
+    product_ids = set(products.values_list('product_id', flat=True))
+    product_ids |= set(stocks.values_list('product_id', flat=True))
+
+    replay(sorted(product_ids))
+
+
+def report_written(sender, report, **kwargs):
+    """Continue series of products counted in written Report.
+
+    Products removed from the Report are also computed again.
+    """
+
+    product_ids = set(report.full_products.order_by().values_list(
+        'product_id', flat=True
+    ))
+    product_ids |= set(report.stock_levels.order_by().values_list(
+        'product_id', flat=True
+    ))
+
+    replay(sorted(product_ids), report.created_on)
+
+
+def report_deleting(sender, instance, **kwargs):
+    """Remember products counted in Report which is being deleted."""
+
+    instance._stock_product_ids = sorted(
+        instance.stock_levels.order_by().values_list('product_id', flat=True)
+    )
+
+
+def report_deleted(sender, instance, **kwargs):
+    """Compute series of products counted in deleted Report again."""
+
+    product_ids = getattr(instance, '_stock_product_ids', [])
+    if product_ids:
+        replay(product_ids, instance.created_on)
@@ -0,0 +1,136 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103,R0902
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from caffe.models import Caffe
+from employees.models import Employee
+
+from .models import Category, FullProduct, Product, StockAlert, Unit
+from .persistence import create_report, update_report
+
+
+class StockAlertTests(TestCase):
+    """Test alerts about products which should be reordered."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.user = Employee.objects.create_user(
+            username='admin',
+            password='admin',
+            caffe=self.kafo
+        )
+
+        juices = Category.objects.create(name='Soki', caffe=self.kafo)
+        liter = Unit.objects.create(name='litr', caffe=self.kafo)
+        self.products = [
+            Product.objects.create(
+                name='Sok {}'.format(i),
+                category=juices,
+                unit=liter,
+                caffe=self.kafo,
+                threshold=5
+            ) for i in range(10)
+        ]
+
+    def full_products(self, products, amount):
+        """Return not saved FullProducts with given amount."""
+
+        return [
+            FullProduct(product=product, amount=amount, caffe=self.kafo)
+            for product in products
+        ]
+
+    def alerted(self):
+        """Return products which have alerts."""
+
+        return {alert.product for alert in StockAlert.objects.all()}
+
+    def test_report_written(self):
+        """Check if alerts follow stock of products in written reports."""
+
+        report = create_report(
+            self.kafo,
+            self.user,
+            self.full_products(self.products[:2], 5) +
+            self.full_products(self.products[2:3], 6)
+        )
+        self.assertEqual(self.alerted(), set(self.products[:2]))
+
+        alert = self.products[0].alert
+        self.assertEqual(alert.report, report)
+        self.assertEqual(alert.amount, 5)
+        self.assertEqual(alert.threshold, 5)
+
+        create_report(
+            self.kafo,
+            self.user,
+            self.full_products(self.products[1:3], 2)
+        )
+        self.assertEqual(self.alerted(), set(self.products[:3]))
+
+        update_report(report, self.full_products(self.products[:1], 20))
+        self.assertEqual(self.alerted(), set(self.products[1:3]))
+
+    def test_product_removed_from_report(self):
+        """Check if alert disappears with the only count of product."""
+
+        report = create_report(
+            self.kafo,
+            self.user,
+            self.full_products(self.products[:2], 1)
+        )
+        update_report(report, self.full_products(self.products[:1], 1))
+        self.assertEqual(self.alerted(), {self.products[0]})
+
+        report.delete()
+        self.assertEqual(self.alerted(), set())
+
+    def test_threshold_changed(self):
+        """Check if alert is evaluated again with the new threshold."""
+
+        create_report(
+            self.kafo,
+            self.user,
+            self.full_products(self.products[:1], 3)
+        )
+        self.assertEqual(self.alerted(), {self.products[0]})
+
+        self.products[0].threshold = None
+        self.products[0].save()
+        self.assertEqual(self.alerted(), set())
+
+        self.products[0].threshold = 3
+        self.products[0].save()
+        self.assertEqual(self.alerted(), {self.products[0]})
+
+    def test_report_written_queries(self):
+        """Check if alerts are evaluated with the same number of queries."""
+
+        with CaptureQueriesContext(connection) as queries:
+            create_report(
+                self.kafo,
+                self.user,
+                self.full_products(self.products[:1], 1)
+            )
+        num_queries = len(queries)
+
+        with self.assertNumQueries(num_queries):
+            create_report(
+                self.kafo,
+                self.user,
+                self.full_products(self.products, 1)
+            )
+
+        self.assertEqual(StockAlert.objects.count(), 10)
@@ -0,0 +1,143 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103,R0902
+
+from django.test import TestCase
+
+from caffe.models import Caffe
+
+from .assembly import attach_reports_categories, get_reports_categories
+from .models import Category, FullProduct, Product, Report, Unit
+
+
+class ReportAssemblyTests(TestCase):
+    """Test assembling Reports for display."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.cakes = Category.objects.create(name='Ciasta', caffe=self.kafo)
+        self.juices = Category.objects.create(name='Soki', caffe=self.kafo)
+
+        self.liter = Unit.objects.create(name='litr', caffe=self.kafo)
+        self.pieces = Unit.objects.create(name='kawałki', caffe=self.kafo)
+
+        self.coke = Product.objects.create(
+            name='Cola',
+            category=self.juices,
+            unit=self.liter,
+            caffe=self.kafo
+        )
+        self.cake = Product.objects.create(
+            name='Tiramisu',
+            category=self.cakes,
+            unit=self.pieces,
+            caffe=self.kafo
+        )
+        self.cake_second = Product.objects.create(
+            name='Szarlotka',
+            category=self.cakes,
+            unit=self.pieces,
+            caffe=self.kafo
+        )
+
+        self.major_report = Report.objects.create(caffe=self.kafo)
+        self.minor_report = Report.objects.create(caffe=self.kafo)
+        self.empty_report = Report.objects.create(caffe=self.kafo)
+
+        for product, amount in [(self.coke, 10), (self.cake, 5),
+                                (self.cake_second, 2)]:
+            FullProduct.objects.create(
+                product=product,
+                amount=amount,
+                report=self.major_report,
+                caffe=self.kafo
+            )
+
+        FullProduct.objects.create(
+            product=self.coke,
+            amount=3,
+            report=self.minor_report,
+            caffe=self.kafo
+        )
+
+    def test_get_reports_categories(self):
+        """Check if categories with products are assembled properly."""
+
+        all_reports = get_reports_categories(
+            [self.major_report, self.minor_report, self.empty_report]
+        )
+
+        self.assertEqual(len(all_reports), 3)
+        self.assertEqual(all_reports[self.empty_report.id], {})
+        self.assertEqual(all_reports[self.minor_report.id], {
+            'Soki': [{'name': 'Cola', 'amount': 3, 'unit': 'litr'}]
+        })
+
+        categories = all_reports[self.major_report.id]
+        self.assertCountEqual(categories.keys(), ['Soki', 'Ciasta'])
+        self.assertEqual(
+            categories['Soki'],
+            [{'name': 'Cola', 'amount': 10, 'unit': 'litr'}]
+        )
+        self.assertCountEqual(categories['Ciasta'], [
+            {'name': 'Tiramisu', 'amount': 5, 'unit': 'kawałki'},
+            {'name': 'Szarlotka', 'amount': 2, 'unit': 'kawałki'},
+        ])
+
+    def test_get_reports_categories_empty(self):
+        """Check if no query is made when there are no reports."""
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_reports_categories([]), {})
+
+    def test_get_reports_categories_queries(self):
+        """Check if number of queries does not depend on number of products."""
+
+        reports = [self.major_report, self.minor_report, self.empty_report]
+
+        with self.assertNumQueries(1):
+            get_reports_categories(reports)
+
+        for i in range(10):
+            product = Product.objects.create(
+                name='Sok {}'.format(i),
+                category=self.juices,
+                unit=self.liter,
+                caffe=self.kafo
+            )
+
+            for report in reports:
+                FullProduct.objects.create(
+                    product=product,
+                    amount=i,
+                    report=report,
+                    caffe=self.kafo
+                )
+
+        with self.assertNumQueries(1):
+            all_reports = get_reports_categories(reports)
+
+        self.assertEqual(len(all_reports[self.empty_report.id]['Soki']), 10)
+
+    def test_attach_reports_categories(self):
+        """Check if categories are assigned to each report."""
+
+        with self.assertNumQueries(2):
+            reports = attach_reports_categories(
+                Report.objects.filter(caffe=self.kafo).all()
+            )
+
+        self.assertEqual(len(reports), 3)
+        for report in reports:
+            self.assertEqual(
+                report.categories,
+                get_reports_categories([report])[report.id]
+            )
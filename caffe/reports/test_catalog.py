@@ -0,0 +1,131 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103,R0902
+
+import json
+
+from django.test import TestCase
+
+from caffe.models import Caffe
+
+from .catalog import build_catalog, get_catalog, invalidate_catalog
+from .models import Category, Product, Unit
+
+
+class CatalogTests(TestCase):
+    """Test catalog of products used in report forms."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+        self.filtry = Caffe.objects.create(
+            name='filtry',
+            city='Warszawa',
+            street='Filry',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.juices = Category.objects.create(name='Soki', caffe=self.kafo)
+        self.liter = Unit.objects.create(name='litr', caffe=self.kafo)
+        self.coke = Product.objects.create(
+            name='Cola',
+            category=self.juices,
+            unit=self.liter,
+            caffe=self.kafo
+        )
+
+        juices_f = Category.objects.create(name='Soki', caffe=self.filtry)
+        liter_f = Unit.objects.create(name='litr', caffe=self.filtry)
+        Product.objects.create(
+            name='Sok',
+            category=juices_f,
+            unit=liter_f,
+            caffe=self.filtry
+        )
+
+    def test_build_catalog(self):
+        """Check if catalog contains serialized products of caffe."""
+
+        with self.assertNumQueries(1):
+            catalog = build_catalog(self.kafo)
+
+        self.assertEqual(catalog['products'], [{
+            'id': self.coke.id,
+            'name': 'Cola',
+            'unit': 'litr',
+            'category': {'id': self.juices.id, 'name': 'Soki'},
+            'selected': False,
+            'amount': '',
+            'errors': {}
+        }])
+        self.assertEqual(json.loads(catalog['json']), catalog['products'])
+
+    def test_get_catalog_cached(self):
+        """Check if catalog is built only once."""
+
+        catalog = get_catalog(self.kafo)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_catalog(self.kafo), catalog)
+
+        self.assertEqual(catalog, build_catalog(self.kafo))
+        self.assertNotEqual(get_catalog(self.filtry), catalog)
+
+    def test_get_catalog_copy(self):
+        """Check if changing returned catalog does not change cached one."""
+
+        catalog = get_catalog(self.kafo)
+        catalog['products'][0]['selected'] = True
+
+        self.assertFalse(get_catalog(self.kafo)['products'][0]['selected'])
+
+    def test_catalog_invalidation(self):
+        """Check if catalog is invalidated when products change."""
+
+        get_catalog(self.kafo)
+
+        self.juices.name = 'Napoje'
+        self.juices.save()
+        catalog = get_catalog(self.kafo)
+        self.assertEqual(catalog['products'][0]['category']['name'], 'Napoje')
+
+        self.liter.name = 'ml'
+        self.liter.save()
+        catalog = get_catalog(self.kafo)
+        self.assertEqual(catalog['products'][0]['unit'], 'ml')
+
+        Product.objects.create(
+            name='Sprite',
+            category=self.juices,
+            unit=self.liter,
+            caffe=self.kafo
+        )
+        self.assertEqual(len(get_catalog(self.kafo)['products']), 2)
+
+        self.coke.delete()
+        catalog = get_catalog(self.kafo)
+        self.assertEqual(
+            [product['name'] for product in catalog['products']],
+            ['Sprite']
+        )
+
+    def test_catalog_invalidation_other_caffe(self):
+        """Check if catalog is not invalidated by changes in other caffe."""
+
+        get_catalog(self.kafo)
+        invalidate_catalog(self.filtry.id)
+
+        with self.assertNumQueries(0):
+            get_catalog(self.kafo)
+
+        invalidate_catalog(self.kafo.id)
+
+        with self.assertNumQueries(1):
+            get_catalog(self.kafo)
@@ -0,0 +1,138 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103,R0902
+
+import csv
+from datetime import timedelta
+
+from django.contrib.auth.models import Permission
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+from django.utils import timezone
+
+from caffe.models import Caffe
+from employees.models import Employee
+
+from .export import HEADER, export_reports
+from .models import Category, FullProduct, Product, Report, Unit
+from .persistence import create_report
+
+
+class ExportTests(TestCase):
+    """Test exporting Reports to CSV."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+        self.filtry = Caffe.objects.create(
+            name='filtry',
+            city='Warszawa',
+            street='Filry',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.kate = Employee.objects.create_user(
+            username='KateT',
+            password='KateT',
+            caffe=self.kafo
+        )
+
+        juices = Category.objects.create(name='Soki', caffe=self.kafo)
+        liter = Unit.objects.create(name='litr', caffe=self.kafo)
+        self.apple = Product.objects.create(
+            name='Jabłkowy',
+            category=juices,
+            unit=liter,
+            caffe=self.kafo
+        )
+        self.orange = Product.objects.create(
+            name='Pomarańczowy',
+            category=juices,
+            unit=liter,
+            caffe=self.kafo
+        )
+
+        self.today = timezone.localtime(timezone.now()).date()
+
+    def create_report(self, amounts):
+        """Create Report with given amounts of products."""
+
+        return create_report(self.kafo, self.kate, [
+            FullProduct(product=product, amount=amount, caffe=self.kafo)
+            for product, amount in amounts
+        ])
+
+    def test_export_reports(self):
+        """Check if every product is one row and empty reports are kept."""
+
+        first = self.create_report([(self.orange, 2), (self.apple, 1)])
+        empty = self.create_report([])
+        Report.objects.create(
+            creator=Employee.objects.create(username='BobD',
+                                            caffe=self.filtry),
+            caffe=self.filtry
+        )
+
+        rows = list(export_reports(self.kafo, self.today, self.today))
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(all(len(row) == len(HEADER) for row in rows))
+        self.assertEqual(
+            [row[:1] + row[2:] for row in rows],
+            [
+                (first.id, 'KateT', 'Soki', 'Jabłkowy', 'litr', 1),
+                (first.id, 'KateT', 'Soki', 'Pomarańczowy', 'litr', 2),
+                (empty.id, 'KateT', '', '', '', ''),
+            ]
+        )
+
+        yesterday = self.today - timedelta(days=1)
+        self.assertEqual(
+            list(export_reports(self.kafo, yesterday, yesterday)), []
+        )
+
+    def test_export_queries(self):
+        """Check if number of queries does not grow with number of reports."""
+
+        for _ in range(3):
+            self.create_report([(self.orange, 2), (self.apple, 1)])
+
+        # one query for reports, one for products and one for the end
+        with self.assertNumQueries(3):
+            rows = list(export_reports(self.kafo, self.today, self.today))
+
+        self.assertEqual(len(rows), 6)
+
+    def test_export_view(self):
+        """Check if view streams CSV only for valid range."""
+
+        self.create_report([(self.orange, 2)])
+        self.client.login(username='KateT', password='KateT')
+        url = reverse('reports:export')
+
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.kate.user_permissions.add(
+            Permission.objects.get(codename='view_report')
+        )
+
+        response = self.client.get(url, {'start': '2016-07-02',
+                                         'end': '2016-07-01'})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(url, {
+            'start': self.today.isoformat(),
+            'end': self.today.isoformat()
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+
+        lines = b''.join(response.streaming_content).decode('utf-8')
+        rows = list(csv.reader(lines.splitlines()))
+        self.assertEqual(rows[0], list(HEADER))
+        self.assertEqual(rows[1][-3:], ['Pomarańczowy', 'litr', '2.0'])
@@ -0,0 +1,207 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103,R0902
+
+from datetime import timedelta
+
+import numpy as np
+from django.contrib.auth.models import Permission
+from django.core.management import call_command
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.six import StringIO
+
+from caffe.models import Caffe
+from employees.models import Employee
+
+from .forecast import (HORIZON_DAYS, ORDER_DAYS, SMOOTHING, compute_forecasts,
+                       smooth_rates)
+from .models import (Category, FullProduct, Product, ProductForecast,
+                     ProductStock, Report, StockLevel, Unit)
+from .persistence import create_report
+
+
+class ForecastTests(TestCase):
+    """Test forecasts of consumption of products."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.user = Employee.objects.create_user(
+            username='admin',
+            password='admin',
+            caffe=self.kafo
+        )
+
+        juices = Category.objects.create(name='Soki', caffe=self.kafo)
+        self.liter = Unit.objects.create(name='litr', caffe=self.kafo)
+        self.products = [
+            Product.objects.create(
+                name='Sok {}'.format(i),
+                category=juices,
+                unit=self.liter,
+                caffe=self.kafo
+            ) for i in range(3)
+        ]
+
+        self.now = timezone.now()
+
+    def add_history(self, product, amounts, rates):
+        """Store stock levels of product counted once a day until now."""
+
+        days = len(amounts)
+        for i, (amount, rate) in enumerate(zip(amounts, rates)):
+            counted_on = self.now - timedelta(days=days - 1 - i)
+            report = Report.objects.create(caffe=self.kafo)
+            StockLevel.objects.create(
+                product=product,
+                report=report,
+                caffe=self.kafo,
+                counted_on=counted_on,
+                amount=amount,
+                rate=rate
+            )
+
+        ProductStock.objects.create(
+            product=product,
+            report=report,
+            caffe=self.kafo,
+            counted_on=counted_on,
+            amount=amount
+        )
+
+    def test_smooth_rates(self):
+        """Check if the newest rates weigh the most."""
+
+        ids, smoothed = smooth_rates(
+            np.array([1, 1, 2]),
+            np.array([4.0, 2.0, 3.0])
+        )
+
+        self.assertEqual(ids.tolist(), [1, 2])
+        self.assertAlmostEqual(
+            smoothed[0],
+            (4 + 2 * (1 - SMOOTHING)) / (2 - SMOOTHING)
+        )
+        self.assertAlmostEqual(smoothed[1], 3)
+
+    def test_compute_forecasts(self):
+        """Check if run out time and ordered amount are predicted."""
+
+        self.products[1].threshold = 3
+        self.products[1].save()
+
+        self.add_history(self.products[0], [10, 8, 6], [None, 2, 2])
+        self.add_history(self.products[1], [10, 9], [None, 1])
+        self.add_history(self.products[2], [10], [None])
+
+        forecasts = {
+            forecast.product_id: forecast
+            for forecast in compute_forecasts(self.kafo.id, self.now)
+        }
+        self.assertEqual(len(forecasts), 3)
+
+        forecast = forecasts[self.products[0].id]
+        self.assertAlmostEqual(forecast.rate, 2)
+        self.assertEqual(forecast.runs_out_on, self.now + timedelta(days=3))
+        self.assertAlmostEqual(forecast.order_amount, 2 * ORDER_DAYS - 6)
+
+        forecast = forecasts[self.products[1].id]
+        self.assertAlmostEqual(forecast.order_amount, ORDER_DAYS + 3 - 9)
+
+        forecast = forecasts[self.products[2].id]
+        self.assertIsNone(forecast.rate)
+        self.assertIsNone(forecast.runs_out_on)
+        self.assertEqual(forecast.order_amount, 0)
+
+    def test_forecast_horizon(self):
+        """Check if run out time is not predicted beyond horizon."""
+
+        self.add_history(self.products[0], [100.0000001, 100], [None, 1e-7])
+        self.add_history(
+            self.products[1], [10, 10 - 10 / HORIZON_DAYS],
+            [None, 10 / HORIZON_DAYS]
+        )
+
+        forecasts = {
+            forecast.product_id: forecast
+            for forecast in compute_forecasts(self.kafo.id, self.now)
+        }
+
+        forecast = forecasts[self.products[0].id]
+        self.assertAlmostEqual(forecast.rate, 1e-7)
+        self.assertIsNone(forecast.runs_out_on)
+        self.assertIsNotNone(forecasts[self.products[1].id].runs_out_on)
+
+        create_report(self.kafo, self.user, [
+            FullProduct(product=self.products[0], amount=100, caffe=self.kafo)
+        ])
+        self.assertTrue(ProductForecast.objects.exists())
+
+    def test_report_written(self):
+        """Check if forecasts are refreshed after report is written."""
+
+        create_report(self.kafo, self.user, [
+            FullProduct(product=product, amount=5, caffe=self.kafo)
+            for product in self.products[:2]
+        ])
+
+        self.assertCountEqual(
+            [forecast.product for forecast in ProductForecast.objects.all()],
+            self.products[:2]
+        )
+
+        Report.objects.get().delete()
+        self.assertFalse(ProductForecast.objects.exists())
+
+    def test_refresh_forecasts_command(self):
+        """Check if command stores forecasts of all caffes."""
+
+        self.add_history(self.products[0], [10, 8], [None, 2])
+
+        out = StringIO()
+        call_command('refresh_forecasts', stdout=out)
+        self.assertIn('refreshed', out.getvalue())
+        self.assertEqual(ProductForecast.objects.get().rate, 2)
+
+        ProductStock.objects.all().delete()
+        call_command('refresh_forecasts', caffe=self.kafo.id, stdout=out)
+        self.assertFalse(ProductForecast.objects.exists())
+
+    def test_forecast_view(self):
+        """Check if forecasts of the caffe are returned in one query."""
+
+        self.add_history(self.products[0], [10, 8], [None, 2])
+        call_command('refresh_forecasts', stdout=StringIO())
+
+        self.user.user_permissions.add(
+            Permission.objects.get(codename='view_report')
+        )
+        self.client.login(username='admin', password='admin')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('reports:forecast'))
+
+        forecast_queries = [
+            query for query in queries
+            if 'reports_productforecast' in query['sql']
+        ]
+        self.assertEqual(len(forecast_queries), 1)
+
+        self.assertEqual(response.status_code, 200)
+        products = response.json()['products']
+        self.assertEqual(len(products), 1)
+        self.assertEqual(products[0]['name'], 'Sok 0')
+        self.assertEqual(products[0]['unit'], 'litr')
+        self.assertEqual(products[0]['rate'], 2)
+        self.assertIsNotNone(products[0]['runs_out_on'])
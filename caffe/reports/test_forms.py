@@ -303,6 +303,22 @@ class ProductFormTest(TestCase):
                 'unit': self.liter.id
             })
 
+    def test_product_threshold(self):
+        """Check validation of reorder threshold."""
+
+        data = {
+            'name': 'Correct',
+            'category': self.cat_first.id,
+            'unit': self.gram.id,
+            'threshold': 2.5
+        }
+        form = ProductForm(data, caffe=self.caffe)
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.save().threshold, 2.5)
+
+        data['threshold'] = -1
+        self.assertFalse(ProductForm(data, caffe=self.caffe).is_valid())
+
     def test_product_same_name(self):
         """Check if product with same name is properly handled."""
 
@@ -0,0 +1,207 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103,R0902
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from caffe.models import Caffe
+from employees.models import Employee
+
+from .models import Category, FullProduct, Product, Report, Unit
+from .persistence import create_report, update_report
+
+
+class ReportPersistenceTests(TestCase):
+    """Test writing Reports with their FullProducts."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+        self.filtry = Caffe.objects.create(
+            name='filtry',
+            city='Warszawa',
+            street='Filry',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.user = Employee.objects.create_user(
+            username='admin',
+            password='admin',
+            caffe=self.kafo
+        )
+
+        self.juices = Category.objects.create(name='Soki', caffe=self.kafo)
+        self.liter = Unit.objects.create(name='litr', caffe=self.kafo)
+
+        self.products = [
+            Product.objects.create(
+                name='Sok {}'.format(i),
+                category=self.juices,
+                unit=self.liter,
+                caffe=self.kafo
+            ) for i in range(10)
+        ]
+
+        juices_f = Category.objects.create(name='Soki', caffe=self.filtry)
+        liter_f = Unit.objects.create(name='litr', caffe=self.filtry)
+        self.product_f = Product.objects.create(
+            name='Sok',
+            category=juices_f,
+            unit=liter_f,
+            caffe=self.filtry
+        )
+
+    def full_products(self, products, amount=10):
+        """Return not saved FullProducts for given products."""
+
+        return [
+            FullProduct(product=product, amount=amount, caffe=self.kafo)
+            for product in products
+        ]
+
+    def test_create_report(self):
+        """Check if report is created with all its products."""
+
+        report = create_report(
+            self.kafo,
+            self.user,
+            self.full_products(self.products[:3])
+        )
+
+        self.assertEqual(report.caffe, self.kafo)
+        self.assertEqual(report.creator, self.user)
+        self.assertCountEqual(
+            [fp.product for fp in report.full_products.all()],
+            self.products[:3]
+        )
+
+    def test_create_report_queries(self):
+        """Check if number of queries does not depend on number of products."""
+
+        with CaptureQueriesContext(connection) as queries:
+            create_report(
+                self.kafo,
+                self.user,
+                self.full_products(self.products[:1])
+            )
+
+        with self.assertNumQueries(len(queries)):
+            create_report(
+                self.kafo,
+                self.user,
+                self.full_products(self.products)
+            )
+
+    def test_create_report_duplicated_products(self):
+        """Check if report with two same products is not created."""
+
+        full_products = self.full_products(self.products[:2])
+        full_products += self.full_products(self.products[1:2], amount=5)
+
+        with self.assertRaises(ValidationError):
+            create_report(self.kafo, self.user, full_products)
+
+        self.assertEqual(Report.objects.count(), 0)
+        self.assertEqual(FullProduct.objects.count(), 0)
+
+    def test_create_report_different_caffe(self):
+        """Check if report with product from other caffe is not created."""
+
+        full_products = self.full_products(self.products[:2])
+        full_products += self.full_products([self.product_f])
+
+        with self.assertRaises(ValidationError):
+            create_report(self.kafo, self.user, full_products)
+
+        full_products = self.full_products(self.products[:2])
+        full_products[0].caffe = self.filtry
+
+        with self.assertRaises(ValidationError):
+            create_report(self.kafo, self.user, full_products)
+
+        self.assertEqual(Report.objects.count(), 0)
+        self.assertEqual(FullProduct.objects.count(), 0)
+
+    def test_update_report(self):
+        """Check if report products are replaced with new ones."""
+
+        report = create_report(
+            self.kafo,
+            self.user,
+            self.full_products(self.products[:3])
+        )
+
+        update_report(report, self.full_products(self.products[2:5], 7))
+
+        full_products = FullProduct.objects.filter(report=report).all()
+        self.assertCountEqual(
+            [fp.product for fp in full_products],
+            self.products[2:5]
+        )
+        self.assertEqual({fp.amount for fp in full_products}, {7})
+        self.assertEqual(Report.objects.count(), 1)
+
+    def test_update_report_keeps_unchanged_products(self):
+        """Check if only changed products are written."""
+
+        report = create_report(
+            self.kafo,
+            self.user,
+            self.full_products(self.products[:3])
+        )
+        stored = {
+            fp.product_id: fp.pk for fp in report.full_products.all()
+        }
+
+        full_products = self.full_products(self.products[:3])
+        full_products[1].amount = 3
+
+        with CaptureQueriesContext(connection) as queries:
+            update_report(report, full_products)
+
+        # products are read again by stock levels and rollups of statistics
+        writes = [
+            query['sql'].split()[0] for query in queries
+            if 'reports_fullproduct' in query['sql']
+        ]
+        self.assertEqual(writes[0], 'SELECT')
+        self.assertEqual(
+            [statement for statement in writes if statement != 'SELECT'],
+            ['UPDATE']
+        )
+
+        self.assertEqual(
+            {fp.product_id: fp.pk for fp in report.full_products.all()},
+            stored
+        )
+        self.assertEqual(
+            report.full_products.get(product=self.products[1]).amount,
+            3
+        )
+
+    def test_update_report_duplicated_products(self):
+        """Check if report is not changed when products are duplicated."""
+
+        report = create_report(
+            self.kafo,
+            self.user,
+            self.full_products(self.products[:3])
+        )
+
+        with self.assertRaises(ValidationError):
+            update_report(
+                report,
+                self.full_products(self.products[:1] + self.products[:1])
+            )
+
+        self.assertEqual(report.full_products.count(), 3)
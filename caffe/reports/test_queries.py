@@ -0,0 +1,92 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103
+
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from caffe.query_counts import QueryCountsMixin, get_largest
+
+from .catalog import invalidate_catalog
+from .models import Category, Product, Report, Unit
+
+
+class ReportsQueriesTests(QueryCountsMixin, TestCase):
+    """Test if numbers of queries of views do not depend on data."""
+
+    def test_new_report(self):
+        """Check new Report view."""
+
+        self.assertConstantQueries(lambda caffe: reverse('reports:new'))
+
+    def test_show_report(self):
+        """Check show Report view."""
+
+        self.assertConstantQueries(lambda caffe: reverse(
+            'reports:show',
+            args=(get_largest(
+                Report.objects.filter(caffe=caffe), 'full_products'
+            ).id,)
+        ))
+
+    def test_edit_report(self):
+        """Check edit Report view."""
+
+        self.assertConstantQueries(lambda caffe: reverse(
+            'reports:edit',
+            args=(get_largest(
+                Report.objects.filter(caffe=caffe), 'full_products'
+            ).id,)
+        ))
+
+    def test_forecast(self):
+        """Check forecast of products view."""
+
+        self.assertConstantQueries(lambda caffe: reverse('reports:forecast'))
+
+    def test_edit_category(self):
+        """Check edit Category view."""
+
+        self.assertConstantQueries(lambda caffe: reverse(
+            'reports:edit_category',
+            args=(Category.objects.filter(caffe=caffe).first().id,)
+        ))
+
+    def test_edit_unit(self):
+        """Check edit Unit view."""
+
+        self.assertConstantQueries(lambda caffe: reverse(
+            'reports:edit_unit',
+            args=(Unit.objects.filter(caffe=caffe).first().id,)
+        ))
+
+    def test_edit_product(self):
+        """Check edit Product view."""
+
+        self.assertConstantQueries(lambda caffe: reverse(
+            'reports:edit_product',
+            args=(Product.objects.filter(caffe=caffe).first().id,)
+        ))
+
+    def test_new_category(self):
+        """Check new Category view."""
+
+        self.assertConstantQueries(
+            lambda caffe: reverse('reports:new_category'),
+            invalidate_catalog
+        )
+
+    def test_new_unit(self):
+        """Check new Unit view."""
+
+        self.assertConstantQueries(
+            lambda caffe: reverse('reports:new_unit'),
+            invalidate_catalog
+        )
+
+    def test_new_product(self):
+        """Check new Product view."""
+
+        self.assertConstantQueries(
+            lambda caffe: reverse('reports:new_product'),
+            invalidate_catalog
+        )
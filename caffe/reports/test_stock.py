@@ -0,0 +1,228 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103,R0902
+
+from datetime import datetime, timedelta
+
+import pytz
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.six import StringIO
+
+from caffe.models import Caffe
+from employees.models import Employee
+
+from .models import (Category, FullProduct, Product, ProductStock, Report,
+                     StockLevel, Unit)
+from .persistence import create_report, update_report
+from .stock import SMOOTHING, get_stock_series, next_level, rebuild_stock
+
+
+def stored_levels():
+    """Return all stock levels as tuples without ids."""
+
+    return set(StockLevel.objects.values_list(
+        'product_id', 'report_id', 'caffe_id', 'counted_on', 'amount',
+        'consumed', 'rate', 'average_rate'
+    ))
+
+
+def stored_stocks():
+    """Return all running states of products as tuples."""
+
+    return set(ProductStock.objects.values_list(
+        'product_id', 'report_id', 'counted_on', 'amount', 'average_rate'
+    ))
+
+
+class StockTests(TestCase):
+    """Test stock time series of products."""
+
+    def setUp(self):
+        """Initialize all elements needed in tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.user = Employee.objects.create_user(
+            username='admin',
+            password='admin',
+            caffe=self.kafo
+        )
+
+        juices = Category.objects.create(name='Soki', caffe=self.kafo)
+        liter = Unit.objects.create(name='litr', caffe=self.kafo)
+        self.products = [
+            Product.objects.create(
+                name='Sok {}'.format(i),
+                category=juices,
+                unit=liter,
+                caffe=self.kafo
+            ) for i in range(3)
+        ]
+
+    def create_report(self, amounts):
+        """Create report with given amounts of products."""
+
+        return create_report(self.kafo, self.user, [
+            FullProduct(product=product, amount=amount, caffe=self.kafo)
+            for product, amount in zip(self.products, amounts)
+            if amount is not None
+        ])
+
+    def assert_rebuilt(self):
+        """Check if stored series are the same as rebuilt ones."""
+
+        levels, stocks = stored_levels(), stored_stocks()
+        rebuild_stock()
+        self.assertEqual(stored_levels(), levels)
+        self.assertEqual(stored_stocks(), stocks)
+
+    def test_next_level(self):
+        """Check if consumption and rates are computed."""
+
+        monday = datetime(2016, 3, 7, 8, tzinfo=pytz.utc)
+        first = next_level(None, 1, 1, 1, monday, 10)
+        self.assertIsNone(first.consumed)
+        self.assertIsNone(first.average_rate)
+
+        second = next_level(first, 1, 2, 1, monday + timedelta(days=2), 6)
+        self.assertEqual(second.consumed, 4)
+        self.assertEqual(second.rate, 2)
+        self.assertEqual(second.average_rate, 2)
+
+        third = next_level(second, 1, 3, 1, monday + timedelta(days=3), 2)
+        self.assertEqual(third.rate, 4)
+        self.assertAlmostEqual(
+            third.average_rate,
+            SMOOTHING * 4 + (1 - SMOOTHING) * 2
+        )
+
+        # restocked product keeps the previous average rate
+        fourth = next_level(third, 1, 4, 1, monday + timedelta(days=4), 20)
+        self.assertIsNone(fourth.consumed)
+        self.assertIsNone(fourth.rate)
+        self.assertEqual(fourth.average_rate, third.average_rate)
+
+    def test_report_written(self):
+        """Check if series are continued by written reports."""
+
+        first = self.create_report([10, 5])
+        second = self.create_report([7, 8, 1])
+
+        series = list(get_stock_series(self.products[0]))
+        self.assertEqual([level.report for level in series], [first, second])
+        self.assertEqual(series[1].consumed, 3)
+        self.assertIsNotNone(series[1].rate)
+
+        restocked = get_stock_series(self.products[1]).last()
+        self.assertIsNone(restocked.consumed)
+
+        stock = self.products[0].stock
+        self.assertEqual(stock.report, second)
+        self.assertEqual(stock.amount, 7)
+        self.assertEqual(stock.average_rate, series[1].average_rate)
+
+        self.assert_rebuilt()
+
+    def test_report_written_queries(self):
+        """Check if writing report does not depend on length of history."""
+
+        self.create_report([10, 10, 10])
+        with CaptureQueriesContext(connection) as queries:
+            self.create_report([9, 9, 9])
+        num_queries = len(queries)
+
+        for amount in range(8, 3, -1):
+            self.create_report([amount, amount, amount])
+
+        with self.assertNumQueries(num_queries):
+            self.create_report([3, 3, 3])
+
+        self.assertEqual(StockLevel.objects.count(), 24)
+
+    def test_old_report_updated(self):
+        """Check if levels after updated old report are computed again."""
+
+        first = self.create_report([10, 10])
+        self.create_report([8, 8])
+        self.create_report([5, 5])
+
+        update_report(first, [
+            FullProduct(product=self.products[0], amount=20, caffe=self.kafo),
+            FullProduct(product=self.products[2], amount=4, caffe=self.kafo),
+        ])
+
+        series = list(get_stock_series(self.products[0]))
+        self.assertEqual([level.consumed for level in series], [None, 12, 3])
+
+        # product removed from the report starts its series later
+        series = list(get_stock_series(self.products[1]))
+        self.assertEqual([level.consumed for level in series], [None, 3])
+
+        self.assertEqual(self.products[2].stock.report, first)
+
+        self.assert_rebuilt()
+
+    def test_report_deleted(self):
+        """Check if series skip deleted reports."""
+
+        self.create_report([10])
+        second = self.create_report([8])
+        third = self.create_report([5])
+
+        second.delete()
+        series = list(get_stock_series(self.products[0]))
+        self.assertEqual([level.consumed for level in series], [None, 5])
+        self.assert_rebuilt()
+
+        third.delete()
+        self.assertEqual(self.products[0].stock.amount, 10)
+        self.assert_rebuilt()
+
+        Report.objects.get().delete()
+        self.assertFalse(StockLevel.objects.exists())
+        self.assertFalse(ProductStock.objects.exists())
+
+    def test_stock_series_dates(self):
+        """Check if series are limited to given local days."""
+
+        first = self.create_report([10])
+        self.create_report([8])
+
+        day = datetime(2016, 3, 7, 12, tzinfo=pytz.utc)
+        Report.objects.filter(pk=first.pk).update(created_on=day)
+        rebuild_stock()
+
+        start = day.date()
+        series = get_stock_series(self.products[0], start,
+                                  start + timedelta(days=1))
+        self.assertEqual([level.report for level in series], [first])
+
+        series = get_stock_series(self.products[0], start + timedelta(days=1))
+        self.assertEqual(series.count(), 1)
+        self.assertIsNotNone(series.get().rate)
+
+    def test_rebuild_stock_command(self):
+        """Check if command rebuilds series from the history."""
+
+        self.create_report([10, 5])
+        self.create_report([7, 8])
+        levels = stored_levels()
+
+        StockLevel.objects.all().delete()
+        ProductStock.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild_stock', stdout=out)
+        self.assertIn('rebuilt', out.getvalue())
+        self.assertEqual(stored_levels(), levels)
+
+        call_command('rebuild_stock', caffe=self.kafo.id, stdout=out)
+        self.assertEqual(stored_levels(), levels)
@@ -5,7 +5,9 @@ import json
 
 from django.contrib.auth.models import Permission
 from django.core.urlresolvers import NoReverseMatch, reverse
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from caffe.models import Caffe
@@ -877,6 +879,27 @@ class ReportViewsTests(TestCase):
         self.assertIn('"errors": ["', response.context['products'])
         self.assertIn('To pole jest wymagane.', response.context['products'])
 
+    def test_new_report_post_queries(self):
+        """Check if new report makes the same queries for more products."""
+
+        url = reverse('reports:new')
+
+        # cache catalog of products
+        self.client.get(url)
+
+        post = {self.coke.id: [self.coke.id, 10]}
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(url, post)
+        num_queries = len(queries)
+
+        for product in [self.green_tea, self.black_coffe]:
+            post[product.id] = [product.id, 20]
+
+        with self.assertNumQueries(num_queries):
+            self.client.post(url, post)
+
+        self.assertEqual(Report.objects.first().full_products.count(), 3)
+
     def test_new_report_post_success(self):
         """Check if new report successes to create."""
 
@@ -958,6 +981,45 @@ class ReportViewsTests(TestCase):
                 else:
                     self.assertEqual(bool(response_product['selected']), False)
 
+    def test_edit_report_show_queries(self):
+        """Check if edit report makes the same queries for more products."""
+
+        url = reverse('reports:edit', args=(self.major_report.id,))
+
+        # cache catalog of products
+        self.client.get(url)
+
+        # captured queries are lost when next request resets them
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        num_queries = len(queries)
+
+        for i in range(5):
+            product = Product.objects.create(
+                name='Sok {}'.format(i),
+                category=self.juices,
+                unit=self.liter,
+                caffe=self.kafo
+            )
+            FullProduct.objects.create(
+                product=product,
+                amount=i,
+                report=self.major_report,
+                caffe=self.kafo
+            )
+
+        # cache changed catalog of products
+        self.client.get(url)
+
+        with self.assertNumQueries(num_queries):
+            response = self.client.get(url)
+
+        products = json.loads(response.context['products'])
+        self.assertEqual(
+            len([product for product in products if product['selected']]),
+            7
+        )
+
     def test_edit_report_404(self):
         """Check if 404 is displayed when report does not exists."""
 
@@ -1073,6 +1135,56 @@ class ReportViewsTests(TestCase):
         self.assertIn(self.cakes.name, categories)
         self.assertEqual(len(categories[self.cakes.name]), 2)
 
+    def test_show_report_queries(self):
+        """Check if show report makes the same queries for more products."""
+
+        url = reverse('reports:show', args=(self.major_report.id,))
+
+        # permissions are cached by the first request
+        self.client.get(url)
+
+        # captured queries are lost when next request resets them
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        num_queries = len(queries)
+
+        for product in [self.coke, self.green_tea, self.black_coffe]:
+            FullProduct.objects.create(
+                product=product,
+                amount=30,
+                report=self.major_report,
+                caffe=self.kafo
+            )
+
+        with self.assertNumQueries(num_queries):
+            response = self.client.get(url)
+
+        self.assertEqual(len(response.context['categories']), 4)
+
+    def test_new_report_latest_reports_queries(self):
+        """Check if latest reports are displayed with constant queries."""
+
+        # cache catalog of products
+        self.client.get(reverse('reports:new'))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('reports:new'))
+
+        for _ in range(3):
+            report = Report.objects.create(caffe=self.kafo)
+            FullProduct.objects.create(
+                product=self.coke,
+                amount=30,
+                report=report,
+                caffe=self.kafo
+            )
+
+        with CaptureQueriesContext(connection) as more_queries:
+            response = self.client.get(reverse('reports:new'))
+
+        self.assertEqual(len(response.context['reports']), 5)
+        self.assertEqual(len(queries), len(more_queries))
+
     def test_show_report_404(self):
         """Check if 404 is displayed when report does not exists."""
 
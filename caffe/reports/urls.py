@@ -2,9 +2,9 @@ from django.conf.urls import url
 from django.contrib import admin
 
 from .views import (reports_edit_category, reports_edit_product,
-                    reports_edit_report, reports_edit_unit, reports_navigate,
-                    reports_new_category, reports_new_product,
-                    reports_new_report, reports_new_unit,
+                    reports_edit_report, reports_edit_unit, reports_export,
+                    reports_forecast, reports_navigate, reports_new_category,
+                    reports_new_product, reports_new_report, reports_new_unit,
                     reports_show_report)
 
 urlpatterns = [
@@ -14,6 +14,8 @@ urlpatterns = [
     url(r'^(?P<report_id>\d{0,17})/$', reports_show_report, name='show'),
     url(r'^new/$', reports_new_report, name='new'),
     url(r'^edit/(?P<report_id>\d{0,17})/$', reports_edit_report, name='edit'),
+    url(r'^forecast/$', reports_forecast, name='forecast'),
+    url(r'^export/$', reports_export, name='export'),
 
     url(r'^new/category/$', reports_new_category, name='new_category'),
     url(
@@ -4,12 +4,24 @@ import json
 
 from django.contrib import messages
 from django.contrib.auth.decorators import permission_required
+from django.core.exceptions import ValidationError
 from django.core.urlresolvers import reverse
+from django.http import HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
-from .forms import (CategoryForm, FullProductForm, ProductForm, ReportForm,
-                    UnitForm)
-from .models import Category, FullProduct, Product, Report, Unit
+from caffe.cache import get_or_set
+from caffe.exports import csv_response
+from caffe.forms import ExportForm
+from caffe.line_items import (get_submitted_line_items, parse_line_items,
+                              prefill_line_items)
+
+from .assembly import attach_reports_categories, get_reports_categories
+from .catalog import CATALOG_NAMESPACE, CATALOG_TIMEOUT, get_catalog
+from .export import HEADER, export_reports
+from .forms import CategoryForm, ProductForm, ReportForm, UnitForm
+from .models import (Category, FullProduct, Product, ProductForecast, Report,
+                     Unit)
+from .persistence import create_report, update_report
 
 
 def get_report_categories(report_id):
@@ -32,30 +44,13 @@ def get_report_categories(report_id):
     if not report:
         return None
 
-    all_categories = {}
-    for full_product in report.full_products.all():
-        product = full_product.product
-        category = product.category
-        unit = product.unit
-
-        # add product to specific category
-        if category.name not in all_categories:
-            all_categories[category.name] = []
-
-        all_categories[category.name].append({
-            'name': product.name,
-            'amount': full_product.amount,
-            'unit': unit.name
-        })
-
-    return all_categories
+    return get_reports_categories([report])[report.id]
 
 
 @permission_required('reports.add_category')
 def reports_new_category(request):
     """Show form to create new Category and show existing Categories."""
 
-    elements = []
     form = CategoryForm(request.POST or None, caffe=request.user.caffe)
 
     if form.is_valid():
@@ -64,12 +59,17 @@ def reports_new_category(request):
         return redirect(reverse('reports:new_category'))
 
     categories = Category.objects.filter(caffe=request.user.caffe).all()
-    for category in categories:
-        elements.append({
+    elements = get_or_set(
+        CATALOG_NAMESPACE,
+        request.user.caffe_id,
+        ['categories'],
+        lambda: [{
             'edit_href': reverse('reports:edit_category', args=(category.id,)),
             'id': category.id,
             'desc': str(category)
-        })
+        } for category in categories],
+        CATALOG_TIMEOUT
+    )
 
     return render(request, 'reports/new_element.html', {
         'form': form,
@@ -118,7 +118,6 @@ def reports_edit_category(request, category_id):
 def reports_new_unit(request):
     """Show form to create new Unit and show already existing Units."""
 
-    elements = []
     form = UnitForm(request.POST or None, caffe=request.user.caffe)
 
     if form.is_valid():
@@ -127,12 +126,17 @@ def reports_new_unit(request):
         return redirect(reverse('reports:new_unit'))
 
     units = Unit.objects.filter(caffe=request.user.caffe).all()
-    for unit in units:
-        elements.append({
+    elements = get_or_set(
+        CATALOG_NAMESPACE,
+        request.user.caffe_id,
+        ['units'],
+        lambda: [{
             'edit_href': reverse('reports:edit_unit', args=(unit.id,)),
             'id': unit.id,
             'desc': str(unit)
-        })
+        } for unit in units],
+        CATALOG_TIMEOUT
+    )
 
     return render(request, 'reports/new_element.html', {
         'form': form,
@@ -181,7 +185,6 @@ def reports_edit_unit(request, unit_id):
 def reports_new_product(request):
     """Show form to create new Product and show already existing Products."""
 
-    elements = []
     form = ProductForm(request.POST or None, caffe=request.user.caffe)
 
     if form.is_valid():
@@ -190,12 +193,17 @@ def reports_new_product(request):
         return redirect(reverse('reports:new_product'))
 
     products = Product.objects.filter(caffe=request.user.caffe).all()
-    for product in products:
-        elements.append({
+    elements = get_or_set(
+        CATALOG_NAMESPACE,
+        request.user.caffe_id,
+        ['products'],
+        lambda: [{
             'edit_href': reverse('reports:edit_product', args=(product.id,)),
             'id': product.id,
             'desc': str(product)
-        })
+        } for product in products],
+        CATALOG_TIMEOUT
+    )
 
     return render(request, 'reports/new_element.html', {
         'form': form,
@@ -244,74 +252,35 @@ def reports_edit_product(request, product_id):
 def reports_new_report(request):
     """Show form to create new Report and show already existing Report."""
 
-    all_products = []
-
-    products = Product.objects.filter(caffe=request.user.caffe).all()
-    for product in products:
-        all_products.append({
-            'id': product.id,
-            'name': product.name,
-            'unit': product.unit.name,
-            'category': {
-                'id': product.category.id,
-                'name': product.category.name
-            },
-            'selected': False,
-            'amount': '',
-            'errors': {}
-        })
+    catalog = get_catalog(request.user.caffe)
+    all_products = catalog['products']
 
     if request.POST:
-        post = request.POST.copy()
-        forms = []
-        valid = True
-
-        post.pop('csrfmiddlewaretoken', None)
-
-        # chcek validation and create form for each fullproduct
-        for full_product in post:
-            fp_list = post.getlist(full_product)
-            form = FullProductForm(
-                {
-                    'product': fp_list[0],
-                    'amount': fp_list[1]
-                },
-                caffe=request.user.caffe
-            )
-
-            valid = valid & form.is_valid()
-
-            # update products values
-            product = next(
-                (p for p in all_products if p['id'] == int(fp_list[0])),
-                None
-            )
-
-            if product:
-                product['selected'] = True
-                product['amount'] = (fp_list[1] if form.is_valid() else '')
-                product['errors'] = (
-                    '' if form.is_valid() else form.errors['amount']
+        full_products, valid = parse_line_items(
+            get_submitted_line_items(request.POST),
+            all_products,
+            Product.objects.filter(caffe=request.user.caffe),
+            FullProduct,
+            'product',
+            request.user.caffe
+        )
+
+        # check if some product was submitted
+        if len(full_products) > 0 and valid:
+            try:
+                create_report(
+                    request.user.caffe,
+                    request.user,
+                    full_products
                 )
-
-            forms.append(form)
-
-        # check if some form exists
-        if len(forms) > 0 and valid:
-            report = Report.objects.create(
-                caffe=request.user.caffe,
-                creator=request.user
-            )
-
-            # for each form save it with its report
-            for form in forms:
-                full_product = form.save()
-                full_product.report = report
-                full_product.save()
-
-            report.save()
-            messages.success(request, u'Raport został poprawnie stworzony.')
-            return redirect(reverse('reports:navigate'))
+            except ValidationError as error:
+                messages.error(request, ' '.join(error.messages))
+            else:
+                messages.success(
+                    request,
+                    u'Raport został poprawnie stworzony.'
+                )
+                return redirect(reverse('reports:navigate'))
         else:
             messages.error(
                 request,
@@ -319,15 +288,17 @@ def reports_new_report(request):
             )
 
     # get last five reports
-    latest_reports = Report.objects.filter(caffe=request.user.caffe).all()[:5]
-    for report in latest_reports:
-        report.categories = get_report_categories(report.id)
+    latest_reports = attach_reports_categories(
+        Report.objects.filter(caffe=request.user.caffe).all()[:5]
+    )
 
     return render(request, 'reports/new.html', {
         'title':  'Nowy raport',
         'button': 'Dodaj',
         'reports': latest_reports,
-        'products': json.dumps(all_products)
+        'products': (
+            json.dumps(all_products) if request.POST else catalog['json']
+        )
     })
 
 
@@ -341,90 +312,46 @@ def reports_edit_report(request, report_id):
 
     report = get_object_or_404(Report, id=report_id, caffe=request.user.caffe)
 
-    all_products = []
-
-    products = Product.objects.filter(caffe=request.user.caffe).all()
-    for product in products:
-        parsed_product = {
-            'id': product.id,
-            'name': product.name,
-            'unit': product.unit.name,
-            'category': {
-                'id': product.category.id,
-                'name': product.category.name
-            },
-            'selected': False,
-            'amount': '',
-            'errors': {}
-        }
+    all_products = get_catalog(request.user.caffe)['products']
 
+    if not request.POST:
         # mark as selected products which are assigned to report
-        full_product = FullProduct.objects.filter(
-            report=report.id, product=product.id
-        ).first()
-
-        if full_product and (not request.POST):
-            parsed_product['selected'] = True
-            parsed_product['amount'] = full_product.amount
-
-        all_products.append(parsed_product)
+        prefill_line_items(
+            all_products,
+            report.full_products.all(),
+            'product_id'
+        )
 
     if request.POST:
-        post = request.POST.copy()
-        forms = []
-        valid = True
-
-        post.pop('csrfmiddlewaretoken', None)
-
-        # chcek validation and create form for each fullproduct
-        for full_product in post:
-            fp_list = post.getlist(full_product)
-            form = FullProductForm(
-                {
-                    'product': fp_list[0],
-                    'amount': fp_list[1]
-                },
-                caffe=request.user.caffe
-            )
-
-            valid = valid & form.is_valid()
-
-            product = next(
-                (p for p in all_products if p['id'] == int(fp_list[0])),
-                None
-            )
-
-            if product:
-                product['selected'] = True
-                product['amount'] = (fp_list[1] if form.is_valid() else '')
-                product['errors'] = (
-                    '' if form.is_valid() else form.errors['amount']
-                )
-
-            forms.append(form)
-
-        # check if some form exists
-        if len(forms) > 0 and valid:
+        full_products, valid = parse_line_items(
+            get_submitted_line_items(request.POST),
+            all_products,
+            Product.objects.filter(caffe=request.user.caffe),
+            FullProduct,
+            'product',
+            request.user.caffe
+        )
+
+        # check if some product was submitted
+        if len(full_products) > 0 and valid:
             form = ReportForm(
                 {},
                 caffe=request.user.caffe,
                 creator=request.user,
                 instance=report
             )
-            report = form.save()
-
-            for full_product in report.full_products.all():
-                full_product.delete()
-
-            # for each form save it with its report
-            for form in forms:
-                full_product = form.save()
-                full_product.report = report
-                full_product.save()
-
-            report.save()
-            messages.success(request, u'Raport został poprawnie zmieniony.')
-            return redirect(reverse('reports:navigate'))
+            report = form.save(commit=False)
+
+            try:
+                update_report(report, full_products)
+            except ValidationError as error:
+                messages.error(request, ' '.join(error.messages))
+            else:
+                messages.success(
+                    request,
+                    u'Raport został poprawnie zmieniony.'
+                )
+                return redirect(reverse('reports:navigate'))
         else:
             messages.error(
                 request,
@@ -450,10 +377,50 @@ def reports_show_report(request, report_id):
 
     return render(request, 'reports/show.html', {
         'report': report,
-        'categories': get_report_categories(report.id)
+        'categories': get_reports_categories([report])[report.id]
     })
 
 
+@permission_required('reports.view_report')
+def reports_forecast(request):
+    """Return forecasts of all products of the caffe as JSON."""
+
+    forecasts = ProductForecast.objects.filter(
+        caffe=request.user.caffe
+    ).values_list(
+        'product_id', 'product__name', 'product__unit__name',
+        'rate', 'runs_out_on', 'order_amount'
+    )
+
+    return JsonResponse({'products': [
+        {
+            'id': product_id,
+            'name': name,
+            'unit': unit,
+            'rate': rate,
+            'runs_out_on': runs_out_on and runs_out_on.isoformat(),
+            'order_amount': order_amount
+        } for product_id, name, unit, rate, runs_out_on, order_amount
+        in forecasts
+    ]})
+
+
+@permission_required('reports.view_report')
+def reports_export(request):
+    """Stream Reports with products from given range of days as CSV."""
+
+    form = ExportForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(u'Niepoprawny zakres dni.')
+
+    start = form.cleaned_data['start']
+    end = form.cleaned_data['end']
+    return csv_response(
+        'raporty', start, end, HEADER,
+        export_reports(request.user.caffe, start, end)
+    )
+
+
 @permission_required('reports.view_report')
 def reports_navigate(request):
     """Show navigation view for reports."""
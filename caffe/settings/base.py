@@ -38,6 +38,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE_CLASSES = [
+    'caffe.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -127,7 +128,58 @@ STATICFILES_DIRS = (
 
 
 AUTH_USER_MODEL = 'employees.Employee'
+
+# permissions are cached between requests, see employees.permissions
+AUTHENTICATION_BACKENDS = ['employees.backends.CachedPermissionsBackend']
 LOGIN_REDIRECT_URL = '/'
 LOGIN_URL = '/employees/login/'
 
 MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+# Keep monthly totals of worked hours in MonthlyTimesheets, which are read by
+# payroll. When disabled, payroll is aggregated from WorkedHours.
+TIMESHEETS_MATERIALIZED = True
+
+# Values cached per caffe, see caffe.cache. Local memory is used in tests and
+# development, so they run without Redis, production uses Redis shared by all
+# processes of the server (see settings.production).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'caffe',
+    }
+}
+
+# Record view, queries, time of database and templates of every request, see
+# caffe.middleware.RequestMetricsMiddleware. Tracing peak memory is slower,
+# so it is enabled separately.
+REQUEST_METRICS = False
+REQUEST_METRICS_MEMORY = False
+
+# Directory shared by all processes of the server, to which every process
+# writes snapshots of its metrics, so /metrics/ shows metrics of all of them.
+# Without it only metrics of the process handling /metrics/ are shown.
+METRICS_DIR = None
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {
+            'format': '%(message)s',
+        },
+    },
+    'handlers': {
+        'metrics': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'message',
+        },
+    },
+    'loggers': {
+        'caffe.metrics': {
+            'handlers': ['metrics'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
@@ -12,3 +12,20 @@ DATABASES = {
         'PORT': 5432,
     }
 }
+
+# every process has to see versions bumped by other ones, so the cache can
+# not be kept in memory of a process; when Redis is down values are computed
+CACHES = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': 'redis://redis:6379/1',
+        'KEY_PREFIX': 'caffe',
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'IGNORE_EXCEPTIONS': True,
+        },
+    }
+}
+
+REQUEST_METRICS = True
+METRICS_DIR = '/tmp/caffe-metrics'
@@ -28,7 +28,7 @@
            "<tr>" +
            "<% for(var j = 0; j < 7; j++) { %>" +
            "<% var d = j + i * 7; %>" +
-              "<td class='table__cell--center <%= days[d].class %>'>" +
+              "<td class='table__cell--center <%= days[d].class %>' data-date='<%= days[d].isoDate %>'>" +
                 "<a href='/calendar/<%= days[d].date %>'><%= days[d].day %></a>" +
               "</td>" +
            "<% } %>" +
@@ -76,6 +76,7 @@
       days.push({
         'day': tmpDate.format('D'),
         'date': tmpDate.format('YYYY/MM/DD'),
+        'isoDate': tmpDate.format('YYYY-MM-DD'),
         'class': 'table__cell--disabled'
       });
     }
@@ -87,6 +88,7 @@
       days.push({
         'day': tmpDate.format('D'),
         'date': tmpDate.format('YYYY/MM/DD'),
+        'isoDate': tmpDate.format('YYYY-MM-DD'),
         'class': (tmpDate.diff(moment().startOf('day'), 'days') == 0 ? 'table__cell--highlight' : '')
       });
 
@@ -98,6 +100,7 @@
       days.push({
         'day': tmpDate.format('D'),
         'date': tmpDate.format('YYYY/MM/DD'),
+        'isoDate': tmpDate.format('YYYY-MM-DD'),
         'class': 'table__cell--disabled'
       });
 
@@ -113,6 +116,27 @@
     }
 
     this.element.html(this.compiledTempalte(data));
+    this.renderActivity();
+  }
+
+  Calendar.prototype.renderActivity = function() {
+    var element = this.element;
+    var url = '/calendar/' + this.date.format('YYYY/MM') + '/';
+
+    // mark days which have any reports, cash reports or worked hours
+    $.getJSON(url, function(data) {
+      _.forEach(data.days, function(day) {
+        if (day.reports + day.cash_reports + day.worked_hours > 0) {
+          element.find("td[data-date='" + day.date + "']")
+            .addClass('calendar__day--active')
+            .attr('title',
+              'Raporty: ' + day.reports +
+              ', raporty z kasy: ' + day.cash_reports +
+              ', godziny pracy: ' + day.worked_hours
+            );
+        }
+      });
+    });
   }
 
   Calendar.prototype.backAction = function(event) {
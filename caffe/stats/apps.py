@@ -1,5 +1,38 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_save
 
 
 class StatsConfig(AppConfig):
     name = 'stats'
+
+    def ready(self):
+        """Connect signals which refresh daily rollups."""
+
+        from cash.signals import cash_report_written
+        from hours.signals import worked_hours_written
+        from reports.signals import report_written
+
+        from . import rollups
+
+        report_written.connect(rollups.report_written)
+        cash_report_written.connect(rollups.cash_report_written)
+        worked_hours_written.connect(rollups.worked_hours_written)
+
+        post_delete.connect(rollups.report_deleted, sender='reports.Report')
+        post_delete.connect(
+            rollups.cash_report_deleted,
+            sender='cash.CashReport'
+        )
+
+        pre_save.connect(
+            rollups.worked_hours_changing,
+            sender='hours.WorkedHours'
+        )
+        post_save.connect(
+            rollups.worked_hours_changed,
+            sender='hours.WorkedHours'
+        )
+        post_delete.connect(
+            rollups.worked_hours_changed,
+            sender='hours.WorkedHours'
+        )
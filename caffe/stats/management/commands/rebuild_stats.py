@@ -0,0 +1,23 @@
+"""Command which rebuilds daily rollups of statistics from the history."""
+
+from django.core.management.base import BaseCommand
+
+from stats.rollups import rebuild
+
+
+class Command(BaseCommand):
+    """Rebuild daily rollups of statistics."""
+
+    help = 'Rebuild daily rollups of statistics from the whole history.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--caffe',
+            type=int,
+            default=None,
+            help='Id of caffe which rollups are rebuilt, all when not given.'
+        )
+
+    def handle(self, *args, **options):
+        rebuild(options['caffe'])
+        self.stdout.write('Statistics have been rebuilt.')
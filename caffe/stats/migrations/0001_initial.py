@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.4 on 2026-10-18 11:01
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('reports', '0011_reports_date_indexes'),
+        ('hours', '0002_hours_date_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('caffe', '0006_auto_20160621_0051'),
+        ('cash', '0013_cash_date_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CashDailyStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('cash_reports', models.PositiveIntegerField(default=0)),
+                ('cash', models.FloatField(default=0)),
+                ('card_payments', models.FloatField(default=0)),
+                ('expenses', models.FloatField(default=0)),
+                ('balance', models.FloatField(default=0)),
+                ('caffe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='caffe.Caffe')),
+            ],
+            options={
+                'ordering': ('date',),
+                'default_permissions': (),
+            },
+        ),
+        migrations.CreateModel(
+            name='CompanyDailyExpenses',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('amount', models.FloatField(default=0)),
+                ('caffe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='caffe.Caffe')),
+                ('company', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='cash.Company')),
+            ],
+            options={
+                'ordering': ('date', 'company'),
+                'default_permissions': (),
+            },
+        ),
+        migrations.CreateModel(
+            name='HoursDailyStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('minutes', models.PositiveIntegerField(default=0)),
+                ('caffe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='caffe.Caffe')),
+                ('employee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('position', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='hours.Position')),
+            ],
+            options={
+                'ordering': ('date', 'employee', 'position'),
+                'default_permissions': (),
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductDailyStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('amount', models.FloatField(default=0)),
+                ('reports', models.PositiveIntegerField(default=0)),
+                ('caffe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='caffe.Caffe')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reports.Product')),
+            ],
+            options={
+                'ordering': ('date', 'product'),
+                'default_permissions': (),
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='productdailystats',
+            unique_together=set([('caffe', 'date', 'product')]),
+        ),
+        migrations.AlterUniqueTogether(
+            name='hoursdailystats',
+            unique_together=set([('caffe', 'date', 'employee', 'position')]),
+        ),
+        migrations.AlterUniqueTogether(
+            name='companydailyexpenses',
+            unique_together=set([('caffe', 'date', 'company')]),
+        ),
+        migrations.AlterUniqueTogether(
+            name='cashdailystats',
+            unique_together=set([('caffe', 'date')]),
+        ),
+    ]
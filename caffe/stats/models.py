@@ -1,3 +1,100 @@
+"""Daily rollups of data of Caffe used by statistics.
+
+Every rollup has one row per Caffe, local day and its key (e.g. product).
+Rollups are refreshed for one day whenever data of that day is written,
+and can be rebuilt from the whole history. Statistics are read only from
+rollups, so they never aggregate raw FullProducts or FullExpenses.
+"""
+
 from django.db import models
 
-# Create your models here.
+
+class ProductDailyStats(models.Model):
+    """Stores summed amounts of one product from reports of one day."""
+
+    caffe = models.ForeignKey('caffe.Caffe', on_delete=models.CASCADE)
+    date = models.DateField()
+    product = models.ForeignKey('reports.Product', on_delete=models.CASCADE)
+    amount = models.FloatField(default=0)
+    reports = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ('date', 'product')
+        unique_together = ('caffe', 'date', 'product')
+        default_permissions = ()
+
+    def __str__(self):
+        return '{}: {} {:g}'.format(self.date, self.product_id, self.amount)
+
+
+class CashDailyStats(models.Model):
+    """Stores money flow from all cash reports of one day."""
+
+    caffe = models.ForeignKey('caffe.Caffe', on_delete=models.CASCADE)
+    date = models.DateField()
+    cash_reports = models.PositiveIntegerField(default=0)
+    cash = models.FloatField(default=0)
+    card_payments = models.FloatField(default=0)
+    expenses = models.FloatField(default=0)
+    balance = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ('date',)
+        unique_together = ('caffe', 'date')
+        default_permissions = ()
+
+    def __str__(self):
+        return '{}: {:g}'.format(self.date, self.balance)
+
+
+class CompanyDailyExpenses(models.Model):
+    """Stores summed expenses paid to one company during one day.
+
+    Expenses which are not paid to any company have empty company.
+    """
+
+    caffe = models.ForeignKey('caffe.Caffe', on_delete=models.CASCADE)
+    date = models.DateField()
+    company = models.ForeignKey(
+        'cash.Company',
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE
+    )
+    amount = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ('date', 'company')
+        unique_together = ('caffe', 'date', 'company')
+        default_permissions = ()
+
+    def __str__(self):
+        return '{}: {} {:g}'.format(self.date, self.company_id, self.amount)
+
+
+class HoursDailyStats(models.Model):
+    """Stores minutes worked by one employee on one position during a day."""
+
+    caffe = models.ForeignKey('caffe.Caffe', on_delete=models.CASCADE)
+    date = models.DateField()
+    employee = models.ForeignKey(
+        'employees.Employee',
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE
+    )
+    position = models.ForeignKey('hours.Position', on_delete=models.CASCADE)
+    minutes = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ('date', 'employee', 'position')
+        unique_together = ('caffe', 'date', 'employee', 'position')
+        default_permissions = ()
+
+    def __str__(self):
+        return '{}: {} {} {}'.format(
+            self.date,
+            self.employee_id,
+            self.position_id,
+            self.minutes
+        )
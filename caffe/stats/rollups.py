@@ -0,0 +1,284 @@
+"""Module responsible for filling daily rollups used by statistics.
+
+Each rollup is computed by grouped queries over the data of Caffe. When data
+of one day is written, rows of the rollup for that Caffe and day are deleted
+and computed again, which costs the same regardless of the length of the
+history. The same functions rebuild rollups from the whole history.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from caffe.dates import annotate_day, filter_dates, to_date
+from caffe.line_items import BATCH_SIZE, batches
+from cash.models import CashReport, FullExpense
+from hours.models import WorkedHours
+from hours.timesheets import summarize
+from reports.models import FullProduct
+
+from .models import (CashDailyStats, CompanyDailyExpenses, HoursDailyStats,
+                     ProductDailyStats)
+
+
+def filter_source(queryset, caffe_field, date_field, caffe_id, start, end):
+    """Filter rows of given Caffe and range of local dates.
+
+    Args:
+        queryset (QuerySet): Rows from which rollup is computed.
+        caffe_field (str): Path to Caffe of rows.
+        date_field (str): Path to date or datetime of rows.
+        caffe_id (Optional(int)): Id of Caffe, all Caffes when not given.
+        start (Optional(date)): First day, whole history when not given.
+        end (Optional(date)): First day after the range.
+
+    Returns:
+        Filtered queryset annotated with local `day`, without ordering.
+    """
+
+    queryset = queryset.filter(**{
+        '{}__isnull'.format(caffe_field): False
+    })
+
+    if caffe_id is not None:
+        queryset = queryset.filter(**{caffe_field: caffe_id})
+
+    if start is not None:
+        queryset = filter_dates(queryset, date_field, start, end)
+
+    return annotate_day(queryset.order_by(), date_field)
+
+
+def product_rows(caffe_id=None, start=None, end=None):
+    """Compute ProductDailyStats from FullProducts of reports."""
+
+    full_products = filter_source(
+        FullProduct.objects.all(),
+        'report__caffe',
+        'report__created_on',
+        caffe_id, start, end
+    )
+
+    rows = full_products.values_list(
+        'report__caffe', 'day', 'product'
+    ).annotate(amount=Sum('amount'), reports=Count('report', distinct=True))
+
+    for caffe, day, product, amount, reports in rows.iterator():
+        yield ProductDailyStats(
+            caffe_id=caffe,
+            date=to_date(day),
+            product_id=product,
+            amount=amount,
+            reports=reports
+        )
+
+
+def cash_rows(caffe_id=None, start=None, end=None):
+    """Compute CashDailyStats from CashReports.
+
+    Expenses are taken from totals stored in CashReports, so FullExpenses are
+    not read at all.
+    """
+
+    cash_reports = filter_source(
+        CashReport.objects.all(),
+        'caffe',
+        'created_on',
+        caffe_id, start, end
+    )
+
+    rows = cash_reports.values_list('caffe', 'day').annotate(
+        count=Count('id'),
+        cash=Sum(F('cash_after_shift') - F('cash_before_shift')),
+        card_payments=Sum('card_payments'),
+        expenses=Sum('expenses_total'),
+        balance=Sum('stored_balance')
+    )
+
+    for caffe, day, count, cash, card, expenses, balance in rows.iterator():
+        yield CashDailyStats(
+            caffe_id=caffe,
+            date=to_date(day),
+            cash_reports=count,
+            cash=cash,
+            card_payments=card,
+            expenses=expenses,
+            balance=balance
+        )
+
+
+def company_rows(caffe_id=None, start=None, end=None):
+    """Compute CompanyDailyExpenses from FullExpenses of cash reports."""
+
+    full_expenses = filter_source(
+        FullExpense.objects.all(),
+        'cash_report__caffe',
+        'cash_report__created_on',
+        caffe_id, start, end
+    )
+
+    rows = full_expenses.values_list(
+        'cash_report__caffe', 'day', 'expense__company'
+    ).annotate(amount=Sum('amount'))
+
+    for caffe, day, company, amount in rows.iterator():
+        yield CompanyDailyExpenses(
+            caffe_id=caffe,
+            date=to_date(day),
+            company_id=company,
+            amount=amount
+        )
+
+
+def hours_rows(caffe_id=None, start=None, end=None):
+    """Compute HoursDailyStats from WorkedHours.
+
+    Worked minutes are computed and summed up by the database.
+    """
+
+    worked_hours = filter_source(
+        WorkedHours.objects.all(),
+        'caffe',
+        'date',
+        caffe_id, start, end
+    )
+
+    rows = summarize(worked_hours, 'caffe', 'date', 'employee', 'position')
+    for row in rows.iterator():
+        yield HoursDailyStats(
+            caffe_id=row['caffe'],
+            date=row['date'],
+            employee_id=row['employee'],
+            position_id=row['position'],
+            minutes=row['minutes']
+        )
+
+
+ROLLUPS = (
+    (ProductDailyStats, product_rows),
+    (CashDailyStats, cash_rows),
+    (CompanyDailyExpenses, company_rows),
+    (HoursDailyStats, hours_rows),
+)
+
+
+def refresh(model, compute, caffe_id=None, start=None, end=None):
+    """Replace rows of rollup with the computed ones.
+
+    Args:
+        model (Model): Model of the rollup.
+        compute (callable): Function which computes rows of the rollup.
+        caffe_id (Optional(int)): Id of Caffe, all Caffes when not given.
+        start (Optional(date)): First day, whole history when not given.
+        end (Optional(date)): First day after the range.
+    """
+
+    stored = model.objects.all()
+    if caffe_id is not None:
+        stored = stored.filter(caffe_id=caffe_id)
+
+    if start is not None:
+        stored = stored.filter(date__gte=start, date__lt=end)
+
+    with transaction.atomic():
+        stored.delete()
+
+        for batch in batches(compute(caffe_id, start, end), BATCH_SIZE):
+            model.objects.bulk_create(batch)
+
+
+def refresh_day(model, compute, caffe_id, day):
+    """Replace rows of rollup for one Caffe and one local day."""
+
+    refresh(model, compute, caffe_id, day, day + timedelta(days=1))
+
+
+def rebuild(caffe_id=None):
+    """Rebuild all rollups from the whole history.
+
+    Args:
+        caffe_id (Optional(int)): Id of Caffe, all Caffes when not given.
+    """
+
+    for model, compute in ROLLUPS:
+        refresh(model, compute, caffe_id)
+
+
+def local_date(value):
+    """Return local date of datetime."""
+
+    return timezone.localtime(value).date()
+
+
+def report_written(sender, report, **kwargs):
+    """Refresh product rollup for the day of written Report."""
+
+    if report.caffe_id:
+        refresh_day(
+            ProductDailyStats, product_rows,
+            report.caffe_id, local_date(report.created_on)
+        )
+
+
+def cash_report_written(sender, cash_report, **kwargs):
+    """Refresh cash rollups for the day of written CashReport."""
+
+    if cash_report.caffe_id:
+        day = local_date(cash_report.created_on)
+        refresh_day(CashDailyStats, cash_rows, cash_report.caffe_id, day)
+        refresh_day(
+            CompanyDailyExpenses, company_rows, cash_report.caffe_id, day
+        )
+
+
+def report_deleted(sender, instance, **kwargs):
+    """Refresh product rollup for the day of deleted Report."""
+
+    report_written(sender, instance)
+
+
+def cash_report_deleted(sender, instance, **kwargs):
+    """Refresh cash rollups for the day of deleted CashReport."""
+
+    cash_report_written(sender, instance)
+
+
+def worked_hours_changing(sender, instance, **kwargs):
+    """Remember day of WorkedHours before they are changed."""
+
+    instance._stats_previous = None
+    if instance.pk:
+        instance._stats_previous = WorkedHours.objects.filter(
+            pk=instance.pk
+        ).values_list('caffe_id', 'date').first()
+
+
+def worked_hours_changed(sender, instance, **kwargs):
+    """Refresh hours rollup for the day of changed WorkedHours.
+
+    When the day or Caffe of WorkedHours has changed, the previous day is
+    refreshed too.
+    """
+
+    days = {(instance.caffe_id, instance.date)}
+
+    previous = getattr(instance, '_stats_previous', None)
+    if previous:
+        days.add(previous)
+
+    for caffe_id, day in days:
+        if caffe_id:
+            refresh_day(HoursDailyStats, hours_rows, caffe_id, day)
+
+
+def worked_hours_written(sender, caffe, days, **kwargs):
+    """Refresh hours rollup for range of days of WorkedHours written in bulk.
+    """
+
+    if days:
+        refresh(
+            HoursDailyStats, hours_rows, caffe.id,
+            min(days), max(days) + timedelta(days=1)
+        )
@@ -0,0 +1,60 @@
+"""Module responsible for statistics of Caffe shown to its employees.
+
+Statistics are read only from daily rollups, so their cost depends on the
+length of the period and not on the size of the history.
+"""
+
+from django.db.models import Sum
+
+from .models import (CashDailyStats, CompanyDailyExpenses, HoursDailyStats,
+                     ProductDailyStats)
+
+
+def get_statistics(caffe, start, end):
+    """Return statistics of Caffe for given range of local dates.
+
+    Args:
+        caffe (Caffe): Caffe which statistics are returned.
+        start (date): First day of the range.
+        end (date): First day after the range.
+
+    Returns:
+        Dictionary with summed money flow (`cash`), worked minutes
+        (`minutes`), amounts of products (`products`), expenses per company
+        (`companies`) and worked minutes per employee and position
+        (`employees`).
+    """
+
+    period = {'caffe': caffe, 'date__gte': start, 'date__lt': end}
+
+    cash = CashDailyStats.objects.filter(**period).aggregate(
+        cash_reports=Sum('cash_reports'),
+        cash=Sum('cash'),
+        card_payments=Sum('card_payments'),
+        expenses=Sum('expenses'),
+        balance=Sum('balance')
+    )
+
+    minutes = HoursDailyStats.objects.filter(**period).aggregate(
+        minutes=Sum('minutes')
+    )['minutes']
+
+    products = ProductDailyStats.objects.filter(**period).values(
+        'product__name', 'product__unit__name'
+    ).annotate(amount=Sum('amount')).order_by('product__name')
+
+    companies = CompanyDailyExpenses.objects.filter(**period).values(
+        'company__name'
+    ).annotate(amount=Sum('amount')).order_by('-amount')
+
+    employees = HoursDailyStats.objects.filter(**period).values(
+        'employee__first_name', 'employee__last_name', 'position__name'
+    ).annotate(minutes=Sum('minutes')).order_by('-minutes')
+
+    return {
+        'cash': {key: value or 0 for key, value in cash.items()},
+        'minutes': minutes or 0,
+        'products': list(products),
+        'companies': list(companies),
+        'employees': list(employees)
+    }
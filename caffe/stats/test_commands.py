@@ -0,0 +1,58 @@
+"""Testing module for the statistics management commands."""
+
+from datetime import date
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from caffe.models import Caffe
+from employees.models import Employee
+from hours.models import Position, WorkedHours
+
+from .models import HoursDailyStats
+
+
+class RebuildStatsTest(TestCase):
+    """Tests of command rebuilding rollups of statistics."""
+
+    def setUp(self):
+        """Prepare data for tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        kate = Employee.objects.create(
+            username='KateT',
+            first_name='Kate',
+            last_name='Tempest',
+            caffe=self.kafo
+        )
+
+        WorkedHours.objects.create(
+            start_time='12:00',
+            end_time='14:00',
+            date=date(2016, 7, 1),
+            position=Position.objects.create(name='Barista', caffe=self.kafo),
+            employee=kate,
+            caffe=self.kafo
+        )
+
+    def test_rebuild_stats(self):
+        """Check if rollups are rebuilt from the history."""
+
+        HoursDailyStats.objects.all().delete()
+
+        out = StringIO()
+        call_command('rebuild_stats', caffe=self.kafo.id, stdout=out)
+
+        self.assertEqual(
+            list(HoursDailyStats.objects.values_list('date', 'minutes')),
+            [(date(2016, 7, 1), 120)]
+        )
+        self.assertIn('rebuilt', out.getvalue())
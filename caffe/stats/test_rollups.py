@@ -0,0 +1,249 @@
+"""Testing module for the daily rollups of statistics."""
+# pylint: disable=C0103,R0902
+
+from datetime import date, datetime
+
+import pytz
+from django.test import TestCase, override_settings
+
+from caffe.models import Caffe
+from cash.models import CashReport, Company, Expense, FullExpense
+from cash.persistence import create_cash_report, update_cash_report
+from employees.models import Employee
+from hours.models import Position, WorkedHours
+from reports.models import Category, FullProduct, Product, Report, Unit
+from reports.persistence import create_report, update_report
+
+from .models import (CashDailyStats, CompanyDailyExpenses, HoursDailyStats,
+                     ProductDailyStats)
+from .rollups import rebuild
+
+
+def stored(model):
+    """Return all rows of rollup as tuples without ids."""
+
+    fields = [
+        field.attname for field in model._meta.concrete_fields
+        if not field.primary_key
+    ]
+    return set(model.objects.values_list(*fields))
+
+
+@override_settings(TIME_ZONE='Europe/Warsaw')
+class RollupsTest(TestCase):
+    """Daily rollups tests."""
+
+    def setUp(self):
+        """Prepare data for tests."""
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.kate = Employee.objects.create(
+            username='KateT',
+            first_name='Kate',
+            last_name='Tempest',
+            caffe=self.kafo
+        )
+
+        juices = Category.objects.create(name='Soki', caffe=self.kafo)
+        liter = Unit.objects.create(name='litr', caffe=self.kafo)
+        self.products = [
+            Product.objects.create(
+                name='Sok {}'.format(i),
+                category=juices,
+                unit=liter,
+                caffe=self.kafo
+            ) for i in range(3)
+        ]
+
+        self.goodcake = Company.objects.create(
+            name='GoodCake',
+            caffe=self.kafo
+        )
+        self.cakes = Expense.objects.create(
+            name='Cakes',
+            company=self.goodcake,
+            caffe=self.kafo
+        )
+        self.newspapers = Expense.objects.create(
+            name='Newspapers',
+            caffe=self.kafo
+        )
+
+        self.barista = Position.objects.create(name='Barista', caffe=self.kafo)
+
+    def full_products(self, amounts):
+        """Return not saved FullProducts with given amounts."""
+
+        return [
+            FullProduct(product=product, amount=amount, caffe=self.kafo)
+            for product, amount in zip(self.products, amounts)
+        ]
+
+    def cash_report(self):
+        """Return not saved CashReport."""
+
+        return CashReport(
+            creator=self.kate,
+            caffe=self.kafo,
+            cash_before_shift=100,
+            cash_after_shift=300,
+            card_payments=50,
+            amount_due=200
+        )
+
+    def test_report_written(self):
+        """Check if product rollup follows written reports."""
+
+        report = create_report(
+            self.kafo, self.kate, self.full_products([1, 2])
+        )
+        create_report(self.kafo, self.kate, self.full_products([3]))
+        today = report.created_on.astimezone(
+            pytz.timezone('Europe/Warsaw')
+        ).date()
+
+        self.assertEqual(stored(ProductDailyStats), {
+            (self.kafo.id, today, self.products[0].id, 4, 2),
+            (self.kafo.id, today, self.products[1].id, 2, 1),
+        })
+
+        update_report(report, self.full_products([5, 0, 7]))
+        self.assertEqual(stored(ProductDailyStats), {
+            (self.kafo.id, today, self.products[0].id, 8, 2),
+            (self.kafo.id, today, self.products[1].id, 0, 1),
+            (self.kafo.id, today, self.products[2].id, 7, 1),
+        })
+
+        report.delete()
+        self.assertEqual(stored(ProductDailyStats), {
+            (self.kafo.id, today, self.products[0].id, 3, 1),
+        })
+
+    def test_report_written_refreshes_one_day(self):
+        """Check if only rollup of day of written report is refreshed."""
+
+        report = create_report(self.kafo, self.kate, self.full_products([1]))
+        Report.objects.filter(id=report.id).update(
+            created_on=pytz.utc.localize(datetime(2016, 6, 30, 22, 30))
+        )
+        rebuild()
+
+        # rows of other days are not touched by refresh
+        create_report(self.kafo, self.kate, self.full_products([2]))
+
+        self.assertIn(
+            (self.kafo.id, date(2016, 7, 1), self.products[0].id, 1, 1),
+            stored(ProductDailyStats)
+        )
+        self.assertEqual(ProductDailyStats.objects.count(), 2)
+
+    def test_cash_report_written(self):
+        """Check if cash rollups follow written cash reports."""
+
+        cash_report = create_cash_report(self.cash_report(), [
+            FullExpense(expense=self.cakes, amount=20, caffe=self.kafo),
+            FullExpense(expense=self.newspapers, amount=5, caffe=self.kafo)
+        ])
+        today = cash_report.created_on.astimezone(
+            pytz.timezone('Europe/Warsaw')
+        ).date()
+
+        self.assertEqual(stored(CashDailyStats), {
+            (self.kafo.id, today, 1, 200, 50, 25, 75)
+        })
+        self.assertEqual(stored(CompanyDailyExpenses), {
+            (self.kafo.id, today, self.goodcake.id, 20),
+            (self.kafo.id, today, None, 5)
+        })
+
+        update_cash_report(cash_report, [
+            FullExpense(expense=self.cakes, amount=30, caffe=self.kafo)
+        ])
+        self.assertEqual(stored(CashDailyStats), {
+            (self.kafo.id, today, 1, 200, 50, 30, 80)
+        })
+        self.assertEqual(stored(CompanyDailyExpenses), {
+            (self.kafo.id, today, self.goodcake.id, 30)
+        })
+
+        # single FullExpense is written with the model
+        cash_report.full_expenses.get().delete()
+        self.assertEqual(stored(CompanyDailyExpenses), set())
+
+        cash_report.delete()
+        self.assertEqual(stored(CashDailyStats), set())
+
+    def test_worked_hours_written(self):
+        """Check if hours rollup follows saved and deleted hours."""
+
+        worked_hours = WorkedHours.objects.create(
+            start_time='12:00',
+            end_time='15:30',
+            date=date(2016, 7, 1),
+            position=self.barista,
+            employee=self.kate,
+            caffe=self.kafo
+        )
+        WorkedHours.objects.create(
+            start_time='16:00',
+            end_time='17:00',
+            date=date(2016, 7, 1),
+            position=self.barista,
+            employee=self.kate,
+            caffe=self.kafo
+        )
+
+        self.assertEqual(stored(HoursDailyStats), {
+            (self.kafo.id, date(2016, 7, 1), self.kate.id, self.barista.id,
+             270)
+        })
+
+        worked_hours.date = date(2016, 7, 2)
+        worked_hours.save()
+        self.assertEqual(stored(HoursDailyStats), {
+            (self.kafo.id, date(2016, 7, 1), self.kate.id, self.barista.id,
+             60),
+            (self.kafo.id, date(2016, 7, 2), self.kate.id, self.barista.id,
+             210)
+        })
+
+        worked_hours.delete()
+        self.assertEqual(len(stored(HoursDailyStats)), 1)
+
+    def test_rebuild(self):
+        """Check if rebuilt rollups are the same as incremental ones."""
+
+        report = create_report(self.kafo, self.kate, self.full_products([1]))
+        update_report(report, self.full_products([2, 3]))
+        create_cash_report(self.cash_report(), [
+            FullExpense(expense=self.cakes, amount=20, caffe=self.kafo)
+        ])
+        WorkedHours.objects.create(
+            start_time='12:00',
+            end_time='15:30',
+            date=date(2016, 7, 1),
+            position=self.barista,
+            employee=self.kate,
+            caffe=self.kafo
+        )
+
+        models = [
+            ProductDailyStats,
+            CashDailyStats,
+            CompanyDailyExpenses,
+            HoursDailyStats
+        ]
+        incremental = [stored(model) for model in models]
+
+        for model in models:
+            model.objects.all().delete()
+
+        rebuild(self.kafo.id)
+        self.assertEqual([stored(model) for model in models], incremental)
@@ -0,0 +1,104 @@
+"""Testing module for the statistics views."""
+# pylint: disable=C0103,R0902
+
+from django.contrib.auth.models import Permission
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from caffe.models import Caffe
+from cash.models import CashReport, Expense, FullExpense
+from cash.persistence import create_cash_report
+from employees.models import Employee
+from reports.models import Category, FullProduct, Product, Unit
+from reports.persistence import create_report
+
+
+class StatisticsViewsTest(TestCase):
+    """Statistics views tests."""
+
+    def setUp(self):
+        """Prepare data for tests."""
+
+        self.client = Client()
+
+        self.kafo = Caffe.objects.create(
+            name='kafo',
+            city='Gliwice',
+            street='Wieczorka',
+            house_number='14',
+            postal_code='44-100'
+        )
+
+        self.user = Employee.objects.create_user(
+            username='admin',
+            password='admin',
+            caffe=self.kafo
+        )
+        self.user.user_permissions.add(
+            Permission.objects.get(codename='view_report'),
+            Permission.objects.get(codename='view_cashreport'),
+            Permission.objects.get(codename='view_workedhours'),
+        )
+
+        self.client.login(username='admin', password='admin')
+
+        coke = Product.objects.create(
+            name='Cola',
+            category=Category.objects.create(name='Soki', caffe=self.kafo),
+            unit=Unit.objects.create(name='litr', caffe=self.kafo),
+            caffe=self.kafo
+        )
+        create_report(self.kafo, self.user, [
+            FullProduct(product=coke, amount=3, caffe=self.kafo)
+        ])
+
+        create_cash_report(
+            CashReport(
+                creator=self.user,
+                caffe=self.kafo,
+                cash_before_shift=100,
+                cash_after_shift=300,
+                card_payments=50,
+                amount_due=200
+            ),
+            [
+                FullExpense(
+                    expense=Expense.objects.create(
+                        name='Cakes',
+                        caffe=self.kafo
+                    ),
+                    amount=20,
+                    caffe=self.kafo
+                )
+            ]
+        )
+
+    def test_statistics_navigate(self):
+        """Check if statistics are read from rollups."""
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('statistics:navigate'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'home/statistics.html')
+
+        statistics = response.context['statistics']
+        self.assertEqual(statistics['cash']['cash'], 200)
+        self.assertEqual(statistics['cash']['expenses'], 20)
+        self.assertEqual(statistics['cash']['balance'], 70)
+        self.assertEqual(statistics['products'][0]['amount'], 3)
+        self.assertEqual(statistics['companies'][0]['amount'], 20)
+
+        for query in queries:
+            self.assertNotIn('reports_fullproduct', query['sql'])
+            self.assertNotIn('cash_fullexpense', query['sql'])
+
+    def test_statistics_navigate_permissions(self):
+        """Check if statistics are not shown without permissions."""
+
+        self.user.user_permissions.clear()
+
+        response = self.client.get(reverse('statistics:navigate'))
+        self.assertEqual(response.status_code, 302)
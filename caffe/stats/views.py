@@ -1,7 +1,28 @@
+from datetime import timedelta
+
+from django.contrib.auth.decorators import permission_required
 from django.shortcuts import render
 
+from caffe.dates import local_today
+
+from .summary import get_statistics
+
+# number of days for which statistics are shown
+STATISTICS_DAYS = 30
 
+
+@permission_required(['hours.view_workedhours', 'reports.view_report',
+                      'cash.view_cashreport'])
 def statistics_navigate(request):
     """Show main statistics about cafe."""
 
-    return render(request, 'home/statistics.html')
+    end = local_today() + timedelta(days=1)
+    start = end - timedelta(days=STATISTICS_DAYS)
+
+    statistics = get_statistics(request.user.caffe, start, end)
+    statistics['hours'] = statistics['minutes'] / 60.0
+
+    return render(request, 'home/statistics.html', {
+        'statistics': statistics,
+        'days': STATISTICS_DAYS
+    })
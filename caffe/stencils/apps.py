@@ -1,5 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class StencilsConfig(AppConfig):
     name = 'stencils'
+
+    def ready(self):
+        """Connect signals which invalidate cached stencils."""
+
+        from .listing import caffe_created, stencils_changed
+
+        stencil = self.get_model('Stencil')
+        post_save.connect(stencils_changed, sender=stencil)
+        post_delete.connect(stencils_changed, sender=stencil)
+
+        post_save.connect(caffe_created, sender='caffe.Caffe')
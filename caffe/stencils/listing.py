@@ -0,0 +1,28 @@
+"""Module responsible for invalidating cached lists of stencils.
+
+Lists of Stencils of Caffe are cached in the stencils namespace, which is
+invalidated whenever Stencil of that Caffe is saved or deleted.
+"""
+
+from caffe.cache import bump_version
+
+STENCILS_NAMESPACE = 'stencils.list'
+
+
+def invalidate_stencils(caffe_id):
+    """Invalidate cached stencils for Caffe with given id."""
+
+    bump_version(STENCILS_NAMESPACE, caffe_id)
+
+
+def stencils_changed(sender, instance, **kwargs):
+    """Invalidate stencils when Stencil has changed."""
+
+    invalidate_stencils(instance.caffe_id)
+
+
+def caffe_created(sender, instance, created, **kwargs):
+    """Invalidate stencils of new Caffe, which can get id of removed one."""
+
+    if created:
+        invalidate_stencils(instance.id)
@@ -0,0 +1,42 @@
+# -*- encoding: utf-8 -*-
+# pylint: disable=C0103
+
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from caffe.query_counts import QueryCountsMixin
+
+from .models import Stencil
+
+
+class StencilsQueriesTests(QueryCountsMixin, TestCase):
+    """Test if numbers of queries of views do not depend on data."""
+
+    def test_show_all_stencils(self):
+        """Check list of Stencils view."""
+
+        self.assertConstantQueries(lambda caffe: reverse('stencils:all'))
+
+    def test_show_stencil(self):
+        """Check show Stencil view."""
+
+        self.assertConstantQueries(lambda caffe: reverse(
+            'stencils:show',
+            args=(Stencil.objects.get(caffe=caffe).id,)
+        ))
+
+    def test_edit_stencil(self):
+        """Check edit Stencil view."""
+
+        self.assertConstantQueries(lambda caffe: reverse(
+            'stencils:edit',
+            args=(Stencil.objects.get(caffe=caffe).id,)
+        ))
+
+    def test_new_report(self):
+        """Check new Report from Stencil view."""
+
+        self.assertConstantQueries(lambda caffe: reverse(
+            'stencils:new_report',
+            args=(Stencil.objects.get(caffe=caffe).id,)
+        ))
@@ -154,6 +154,27 @@ class StencilViewTests(TestCase):
             else:
                 self.assertTrue(False)
 
+    def test_stencil_show_all_cached(self):
+        """Check if list of stencils is cached until some stencil changes."""
+
+        url = reverse('stencils:all')
+        self.client.get(url)
+
+        Stencil.objects.filter(id=self.to_eat.id).update(name='Obiady')
+        response = self.client.get(url)
+        self.assertContains(response, 'Do jedzenia')
+        self.assertNotContains(response, 'Obiady')
+
+        self.to_drink.description = 'napoje'
+        self.to_drink.save()
+        response = self.client.get(url)
+        self.assertContains(response, 'Obiady')
+        self.assertContains(response, 'napoje')
+
+        self.to_eat.delete()
+        response = self.client.get(url)
+        self.assertNotContains(response, 'Obiady')
+
     def test_stencil_show(self):
         """Check if stencil view is displated properly."""
 
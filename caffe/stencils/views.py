@@ -1,11 +1,14 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import permission_required
+from django.core.exceptions import ValidationError
 from django.core.urlresolvers import reverse
 from django.shortcuts import get_object_or_404, redirect, render
 
+from reports.assembly import attach_reports_categories
+from reports.catalog import get_catalog
 from reports.forms import FullProductForm
-from reports.models import Product, Report
-from reports.views import get_report_categories
+from reports.models import Report
+from reports.persistence import create_report
 
 from .forms import StencilForm
 from .models import Stencil
@@ -103,21 +106,20 @@ def stencils_new_report(request, stencil_id):
 
     categories = stencil.categories.all()
 
-    for category in categories:
-        products = Product.objects.filter(category=category).all()
-
-        all_products = []
-        for product in products:
-            all_products.append({
-                'id': product.id,
-                'name': product.name,
-                'unit': product.unit.name
-            })
+    # group products from catalog by their categories
+    category_products = {}
+    for product in get_catalog(request.user.caffe)['products']:
+        category_products.setdefault(product['category']['id'], []).append({
+            'id': product['id'],
+            'name': product['name'],
+            'unit': product['unit']
+        })
 
+    for category in categories:
         all_categories.append({
             'id': category.id,
             'name': category.name,
-            'products': all_products
+            'products': category_products.get(category.id, [])
         })
 
     if request.POST:
@@ -157,20 +159,17 @@ def stencils_new_report(request, stencil_id):
 
         # check if some form exists
         if len(forms) > 0 and valid:
-            report = Report.objects.create(
-                creator=request.user,
-                caffe=request.user.caffe,
-            )
-
-            # for each form save it with its report
-            for form in forms:
-                full_product = form.save()
-                full_product.report = report
-                full_product.save()
-
-            report.save()
-            messages.success(request, 'Raport został poprawnie dodany.')
-            return redirect(reverse('stencils:all'))
+            try:
+                create_report(
+                    request.user.caffe,
+                    request.user,
+                    [form.save(commit=False) for form in forms]
+                )
+            except ValidationError as error:
+                messages.error(request, ' '.join(error.messages))
+            else:
+                messages.success(request, 'Raport został poprawnie dodany.')
+                return redirect(reverse('stencils:all'))
         else:
             messages.error(
                 request,
@@ -178,9 +177,9 @@ def stencils_new_report(request, stencil_id):
             )
 
     # get last five reports
-    latest_reports = Report.objects.filter(caffe=request.user.caffe).all()[:5]
-    for report in latest_reports:
-        report.categories = get_report_categories(report.id)
+    latest_reports = attach_reports_categories(
+        Report.objects.filter(caffe=request.user.caffe).all()[:5]
+    )
 
     return render(request, 'stencils/new_report.html', {
         'stencil': stencil,
@@ -4,4 +4,7 @@ cd caffe;
 sleep 5;
 su -m docker -c "python3 manage.py migrate"
 # su -m docker -c "python3 manage.py runserver 0.0.0.0:8000"
+# snapshots of metrics of workers, see METRICS_DIR
+rm -rf /tmp/caffe-metrics
+su -m docker -c "mkdir /tmp/caffe-metrics"
 su -m docker -c "gunicorn caffe.wsgi:application -w 4 -b :8000"